@@ -0,0 +1,108 @@
+"""Benchmark the CPU vs. bytes tradeoff of response compression levels.
+
+Generates list-page style JSON payloads (the shape ``list_runs`` and
+``list_workflows`` will return) plus the OpenAPI document size class and
+compresses each with every gzip level and brotli quality.
+
+Usage (from ``api/``)::
+
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --items 100 1000 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from compression import available_encodings, compress  # noqa: E402
+
+
+def _make_page(items: int) -> bytes:
+    """Build a deterministic list page resembling run listings."""
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    statuses = ["PENDING", "RUNNING", "SUCCEEDED", "FAILED"]
+    rows = []
+    for i in range(items):
+        rows.append(
+            {
+                "id": str(uuid.UUID(int=i)),
+                "workflow_id": str(uuid.UUID(int=i % 17)),
+                "status": statuses[i % len(statuses)],
+                "parameters": {"origin": "landing", "attempt": i % 3},
+                "tags": ["landing", f"batch-{i % 5}"],
+                "created_by": f"user_{i % 7:08d}",
+                "created_at": (base + timedelta(minutes=i)).isoformat(),
+            }
+        )
+    return json.dumps({"items": rows, "count": items}).encode("utf-8")
+
+
+def _levels(encoding: str):
+    return range(0, 12) if encoding == "br" else range(1, 10)
+
+
+def _measure(body: bytes, encoding: str, level: int, min_time: float) -> dict:
+    compress(body, encoding, level)  # warm up
+    iterations = 0
+    start = time.perf_counter()
+    while True:
+        compressed = compress(body, encoding, level)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    per_call = elapsed / iterations
+    return {
+        "encoding": encoding,
+        "level": level,
+        "original_bytes": len(body),
+        "compressed_bytes": len(compressed),
+        "ratio": round(len(body) / len(compressed), 2),
+        "ms_per_response": round(per_call * 1000, 3),
+        "mb_per_s": round(len(body) / per_call / 1_000_000, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement")
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    results = []
+    for items in args.items:
+        body = _make_page(items)
+        for encoding in available_encodings():
+            for level in _levels(encoding):
+                result = _measure(body, encoding, level, args.min_time)
+                result["items"] = items
+                results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    header = f"{'items':>6} {'enc':>4} {'lvl':>3} {'orig':>9} {'comp':>9} {'ratio':>6} {'ms':>9} {'MB/s':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['items']:>6} {r['encoding']:>4} {r['level']:>3} {r['original_bytes']:>9} "
+            f"{r['compressed_bytes']:>9} {r['ratio']:>6} {r['ms_per_response']:>9} {r['mb_per_s']:>7}"
+        )
+    if "br" not in available_encodings():
+        print("\nbrotli not installed; only gzip levels were measured.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Compare the model and projection paths for list responses.
+
+Serves one run-listing page of ``--items`` stored items through a FastAPI
+app three ways and reports time per response, peak allocation and body
+size:
+
+- ``model``: what ``list_runs`` does today. A ``Run`` is built per item and
+  FastAPI validates and serializes the page again against
+  ``response_model``.
+- ``fast-full``: ``serialization.encode_page`` over every stored field (the
+  encoder alone).
+- ``fast-projected``: ``encode_page(project(items, RUN_LIST_FIELDS))``, the
+  shape a run listing would take on the fast path.
+
+Requests go through the ASGI app in-process (no sockets), so the numbers are
+framework and serialization cost only. The ``Run`` model comes from
+``legacy_common_all`` when it is installed; otherwise a pydantic model with
+the same shape stands in for it.
+
+Usage (from ``api/``)::
+
+    python benchmarks/bench_list_serialization.py
+    python benchmarks/bench_list_serialization.py --items 1000 10000 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from fastapi import FastAPI  # noqa: E402
+from pydantic import BaseModel, Field  # noqa: E402
+
+import serialization  # noqa: E402
+from serialization import JSONBytesResponse, encode_page, project  # noqa: E402
+
+try:
+    from legacy_common_all.models import Run
+except ImportError:
+    class RunStatus(str, Enum):
+        PENDING = "PENDING"
+        RUNNING = "RUNNING"
+        SUCCEEDED = "SUCCEEDED"
+        FAILED = "FAILED"
+
+    class Run(BaseModel):
+        id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+        workflow_id: str
+        status: RunStatus
+        parameters: Dict[str, Any] = {}
+        tags: List[str] = []
+        created_by: str
+        created_at: datetime
+        updated_at: Optional[datetime] = None
+        result: Optional[Dict[str, Any]] = None
+        error: Optional[str] = None
+
+
+# The fields a run listing returns; parameters and results stay on the
+# single-run response
+RUN_LIST_FIELDS = ("id", "workflow_id", "status", "tags", "created_by", "created_at", "updated_at")
+
+
+class RunPage(BaseModel):
+    items: List[Run]
+    count: int
+
+
+def make_items(count: int) -> List[Dict[str, Any]]:
+    """Stored run items as the backend returns them (one user)."""
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    statuses = ["PENDING", "RUNNING", "SUCCEEDED", "FAILED"]
+    return [
+        {
+            "id": str(uuid.UUID(int=i)),
+            "workflow_id": str(uuid.UUID(int=i % 17)),
+            "status": statuses[i % len(statuses)],
+            "parameters": {"origin": "landing", "attempt": i % 3, "utm": {"source": "ads", "campaign": f"c{i % 9}"}},
+            "tags": ["landing", f"batch-{i % 5}"],
+            "created_by": "user_00000001",
+            "created_at": (base + timedelta(minutes=i)).isoformat(),
+            "updated_at": (base + timedelta(minutes=i, seconds=30)).isoformat(),
+            "result": {"leads": i % 4, "notes": "ok"},
+            "error": None,
+        }
+        for i in range(count)
+    ]
+
+
+def build_app(items: List[Dict[str, Any]]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model", response_model=RunPage)
+    async def model_path():
+        runs = [Run(**item) for item in items]
+        return RunPage(items=runs, count=len(runs))
+
+    @app.get("/fast-full")
+    async def fast_full():
+        return JSONBytesResponse(encode_page(list(items)))
+
+    @app.get("/fast-projected")
+    async def fast_projected():
+        return JSONBytesResponse(encode_page(project(items, RUN_LIST_FIELDS)))
+
+    return app
+
+
+async def request(app: FastAPI, path: str) -> bytes:
+    """One GET through the ASGI app; returns the body."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    chunks: List[bytes] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def measure(app: FastAPI, path: str, min_time: float) -> dict:
+    body = await request(app, path)  # warm up
+    iterations = 0
+    start = time.perf_counter()
+    while True:
+        await request(app, path)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time and iterations >= 3:
+            break
+
+    tracemalloc.start()
+    await request(app, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "path": path.lstrip("/"),
+        "ms_per_response": round(elapsed / iterations * 1000, 2),
+        "peak_alloc_kib": round(peak / 1024, 1),
+        "body_bytes": len(body),
+    }
+
+
+async def run(args: argparse.Namespace) -> List[dict]:
+    results = []
+    for count in args.items:
+        app = build_app(make_items(count))
+        for path in ("/model", "/fast-full", "/fast-projected"):
+            result = await measure(app, path, args.min_time)
+            result["items"] = count
+            results.append(result)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="List response serialization benchmark.")
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds per measurement")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    encoder = "orjson" if serialization.orjson is not None else "json"
+    if args.json:
+        print(json.dumps({"encoder": encoder, "results": results}, indent=2))
+        return 0
+    print(f"encoder: {encoder}")
+    print(f"{'items':>6} {'path':<15} {'ms/resp':>9} {'peak KiB':>10} {'bytes':>10}")
+    for r in results:
+        print(
+            f"{r['items']:>6} {r['path']:<15} {r['ms_per_response']:>9} "
+            f"{r['peak_alloc_kib']:>10} {r['body_bytes']:>10}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
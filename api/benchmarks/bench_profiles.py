@@ -0,0 +1,197 @@
+"""Compare cold-start and per-request cost of the app profiles.
+
+For each profile in ``factory.PROFILES`` a fresh interpreter measures:
+
+- ``import_ms``: importing ``factory`` (FastAPI, middleware, settings);
+- ``create_ms``: ``create_app(profile=...)`` including router imports;
+- ``first_request_ms``: the first ``GET /health`` (builds the middleware
+  stack);
+- warm p50/p95 per request for ``GET /health`` and a rejected
+  ``POST /contact`` (validation error, so no mail is sent), called directly
+  through ASGI so only app and middleware overhead is measured;
+- RSS after startup.
+
+Cold numbers are the median of ``--cold-runs`` interpreters.
+
+Usage (from ``api/``)::
+
+    python benchmarks/bench_profiles.py
+    python benchmarks/bench_profiles.py --iterations 5000 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+API_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = API_DIR / "src"
+
+REQUESTS = {
+    "GET /health": ("GET", "/health", b""),
+    "POST /contact (422)": ("POST", "/contact", b"{}"),
+}
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))]
+
+
+async def _call(app, method: str, path: str, body: bytes) -> int:
+    """Invoke ``app`` once over ASGI and return the status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("10.0.0.1", 40000),
+        "server": ("localhost", 443),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+def _child(profile: str, iterations: int) -> dict:
+    sys.path.insert(0, str(SRC_DIR))
+    start = time.perf_counter()
+    import factory
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app = factory.create_app(profile=profile)
+    create_s = time.perf_counter() - start
+
+    loop = asyncio.new_event_loop()
+    start = time.perf_counter()
+    loop.run_until_complete(_call(app, *REQUESTS["GET /health"]))
+    first_s = time.perf_counter() - start
+    result = {
+        "import_ms": round(import_s * 1000, 2),
+        "create_ms": round(create_s * 1000, 2),
+        "first_request_ms": round(first_s * 1000, 2),
+        "rss_mb": _rss_mb(),
+        "modules": len(sys.modules),
+    }
+    if not iterations:
+        return result
+
+    per_request = {}
+    for name, (method, path, body) in REQUESTS.items():
+        latencies = []
+        status = None
+        for _ in range(iterations):
+            start = time.perf_counter()
+            status = loop.run_until_complete(_call(app, method, path, body))
+            latencies.append(time.perf_counter() - start)
+        per_request[name] = {
+            "status": status,
+            "p50_us": round(_percentile(latencies, 50) * 1e6, 1),
+            "p95_us": round(_percentile(latencies, 95) * 1e6, 1),
+        }
+    result["requests"] = per_request
+    return result
+
+
+def _run_child(profile: str, iterations: int) -> dict:
+    env = dict(os.environ)
+    env.update(
+        {
+            "ENVIRONMENT": "prod",
+            "LANDING_API_CONFIG_SECRET_NAME": "",
+            "LANDING_API_RATE_LIMIT": "100000000",
+            # Route policies (prod: POST /contact=10) take precedence over RATE_LIMIT
+            "LANDING_API_RATE_LIMIT_POLICIES": "/=100000000",
+            "LANDING_API_ALLOWED_HOSTS": "localhost",
+            # Keep per-request log output out of the timings
+            "LANDING_API_LOG_LEVEL": "CRITICAL",
+        }
+    )
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--child", profile, "--iterations", str(iterations)]
+    proc = subprocess.run(cmd, cwd=API_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{profile} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(profile: str, cold_runs: int, iterations: int) -> dict:
+    runs = [_run_child(profile, iterations)] + [_run_child(profile, 0) for _ in range(cold_runs - 1)]
+    summary = {
+        key: round(statistics.median(r[key] for r in runs), 2)
+        for key in ("import_ms", "create_ms", "first_request_ms", "rss_mb", "modules")
+    }
+    summary["requests"] = runs[0]["requests"]
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare app profile cold start and request overhead.")
+    parser.add_argument("--cold-runs", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.iterations)))
+        return 0
+
+    sys.path.insert(0, str(SRC_DIR))
+    from factory import PROFILES
+
+    results = {name: measure(name, args.cold_runs, args.iterations) for name in PROFILES}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'profile':<16} {'import ms':>10} {'create ms':>10} {'1st req ms':>11} {'RSS MB':>7} {'modules':>8}")
+    for name, r in results.items():
+        print(f"{name:<16} {r['import_ms']:>10} {r['create_ms']:>10} {r['first_request_ms']:>11} "
+              f"{r['rss_mb']:>7} {r['modules']:>8}")
+    print(f"\n{'profile':<16} {'request':<22} {'status':>6} {'p50 us':>9} {'p95 us':>9}")
+    for name, r in results.items():
+        for request, s in r["requests"].items():
+            print(f"{name:<16} {request:<22} {s['status']:>6} {s['p50_us']:>9} {s['p95_us']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Compare the thread and asyncio SMTP transports for contact delivery.
+
+Runs ``routers.contact._send_contact_email`` ``--messages`` times at each
+``--concurrency`` against ``loadtest.smtp_sink`` with each
+``LANDING_API_SMTP_TRANSPORT`` and reports throughput, p50/p95 latency and
+the peak number of OS threads. Each run happens in a fresh interpreter so
+thread pools from earlier runs do not skew the counts. ``--rtt-ms`` puts a
+delaying TCP proxy in front of the sink so the round trips saved by
+PIPELINING show up as they would against a remote mail server.
+
+The thread transport gets as many delivery workers as the concurrency
+level (so neither path is throttled by admission control); that is the
+thread cost the asyncio transport avoids.
+
+Usage (from ``api/``)::
+
+    python benchmarks/bench_smtp_transport.py
+    python benchmarks/bench_smtp_transport.py --concurrency 10 100 500 --rtt-ms 20 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR / "src"))
+sys.path.insert(0, str(API_DIR))
+
+from loadtest.driver import percentile  # noqa: E402
+from loadtest.smtp_sink import SinkConfig, SMTPSink  # noqa: E402
+
+TRANSPORTS = ("thread", "asyncio")
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, delay: float) -> None:
+    try:
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            await asyncio.sleep(delay)
+            writer.write(chunk)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_delay_proxy(target_port: int, rtt_ms: float) -> asyncio.AbstractServer:
+    """TCP proxy adding ``rtt_ms / 2`` in each direction."""
+    delay = rtt_ms / 2000
+
+    async def handle(client_reader, client_writer):
+        upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", target_port)
+        await asyncio.gather(
+            _pipe(client_reader, upstream_writer, delay),
+            _pipe(upstream_reader, client_writer, delay),
+        )
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+class ThreadPeak:
+    """Samples ``threading.active_count()`` while a run is in progress."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self) -> "ThreadPeak":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+async def run_transport(transport: str, port: int, messages: int, concurrency: int) -> dict:
+    import config
+    from routers import contact
+
+    os.environ.update(
+        {
+            "LANDING_API_SMTP_TRANSPORT": transport,
+            "LANDING_API_SMTP_HOST": "127.0.0.1",
+            "LANDING_API_SMTP_PORT": str(port),
+            "LANDING_API_SMTP_USE_TLS": "false",
+            "LANDING_API_SMTP_BREAKER_FAILURE_THRESHOLD": "1000000",
+            "LANDING_API_DELIVERY_WORKERS": str(concurrency),
+            "LANDING_API_DELIVERY_QUEUE_SIZE": str(messages),
+            "LANDING_API_SMTP_ASYNC_MAX_IN_FLIGHT": str(max(concurrency, 1000)),
+        }
+    )
+    config.reload_settings()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await contact._send_contact_email(f"bench {i}", "+10000000000")
+            except Exception:  # noqa: BLE001
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    with ThreadPeak() as threads:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(messages)))
+        elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        "transport": transport,
+        "concurrency": concurrency,
+        "messages": messages,
+        "errors": errors,
+        "msgs_per_s": round(messages / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "peak_threads": threads.peak,
+    }
+
+
+async def _run_child(transport: str, port: int, messages: int, concurrency: int) -> dict:
+    env = dict(os.environ, LANDING_API_CONFIG_SECRET_NAME="", LANDING_API_LOG_LEVEL="CRITICAL")
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, str(Path(__file__).resolve()),
+        "--child", transport, "--port", str(port),
+        "--messages", str(messages), "--concurrency", str(concurrency),
+        cwd=API_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"{transport} x{concurrency} failed:\n{stderr.decode()}")
+    return json.loads(stdout.decode().strip().splitlines()[-1])
+
+
+async def run(args: argparse.Namespace) -> List[dict]:
+    results = []
+    async with SMTPSink(config=SinkConfig(latency_ms=args.latency_ms)) as sink:
+        port = sink.port
+        proxy = None
+        if args.rtt_ms:
+            proxy = await start_delay_proxy(sink.port, args.rtt_ms)
+            port = proxy.sockets[0].getsockname()[1]
+        try:
+            for concurrency in args.concurrency:
+                for transport in args.transports:
+                    results.append(await _run_child(transport, port, args.messages, concurrency))
+        finally:
+            if proxy is not None:
+                proxy.close()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Thread vs asyncio SMTP transport benchmark.")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="sink delay before every reply")
+    parser.add_argument("--rtt-ms", type=float, default=10.0, help="network round trip added by a proxy")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--child", choices=TRANSPORTS, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        import logging
+
+        logging.disable(logging.CRITICAL)
+        result = asyncio.run(run_transport(args.child, args.port, args.messages, args.concurrency[0]))
+        print(json.dumps(result))
+        return 0
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'transport':<9} {'conc':>5} {'msgs/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'threads':>8} {'errors':>7}")
+    for r in results:
+        print(f"{r['transport']:<9} {r['concurrency']:>5} {r['msgs_per_s']:>9} {r['p50_ms']:>9} "
+              f"{r['p95_ms']:>9} {r['peak_threads']:>8} {r['errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""Benchmark TLS handshake throughput for each server/TLS profile.
+
+Starts the real server (gunicorn with ``gunicorn_conf.py``, or hypercorn with
+``hypercorn_conf.py``) for each case and opens new connections from
+``--concurrency`` client threads for ``--duration`` seconds. Each connection
+completes a handshake and one ``GET /health`` over HTTP/1.1, so the rate is
+bounded by the server's handshake cost:
+
+- ``full``: every connection does a full handshake;
+- ``resumed``: connections present the previous session ticket, and the
+  report includes how many were actually resumed.
+
+Cases cover the old RSA-4096 key, an ECDSA P-256 key under the
+``intermediate`` and ``modern`` profiles, plain HTTP (``off``, the
+load-balancer-terminated mode), and hypercorn with ``h2`` ALPN. Keys are
+generated with ``openssl`` exactly like the Dockerfile does.
+
+Usage (from ``api/``)::
+
+    python benchmarks/bench_tls_handshake.py
+    python benchmarks/bench_tls_handshake.py --case ecdsa-intermediate --case rsa4096-intermediate
+    python benchmarks/bench_tls_handshake.py --workers 2 --concurrency 16 --json
+"""
+
+import argparse
+import json
+import os
+import socket
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+API_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = API_DIR / "src"
+
+KEY_ARGS = {
+    "rsa4096": ["-newkey", "rsa:4096"],
+    "rsa2048": ["-newkey", "rsa:2048"],
+    "ecdsa": ["-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:P-256"],
+}
+
+# name: (server, key type, TLS profile)
+CASES = {
+    "rsa4096-intermediate": ("gunicorn", "rsa4096", "intermediate"),
+    "rsa2048-intermediate": ("gunicorn", "rsa2048", "intermediate"),
+    "ecdsa-intermediate": ("gunicorn", "ecdsa", "intermediate"),
+    "ecdsa-modern": ("gunicorn", "ecdsa", "modern"),
+    "plain-http": ("gunicorn", None, "off"),
+    "hypercorn-h2-ecdsa": ("hypercorn", "ecdsa", "intermediate"),
+}
+
+REQUEST = b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+
+
+def _generate_key(key_type: str, directory: Path) -> tuple:
+    certfile = directory / f"{key_type}-cert.pem"
+    keyfile = directory / f"{key_type}-key.pem"
+    if not certfile.exists():
+        subprocess.run(
+            ["openssl", "req", "-x509", *KEY_ARGS[key_type], "-sha256", "-nodes", "-days", "1",
+             "-keyout", str(keyfile), "-out", str(certfile), "-subj", "/CN=localhost"],
+            check=True, capture_output=True,
+        )
+    return str(certfile), str(keyfile)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _client_context(alpn: List[str]) -> ssl.SSLContext:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    context.set_alpn_protocols(alpn)
+    return context
+
+
+def _connect(port: int, context: Optional[ssl.SSLContext], session=None):
+    """Open one connection, send GET /health, read the response.
+
+    Returns ``(handshake_s, total_s, session, reused, alpn)``.
+    """
+    start = time.perf_counter()
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    handshake_s = 0.0
+    reused = False
+    alpn = None
+    try:
+        if context is not None:
+            sock = context.wrap_socket(sock, server_hostname="localhost", session=session)
+            handshake_s = time.perf_counter() - start
+            alpn = sock.selected_alpn_protocol()
+        sock.sendall(REQUEST)
+        response = b""
+        while chunk := sock.recv(65536):
+            response += chunk
+        if not response.startswith(b"HTTP/1.1 200"):
+            raise RuntimeError(f"unexpected response: {response[:80]!r}")
+        if context is not None:
+            # TLS 1.3 tickets arrive after the handshake; read them first
+            session = sock.session
+            reused = sock.session_reused
+    finally:
+        sock.close()
+    return handshake_s, time.perf_counter() - start, session, reused, alpn
+
+
+def _wait_ready(
+    port: int, context: Optional[ssl.SSLContext], process: subprocess.Popen, timeout_s: float = 30.0
+) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited early:\n{process.stderr.read().decode()}")
+        try:
+            _connect(port, context)
+            return
+        except (OSError, RuntimeError):
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def _spawn(
+    server: str, port: int, profile: str, certfile: Optional[str], keyfile: Optional[str], workers: int
+) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(
+        {
+            "ENVIRONMENT": "local",
+            "PYTHONPATH": str(SRC_DIR),
+            "LANDING_API_CONFIG_SECRET_NAME": "",
+            "LANDING_API_DEBUG": "true",
+            "LANDING_API_LOG_LEVEL": "WARNING",
+            "LANDING_API_RATE_LIMIT": "100000000",
+            # Route policies (prod: POST /contact=10) take precedence over RATE_LIMIT
+            "LANDING_API_RATE_LIMIT_POLICIES": "/=100000000",
+            "LANDING_API_BIND": f"127.0.0.1:{port}",
+            "LANDING_API_WORKERS": str(workers),
+            "LANDING_API_TLS_PROFILE": profile,
+            "LANDING_API_SSL_CERTFILE": certfile or "",
+            "LANDING_API_SSL_KEYFILE": keyfile or "",
+        }
+    )
+    if server == "hypercorn":
+        cmd = [sys.executable, "-m", "hypercorn", "--config", "python:hypercorn_conf", "main:app"]
+    else:
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn_conf.py", "main:app"]
+    return subprocess.Popen(cmd, cwd=SRC_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def _drive(port: int, context: Optional[ssl.SSLContext], resume: bool, concurrency: int, duration_s: float) -> dict:
+    handshakes: List[float] = []
+    totals: List[float] = []
+    counts = {"connections": 0, "reused": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration_s
+
+    def worker() -> None:
+        session = None
+        local_hs, local_total, local = [], [], {"connections": 0, "reused": 0, "errors": 0}
+        while time.perf_counter() < deadline:
+            try:
+                hs, total, new_session, reused, _ = _connect(port, context, session if resume else None)
+            except (OSError, RuntimeError):
+                local["errors"] += 1
+                session = None
+                continue
+            local_hs.append(hs)
+            local_total.append(total)
+            local["connections"] += 1
+            local["reused"] += reused
+            if resume:
+                session = new_session
+        with lock:
+            handshakes.extend(local_hs)
+            totals.extend(local_total)
+            for key, value in local.items():
+                counts[key] += value
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "connections_per_s": round(counts["connections"] / elapsed, 1),
+        "connections": counts["connections"],
+        "errors": counts["errors"],
+        "p50_connection_ms": round(statistics.median(totals) * 1000, 2) if totals else None,
+    }
+    if context is not None:
+        result["p50_handshake_ms"] = round(statistics.median(handshakes) * 1000, 2) if handshakes else None
+        result["resumed_ratio"] = round(counts["reused"] / counts["connections"], 3) if counts["connections"] else 0.0
+    return result
+
+
+def run_case(name: str, keys_dir: Path, args: argparse.Namespace) -> dict:
+    server, key_type, profile = CASES[name]
+    certfile, keyfile = _generate_key(key_type, keys_dir) if key_type else (None, None)
+    port = _free_port()
+    process = _spawn(server, port, profile, certfile, keyfile, args.workers)
+    context = _client_context(["http/1.1"]) if key_type else None
+    try:
+        _wait_ready(port, context, process)
+        result = {"server": server, "key": key_type, "profile": profile}
+        if context is not None:
+            # What a browser would get when it offers h2 as well
+            tls_probe = _client_context(["h2", "http/1.1"]).wrap_socket(
+                socket.create_connection(("127.0.0.1", port)), server_hostname="localhost"
+            )
+            result["alpn_offering_h2"] = tls_probe.selected_alpn_protocol()
+            result["tls_version"] = tls_probe.version()
+            result["cipher"] = tls_probe.cipher()[0]
+            tls_probe.close()
+        result["full"] = _drive(port, context, False, args.concurrency, args.duration)
+        if context is not None:
+            result["resumed"] = _drive(port, context, True, args.concurrency, args.duration)
+        return result
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _print_table(results: Dict[str, dict]) -> None:
+    print(f"{'case':<24} {'tls':<8} {'alpn(h2?)':<10} {'full conn/s':>11} {'hs p50 ms':>10} "
+          f"{'resumed conn/s':>15} {'hs p50 ms':>10} {'resumed':>8}")
+    for name, r in results.items():
+        full, resumed = r["full"], r.get("resumed") or {}
+        print(
+            f"{name:<24} {r.get('tls_version') or '-':<8} {r.get('alpn_offering_h2') or '-':<10} "
+            f"{full['connections_per_s']:>11} {str(full.get('p50_handshake_ms', '-')):>10} "
+            f"{str(resumed.get('connections_per_s', '-')):>15} {str(resumed.get('p50_handshake_ms', '-')):>10} "
+            f"{str(resumed.get('resumed_ratio', '-')):>8}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark TLS handshake throughput per profile.")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="repeatable; default: all")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per measurement")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    names = args.case or list(CASES)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="tls-bench-") as keys_dir:
+        for name in names:
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = run_case(name, Path(keys_dir), args)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
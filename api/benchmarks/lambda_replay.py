@@ -0,0 +1,280 @@
+"""Replay recorded API Gateway events against the Lambda handlers.
+
+Measures, for ``src.lambda_handler.handler`` (FastAPI via Mangum) and
+``src.form_handler.handler``:
+
+- cold start: module import time and first-invocation latency, each taken in
+  a fresh interpreter (``--cold-runs`` times, median reported);
+- warm latency per event (p50/p95 over ``--warm-iterations`` invocations);
+- memory: peak tracemalloc bytes per invocation and process peak RSS.
+
+The corpus in ``benchmarks/events`` holds API Gateway REST (v1) and HTTP API
+(v2) events: OPTIONS preflight, ``/health``, ``/contact`` with JSON,
+form-encoded, base64, malformed and incomplete bodies. ``/contact`` delivers
+to a local SMTP sink so no real mail is sent.
+
+Lambda allocates CPU in proportion to ``MemorySize``; compare the peak RSS
+and cold-start numbers here against the 128 MB set in
+``iac/api/template.yaml`` when tuning it.
+
+Usage (from ``api/``)::
+
+    python benchmarks/lambda_replay.py
+    python benchmarks/lambda_replay.py --handler form --warm-iterations 500 --json
+    python benchmarks/lambda_replay.py --update-baseline   # record benchmarks/lambda_baseline.json
+    python benchmarks/lambda_replay.py --baseline benchmarks/lambda_baseline.json
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+API_DIR = Path(__file__).resolve().parent.parent
+EVENTS_DIR = Path(__file__).resolve().parent / "events"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "lambda_baseline.json"
+
+HANDLERS = {
+    "lambda": "src.lambda_handler",
+    "form": "src.form_handler",
+}
+
+
+class FakeContext:
+    """Minimal stand-in for the Lambda context object."""
+
+    function_name = "landing-api-replay"
+    function_version = "$LATEST"
+    memory_limit_in_mb = 128
+    invoked_function_arn = "arn:aws:lambda:us-east-1:123456789012:function:landing-api-replay"
+
+    def __init__(self, request_id: str):
+        self.aws_request_id = request_id
+
+    def get_remaining_time_in_millis(self) -> int:
+        return 10_000
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _load_events(events_dir: Path) -> Dict[str, dict]:
+    return {p.stem: json.loads(p.read_text()) for p in sorted(events_dir.glob("*.json"))}
+
+
+# ---------------------------------------------------------------------------
+# Child process: one cold start plus optional warm replay
+# ---------------------------------------------------------------------------
+
+def _child(handler_name: str, events_dir: Path, warm_iterations: int) -> dict:
+    # Mirror the deployed layout: CodeUri is api/, PYTHONPATH includes src/
+    sys.path.insert(0, str(API_DIR))
+    events = _load_events(events_dir)
+    first_event = events.get("v1-get-health") or next(iter(events.values()))
+
+    start = time.perf_counter()
+    module = importlib.import_module(HANDLERS[handler_name])
+    import_s = time.perf_counter() - start
+    rss_after_import = _rss_mb()
+
+    start = time.perf_counter()
+    module.handler(first_event, FakeContext("cold"))
+    first_invoke_s = time.perf_counter() - start
+
+    result = {
+        "import_ms": round(import_s * 1000, 2),
+        "first_invoke_ms": round(first_invoke_s * 1000, 2),
+        "rss_after_import_mb": rss_after_import,
+    }
+    if not warm_iterations:
+        return result
+
+    per_event = {}
+    for name, event in events.items():
+        latencies = []
+        status = None
+        for i in range(warm_iterations):
+            start = time.perf_counter()
+            response = module.handler(event, FakeContext(f"{name}-{i}"))
+            latencies.append(time.perf_counter() - start)
+            status = (response or {}).get("statusCode")
+
+        # Separate pass: tracemalloc slows allocation-heavy code down
+        tracemalloc.start()
+        module.handler(event, FakeContext(f"{name}-traced"))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        per_event[name] = {
+            "status": status,
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+            "peak_alloc_kb": round(peak / 1024, 1),
+        }
+    result["events"] = per_event
+    result["peak_rss_mb"] = _rss_mb()
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Parent process
+# ---------------------------------------------------------------------------
+
+def _start_smtp_sink() -> int:
+    """Run the load-test SMTP sink in a background thread; return its port."""
+    sys.path.insert(0, str(API_DIR))
+    from loadtest.smtp_sink import SMTPSink
+
+    ready = threading.Event()
+    holder = {}
+
+    def run() -> None:
+        async def serve() -> None:
+            sink = await SMTPSink().start()
+            holder["port"] = sink.port
+            ready.set()
+            await asyncio.Event().wait()
+
+        asyncio.run(serve())
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait(10)
+    return holder["port"]
+
+
+def _run_child(handler_name: str, args: argparse.Namespace, warm_iterations: int, smtp_port: int) -> dict:
+    env = dict(os.environ)
+    env.update(
+        {
+            "ENVIRONMENT": args.environment,
+            "PYTHONPATH": str(API_DIR / "src"),
+            "LANDING_API_CONFIG_SECRET_NAME": "",
+            "LANDING_API_SMTP_HOST": "127.0.0.1",
+            "LANDING_API_SMTP_PORT": str(smtp_port),
+            "LANDING_API_SMTP_USE_TLS": "false",
+            "LANDING_API_RATE_LIMIT": "100000000",
+            # Route policies (prod: POST /contact=10) take precedence over RATE_LIMIT
+            "LANDING_API_RATE_LIMIT_POLICIES": "/=100000000",
+            "AWS_LAMBDA_FUNCTION_NAME": "landing-api-replay",
+        }
+    )
+    cmd = [
+        sys.executable, str(Path(__file__).resolve()), "--child", handler_name,
+        "--events", str(args.events), "--warm-iterations", str(warm_iterations),
+    ]
+    proc = subprocess.run(cmd, cwd=API_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{handler_name} replay failed:\n{proc.stderr}")
+    # Handlers print/log to stdout; the result is the last line
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(handler_name: str, args: argparse.Namespace, smtp_port: int) -> dict:
+    runs = [_run_child(handler_name, args, args.warm_iterations, smtp_port)]
+    runs += [_run_child(handler_name, args, 0, smtp_port) for _ in range(args.cold_runs - 1)]
+    return {
+        "handler": HANDLERS[handler_name] + ".handler",
+        "cold_runs": len(runs),
+        "import_ms": round(statistics.median(r["import_ms"] for r in runs), 2),
+        "first_invoke_ms": round(statistics.median(r["first_invoke_ms"] for r in runs), 2),
+        "rss_after_import_mb": max(r["rss_after_import_mb"] for r in runs),
+        "peak_rss_mb": runs[0].get("peak_rss_mb"),
+        "events": runs[0].get("events", {}),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], max_regression: float) -> List[str]:
+    """List metrics that regressed by more than ``max_regression`` (fraction)."""
+    failures = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        checks = [(k, current[k], base.get(k)) for k in ("import_ms", "first_invoke_ms", "peak_rss_mb")]
+        for event, stats in current["events"].items():
+            base_event = base.get("events", {}).get(event, {})
+            checks.append((f"{event}.p50_ms", stats["p50_ms"], base_event.get("p50_ms")))
+            checks.append((f"{event}.peak_alloc_kb", stats["peak_alloc_kb"], base_event.get("peak_alloc_kb")))
+        for metric, value, reference in checks:
+            if reference and value is not None and value > reference * (1 + max_regression):
+                failures.append(f"{name}.{metric}: {value} vs baseline {reference}")
+    return failures
+
+
+def _print_table(results: Dict[str, dict]) -> None:
+    for name, r in results.items():
+        print(f"\n== {r['handler']}")
+        print(
+            f"cold: import {r['import_ms']} ms, first invoke {r['first_invoke_ms']} ms "
+            f"(median of {r['cold_runs']}); RSS after import {r['rss_after_import_mb']} MB, "
+            f"peak RSS {r['peak_rss_mb']} MB"
+        )
+        print(f"{'event':<38} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'alloc KB':>9}")
+        for event, s in r["events"].items():
+            print(f"{event:<38} {str(s['status']):>6} {s['p50_ms']:>9} {s['p95_ms']:>9} {s['peak_alloc_kb']:>9}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay API Gateway events against the Lambda handlers.")
+    parser.add_argument("--handler", choices=("lambda", "form", "both"), default="both")
+    parser.add_argument("--events", type=Path, default=EVENTS_DIR)
+    parser.add_argument("--cold-runs", type=int, default=5)
+    parser.add_argument("--warm-iterations", type=int, default=100)
+    parser.add_argument("--environment", default="prod", help="ENVIRONMENT used to pick config/<env>.env")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--baseline", type=Path, help="fail when results regress against this file")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--child", choices=sorted(HANDLERS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.events, args.warm_iterations)))
+        return 0
+
+    smtp_port = _start_smtp_sink()
+    names = list(HANDLERS) if args.handler == "both" else [args.handler]
+    results = {name: measure(name, args, smtp_port) for name in names}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+
+    if args.update_baseline:
+        DEFAULT_BASELINE.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nBaseline written to {DEFAULT_BASELINE}")
+        return 0
+    if args.baseline:
+        failures = compare(results, json.loads(args.baseline.read_text()), args.max_regression)
+        if failures:
+            print("\nRegressions:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
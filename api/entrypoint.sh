@@ -16,10 +16,28 @@ else
     # Change to source directory
     cd /app/api/src
     
-    # ECS mode - start the web server with HTTPS
-    exec uvicorn app:app \
-        --host 0.0.0.0 \
-        --port 8000 \
-        --ssl-keyfile /app/api/key.pem \
-        --ssl-certfile /app/api/cert.pem
+    # SERVER_MODE=gunicorn (default): one uvicorn worker per available CPU,
+    # see gunicorn_conf.py. SERVER_MODE=hypercorn: HTTP/2 (h2 over ALPN), see
+    # hypercorn_conf.py. SERVER_MODE=uvicorn: single process.
+    # LANDING_API_TLS_PROFILE=intermediate|modern|off picks the TLS setup
+    # (tls.py); "off" serves plain HTTP behind a TLS-terminating load balancer.
+    if [ "${SERVER_MODE:-gunicorn}" = "uvicorn" ]; then
+        echo "Starting single-process uvicorn server"
+        if [ "${LANDING_API_TLS_PROFILE:-intermediate}" = "off" ]; then
+            exec uvicorn main:app --host 0.0.0.0 --port 8000
+        fi
+        exec uvicorn main:app \
+            --host 0.0.0.0 \
+            --port 8000 \
+            --ssl-keyfile /app/api/key.pem \
+            --ssl-certfile /app/api/cert.pem
+    fi
+
+    if [ "${SERVER_MODE}" = "hypercorn" ]; then
+        echo "Starting hypercorn (HTTP/2)"
+        exec hypercorn --config python:hypercorn_conf main:app
+    fi
+
+    echo "Starting gunicorn with uvicorn workers"
+    exec gunicorn -c gunicorn_conf.py main:app
 fi
@@ -0,0 +1 @@
+"""Load-test harness for the Landing API (see ``python -m loadtest --help``)."""
@@ -0,0 +1,225 @@
+"""Run Landing API load-test scenarios and gate on thresholds.
+
+By default each scenario starts its own uvicorn server for ``src.app:app``
+wired to an in-process SMTP sink, so runs are repeatable on a laptop or CI
+box. Pass ``--base-url`` to target an already running deployment instead.
+
+Usage (from ``api/``)::
+
+    python -m loadtest                              # all scenarios
+    python -m loadtest --scenario contact --rate 100 --smtp-latency-ms 40
+    python -m loadtest --scenario health --base-url https://localhost:8000
+    python -m loadtest --update-baseline            # record loadtest/baseline.json
+    python -m loadtest --output results.json        # exit 1 on threshold breach
+
+Latency and throughput limits in ``thresholds.json`` are relative to a
+baseline run recorded on the same machine (``--update-baseline``), so a
+slower box does not fail and a faster one does not hide a regression. The
+baseline is machine-specific and not committed. Without one only the error
+rate is gated.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from .driver import run_open_model
+from .scenarios import SCENARIOS, Scenario
+from .smtp_sink import SinkConfig, SMTPSink
+
+API_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_THRESHOLDS = Path(__file__).resolve().parent / "thresholds.json"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(base_url: str, timeout_s: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    async with httpx.AsyncClient(base_url=base_url, verify=False) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy within {timeout_s}s")
+
+
+def _spawn_server(port: int, smtp_port: int, extra_env: Dict[str, str], server_cmd: Optional[str]) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(
+        {
+            "ENVIRONMENT": "local",
+            "PYTHONPATH": str(API_DIR / "src"),
+            "LANDING_API_CONFIG_SECRET_NAME": "",
+            "LANDING_API_DEBUG": "true",
+            "LANDING_API_LOG_LEVEL": "WARNING",
+            "LANDING_API_SMTP_HOST": "127.0.0.1",
+            "LANDING_API_SMTP_PORT": str(smtp_port),
+            "LANDING_API_SMTP_USE_TLS": "false",
+        }
+    )
+    env.update(extra_env)
+    if server_cmd:
+        cmd = server_cmd.format(port=port).split()
+    else:
+        cmd = [
+            sys.executable, "-m", "uvicorn", "src.app:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log",
+        ]
+    return subprocess.Popen(cmd, cwd=API_DIR, env=env, stdout=subprocess.DEVNULL)
+
+
+def check_thresholds(name: str, summary: dict, thresholds: dict, baseline: Optional[dict] = None) -> List[str]:
+    """Return human-readable threshold violations for one scenario.
+
+    ``max_<pct>_regression`` and ``max_throughput_drop`` are fractions of the
+    ``baseline`` run of the same scenario and are skipped without one (or
+    when the offered rate differs); ``max_error_rate`` is absolute.
+    """
+    limits = thresholds.get(name, {})
+    failures = []
+    limit = limits.get("max_error_rate")
+    if limit is not None and summary["error_rate"] > limit:
+        failures.append(f"{name}: error rate {summary['error_rate']} > {limit}")
+
+    if not baseline or baseline.get("offered_rps") != summary.get("offered_rps"):
+        return failures
+    latency = summary["latency_ms"]
+    for pct in ("p50", "p95", "p99"):
+        limit = limits.get(f"max_{pct}_regression")
+        reference = baseline["latency_ms"].get(pct)
+        if limit is not None and reference and latency[pct] > reference * (1 + limit):
+            failures.append(f"{name}: {pct} {latency[pct]} ms vs baseline {reference} ms (+{limit:.0%} allowed)")
+    limit = limits.get("max_throughput_drop")
+    reference = baseline.get("throughput_rps")
+    if limit is not None and reference and summary["throughput_rps"] < reference * (1 - limit):
+        failures.append(
+            f"{name}: throughput {summary['throughput_rps']} rps vs baseline {reference} rps (-{limit:.0%} allowed)"
+        )
+    return failures
+
+
+async def run_scenario(scenario: Scenario, args: argparse.Namespace) -> dict:
+    profile = scenario.profile
+    overrides = {
+        key: value
+        for key, value in (
+            ("rate", args.rate), ("duration_s", args.duration),
+            ("arrival", args.arrival), ("warmup_s", args.warmup),
+        )
+        if value is not None
+    }
+    profile = replace(profile, **overrides)
+
+    if args.base_url:
+        summary = await run_open_model(args.base_url, profile, scenario.build_request, ok_statuses=scenario.ok_statuses)
+        summary["scenario"] = scenario.name
+        return summary
+
+    sink_config = SinkConfig(
+        latency_ms=args.smtp_latency_ms,
+        data_latency_ms=args.smtp_data_latency_ms,
+        failure_rate=args.smtp_failure_rate,
+        drop_rate=args.smtp_drop_rate,
+        seed=args.seed,
+    )
+    async with SMTPSink(config=sink_config) as sink:
+        port = _free_port()
+        server = _spawn_server(port, sink.port, scenario.server_env, args.server_cmd)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            await _wait_ready(base_url)
+            summary = await run_open_model(base_url, profile, scenario.build_request, ok_statuses=scenario.ok_statuses)
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        summary["smtp_sink"] = sink.stats.as_dict()
+    summary["scenario"] = scenario.name
+    return summary
+
+
+async def _main(args: argparse.Namespace) -> int:
+    names = args.scenario or list(SCENARIOS)
+    thresholds = json.loads(Path(args.thresholds).read_text()) if args.thresholds else {}
+    baseline_path = Path(args.baseline)
+    baselines: Dict[str, dict] = {}
+    if not args.update_baseline:
+        if baseline_path.exists():
+            baselines = json.loads(baseline_path.read_text())
+        else:
+            print(f"No baseline at {baseline_path}; gating on error rate only", file=sys.stderr)
+
+    results = []
+    failures: List[str] = []
+    for name in names:
+        scenario = SCENARIOS[name]
+        print(f"Running {name}: {scenario.description}", file=sys.stderr)
+        summary = await run_scenario(scenario, args)
+        baseline = baselines.get(name)
+        if baseline and baseline.get("offered_rps") != summary.get("offered_rps"):
+            print(
+                f"{name}: baseline was recorded at a different rate; latency and throughput not compared",
+                file=sys.stderr,
+            )
+        summary["threshold_failures"] = check_thresholds(name, summary, thresholds, baseline)
+        failures.extend(summary["threshold_failures"])
+        results.append(summary)
+
+    report = {"results": results, "passed": not failures}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    print(text)
+    if args.update_baseline:
+        recorded = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        recorded.update({summary["scenario"]: summary for summary in results})
+        baseline_path.write_text(json.dumps(recorded, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}", file=sys.stderr)
+    for failure in failures:
+        print(f"THRESHOLD FAILED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Landing API load tests.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--base-url", help="target an existing server instead of spawning one")
+    parser.add_argument("--server-cmd", help="custom server command; {port} is substituted")
+    parser.add_argument("--rate", type=float, help="override arrivals per second")
+    parser.add_argument("--duration", type=float, help="override measured seconds")
+    parser.add_argument("--warmup", type=float, help="override warm-up seconds")
+    parser.add_argument("--arrival", choices=("poisson", "constant"))
+    parser.add_argument("--smtp-latency-ms", type=float, default=0.0)
+    parser.add_argument("--smtp-data-latency-ms", type=float, default=0.0)
+    parser.add_argument("--smtp-failure-rate", type=float, default=0.0)
+    parser.add_argument("--smtp-drop-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--thresholds", default=str(DEFAULT_THRESHOLDS), help="JSON thresholds ('' to disable)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="baseline run to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the baseline")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    return asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Open-model async HTTP load driver.
+
+Requests are issued on an arrival schedule (constant or Poisson) that does
+not depend on how fast the server answers, so queueing inside the service
+shows up as latency instead of silently lowering the offered load the way a
+closed-loop "N workers" driver would.
+"""
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+
+@dataclass
+class RequestSpec:
+    """One request to send; built per arrival so payloads can vary."""
+
+    method: str
+    path: str
+    json: Optional[dict] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Sample:
+    start: float
+    latency_s: float
+    status: int            # 0 for transport errors and timeouts
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadProfile:
+    """Arrival process for an open-model run."""
+
+    rate: float                   # requests per second
+    duration_s: float
+    arrival: str = "poisson"      # "poisson" or "constant"
+    warmup_s: float = 0.0         # samples started during warm-up are discarded
+    max_in_flight: int = 10_000   # safety valve so a dead server can't exhaust sockets
+    timeout_s: float = 10.0
+    seed: Optional[int] = None
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[Sample], elapsed_s: float, ok_statuses: Iterable[int] = range(200, 400)) -> dict:
+    """Aggregate samples into latency percentiles, throughput and error rates."""
+    ok_statuses = set(ok_statuses)
+    latencies = sorted(s.latency_s * 1000 for s in samples)
+    statuses: Dict[str, int] = {}
+    errors = 0
+    for s in samples:
+        key = str(s.status) if s.status else (s.error or "error")
+        statuses[key] = statuses.get(key, 0) + 1
+        if s.status not in ok_statuses:
+            errors += 1
+    total = len(samples)
+    return {
+        "requests": total,
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(total / elapsed_s, 2) if elapsed_s else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "latency_ms": {
+            "min": round(latencies[0], 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+        "statuses": statuses,
+    }
+
+
+async def run_open_model(
+    base_url: str,
+    profile: LoadProfile,
+    next_request: Callable[[int], RequestSpec],
+    client: Optional[httpx.AsyncClient] = None,
+    ok_statuses: Iterable[int] = range(200, 400),
+) -> dict:
+    """Drive ``base_url`` at ``profile.rate`` and return a summary dict.
+
+    ``next_request(i)`` builds the i-th request. Arrivals dropped because
+    ``max_in_flight`` was reached are counted in ``dropped_arrivals``; a
+    non-zero value means the client, not the server, limited the run.
+    """
+    rng = random.Random(profile.seed)
+    samples: List[Sample] = []
+    in_flight = set()
+    dropped = 0
+    arrivals = 0
+    max_seen = 0
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=1000)
+    owns_client = client is None
+    client = client or httpx.AsyncClient(
+        base_url=base_url, timeout=profile.timeout_s, limits=limits, verify=False
+    )
+
+    run_start = time.perf_counter()
+    measure_from = run_start + profile.warmup_s
+    end = run_start + profile.warmup_s + profile.duration_s
+
+    async def fire(spec: RequestSpec) -> None:
+        start = time.perf_counter()
+        try:
+            response = await client.request(spec.method, spec.path, json=spec.json, headers=spec.headers)
+            sample = Sample(start, time.perf_counter() - start, response.status_code)
+        except httpx.TimeoutException:
+            sample = Sample(start, time.perf_counter() - start, 0, "timeout")
+        except httpx.HTTPError as exc:
+            sample = Sample(start, time.perf_counter() - start, 0, type(exc).__name__)
+        if start >= measure_from:
+            samples.append(sample)
+
+    try:
+        i = 0
+        next_at = run_start
+        while next_at < end:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if next_at >= measure_from:
+                arrivals += 1
+            if len(in_flight) >= profile.max_in_flight:
+                dropped += 1
+            else:
+                task = asyncio.create_task(fire(next_request(i)))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                max_seen = max(max_seen, len(in_flight))
+            i += 1
+            gap = rng.expovariate(profile.rate) if profile.arrival == "poisson" else 1.0 / profile.rate
+            next_at += gap
+        if in_flight:
+            await asyncio.wait(in_flight, timeout=profile.timeout_s + 1)
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    elapsed = max(time.perf_counter(), end) - measure_from
+    summary = summarize(samples, min(elapsed, profile.duration_s) or elapsed, ok_statuses)
+    summary.update(
+        {
+            "offered_rps": profile.rate,
+            "arrivals": arrivals,
+            "arrival": profile.arrival,
+            "max_in_flight": max_seen,
+            "dropped_arrivals": dropped,
+        }
+    )
+    return summary
@@ -0,0 +1,116 @@
+"""Local OTLP/HTTP (JSON) collector stand-in for trace exports.
+
+Accepts ``POST /v1/traces`` the way an OpenTelemetry collector does, keeps
+per-span-name timing statistics and optionally appends every received span
+to an NDJSON file. On exit it prints where request time went, e.g. how
+``/contact`` splits between middleware, validation, the thread-pool queue
+and each SMTP phase.
+
+Run with::
+
+    python -m loadtest.otlp_sink --port 4318 --output spans.ndjson
+
+and point the API at it with ``LANDING_API_TRACE_EXPORTER=otlp``
+``LANDING_API_TRACE_SAMPLE_RATE=1``.
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from .driver import percentile
+
+
+class SpanStats:
+    """Durations per span name, shared between handler threads."""
+
+    def __init__(self, output: Optional[str] = None):
+        self.output = output
+        self.durations: Dict[str, List[float]] = {}
+        self.traces = set()
+        self._lock = threading.Lock()
+
+    def add(self, request: dict) -> int:
+        received = 0
+        lines = []
+        for resource_spans in request.get("resourceSpans", []):
+            for scope_spans in resource_spans.get("scopeSpans", []):
+                for span in scope_spans.get("spans", []):
+                    duration_ms = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+                    with self._lock:
+                        self.durations.setdefault(span["name"], []).append(duration_ms)
+                        self.traces.add(span["traceId"])
+                    lines.append(json.dumps(span))
+                    received += 1
+        if self.output and lines:
+            with self._lock, open(self.output, "a", encoding="utf-8") as fh:
+                fh.write("\n".join(lines) + "\n")
+        return received
+
+    def summary(self) -> List[dict]:
+        rows = []
+        with self._lock:
+            for name, values in self.durations.items():
+                ordered = sorted(values)
+                rows.append(
+                    {
+                        "span": name,
+                        "count": len(ordered),
+                        "p50_ms": round(percentile(ordered, 50), 3),
+                        "p95_ms": round(percentile(ordered, 95), 3),
+                        "max_ms": round(ordered[-1], 3),
+                    }
+                )
+        return sorted(rows, key=lambda row: -row["p50_ms"])
+
+
+def make_server(host: str, port: int, stats: SpanStats) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/v1/traces":
+                self.send_error(404)
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            try:
+                stats.add(json.loads(body))
+            except (ValueError, KeyError, TypeError) as exc:
+                self.send_error(400, str(exc))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format, *args):  # noqa: A002 - silence per-request logs
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local OTLP/HTTP JSON trace collector.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--output", help="append received spans to this NDJSON file")
+    args = parser.parse_args()
+
+    stats = SpanStats(args.output)
+    server = make_server(args.host, args.port, stats)
+    print(f"OTLP sink listening on http://{args.host}:{args.port}/v1/traces (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"\n{len(stats.traces)} traces")
+    print(f"{'span':<48} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for row in stats.summary():
+        print(f"{row['span']:<48} {row['count']:>7} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['max_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
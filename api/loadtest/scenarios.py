@@ -0,0 +1,65 @@
+"""Load-test scenarios for the Landing API."""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable
+
+from .driver import LoadProfile, RequestSpec
+
+
+@dataclass
+class Scenario:
+    """A named workload: request builder, default profile and app settings."""
+
+    name: str
+    description: str
+    build_request: Callable[[int], RequestSpec]
+    profile: LoadProfile
+    ok_statuses: Iterable[int] = range(200, 400)
+    # Extra environment for a spawned server (see ``__main__``)
+    server_env: Dict[str, str] = field(default_factory=dict)
+
+
+def _health(i: int) -> RequestSpec:
+    return RequestSpec("GET", "/health")
+
+
+def _contact(i: int) -> RequestSpec:
+    return RequestSpec(
+        "POST",
+        "/contact",
+        json={"name": f"Load Test {i}", "phone": f"+1555{i % 10_000_000:07d}"},
+        # Spread submissions over many client addresses so the per-IP rate
+        # limiter does not dominate the measurement
+        headers={"X-Forwarded-For": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"},
+    )
+
+
+def _rate_limit(i: int) -> RequestSpec:
+    # A single client hammering a rate-limited route
+    return RequestSpec("GET", "/")
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "health": Scenario(
+        name="health",
+        description="GET /health at a steady open-model rate (router + middleware overhead)",
+        build_request=_health,
+        profile=LoadProfile(rate=200, duration_s=20, warmup_s=2),
+    ),
+    "contact": Scenario(
+        name="contact",
+        description="POST /contact delivering to the local SMTP sink",
+        build_request=_contact,
+        profile=LoadProfile(rate=50, duration_s=20, warmup_s=2),
+        # Route policies take precedence over RATE_LIMIT; the limiter still runs
+        server_env={"LANDING_API_RATE_LIMIT": "1000000", "LANDING_API_RATE_LIMIT_POLICIES": "/=100000000"},
+    ),
+    "rate-limit": Scenario(
+        name="rate-limit",
+        description="Single client far above LANDING_API_RATE_LIMIT; 429s are expected",
+        build_request=_rate_limit,
+        profile=LoadProfile(rate=300, duration_s=15, warmup_s=0),
+        ok_statuses=(200, 429),
+        server_env={"LANDING_API_RATE_LIMIT": "100", "LANDING_API_RATE_LIMIT_POLICIES": "/health=exempt"},
+    ),
+}
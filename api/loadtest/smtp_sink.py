@@ -0,0 +1,192 @@
+"""Local SMTP stand-in for load tests and benchmarks.
+
+Speaks enough ESMTP (EHLO/HELO, optional AUTH PLAIN/LOGIN, MAIL, RCPT, DATA,
+RSET, NOOP, QUIT, PIPELINING) for ``smtplib`` and the contact router to
+deliver messages, and can inject latency and failures so ``/contact`` can be
+exercised against slow or flaky mail servers.
+
+Run standalone with::
+
+    python -m loadtest.smtp_sink --port 2525 --latency-ms 50 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+
+@dataclass
+class SinkConfig:
+    """Fault injection knobs for the SMTP sink."""
+
+    latency_ms: float = 0.0          # added before every reply
+    data_latency_ms: float = 0.0     # added before accepting a message body
+    failure_rate: float = 0.0        # fraction of messages rejected with 451
+    drop_rate: float = 0.0           # fraction of connections closed after greeting
+    pipelining: bool = True          # advertise PIPELINING in the EHLO reply
+    rejected_recipients: Tuple[str, ...] = ()  # RCPT TO addresses answered with 550
+    seed: Optional[int] = None
+
+
+@dataclass
+class SinkStats:
+    connections: int = 0
+    messages: int = 0
+    rejected: int = 0
+    dropped: int = 0
+    started_at: float = field(default_factory=time.time)
+
+    def as_dict(self) -> dict:
+        return {
+            "connections": self.connections,
+            "messages": self.messages,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "uptime_s": round(time.time() - self.started_at, 3),
+        }
+
+
+class SMTPSink:
+    """Asyncio SMTP server that accepts (or fails) every message."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[SinkConfig] = None):
+        self.host = host
+        self.port = port
+        self.config = config or SinkConfig()
+        self.stats = SinkStats()
+        self._random = random.Random(self.config.seed)
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> "SMTPSink":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "SMTPSink":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: str) -> None:
+        if self.config.latency_ms:
+            await asyncio.sleep(self.config.latency_ms / 1000)
+        writer.write(line.encode("ascii") + b"\r\n")
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats.connections += 1
+        try:
+            await self._reply(writer, "220 sink.local ESMTP load-test sink")
+            if self._random.random() < self.config.drop_rate:
+                self.stats.dropped += 1
+                return
+
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    return
+                command = raw.decode("ascii", "replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    writer.write(
+                        b"250-sink.local\r\n"
+                        + (b"250-PIPELINING\r\n" if self.config.pipelining else b"")
+                        + b"250-8BITMIME\r\n250-AUTH PLAIN LOGIN\r\n250 SIZE 10485760\r\n"
+                    )
+                    await writer.drain()
+                elif verb == "HELO":
+                    await self._reply(writer, "250 sink.local")
+                elif verb == "AUTH":
+                    parts = command.split()
+                    if len(parts) >= 2 and parts[1].upper() == "LOGIN":
+                        await self._reply(writer, "334 VXNlcm5hbWU6")
+                        await reader.readline()
+                        await self._reply(writer, "334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                    elif len(parts) == 2:
+                        await self._reply(writer, "334 ")
+                        await reader.readline()
+                    await self._reply(writer, "235 2.7.0 Authentication successful")
+                elif verb == "RCPT" and any(
+                    f"<{address}>" in command for address in self.config.rejected_recipients
+                ):
+                    await self._reply(writer, "550 5.1.1 Mailbox unavailable")
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    await self._reply(writer, "250 OK")
+                elif verb == "DATA":
+                    await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                    while True:
+                        line = await reader.readline()
+                        if not line:
+                            # Client hung up before the terminator: nothing is delivered
+                            return
+                        if line in (b".\r\n", b".\n"):
+                            break
+                    if self.config.data_latency_ms:
+                        await asyncio.sleep(self.config.data_latency_ms / 1000)
+                    if self._random.random() < self.config.failure_rate:
+                        self.stats.rejected += 1
+                        await self._reply(writer, "451 4.3.0 Injected failure")
+                    else:
+                        self.stats.messages += 1
+                        await self._reply(writer, "250 OK queued")
+                elif verb == "QUIT":
+                    await self._reply(writer, "221 Bye")
+                    return
+                else:
+                    await self._reply(writer, "502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    config = SinkConfig(
+        latency_ms=args.latency_ms,
+        data_latency_ms=args.data_latency_ms,
+        failure_rate=args.failure_rate,
+        drop_rate=args.drop_rate,
+        pipelining=not args.no_pipelining,
+        rejected_recipients=tuple(args.reject_rcpt),
+        seed=args.seed,
+    )
+    async with SMTPSink(args.host, args.port, config) as sink:
+        print(f"SMTP sink listening on {sink.host}:{sink.port}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            print(sink.stats.as_dict())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local SMTP sink with fault injection.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--data-latency-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--no-pipelining", action="store_true", help="Do not advertise PIPELINING.")
+    parser.add_argument(
+        "--reject-rcpt", action="append", default=[], metavar="ADDRESS", help="Answer RCPT TO for ADDRESS with 550."
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Minimal asyncio SMTP client (ESMTP, STARTTLS, AUTH, PIPELINING).
+
+The thread transport in ``routers/contact.py`` holds an OS thread for the
+whole SMTP dialog. This client runs the dialog on the event loop, so an
+in-flight delivery costs one coroutine and one socket. When the server
+advertises ``PIPELINING`` (RFC 2920) ``MAIL FROM``, every ``RCPT TO`` and
+``DATA`` are written together and their replies read afterwards, which
+turns ``2 + recipients`` round trips into one.
+
+Only what the contact form needs is implemented: one message per
+connection, ``AUTH PLAIN``/``AUTH LOGIN``, no SMTPUTF8 or BDAT/CHUNKING.
+Every read is bounded by ``timeout`` and the connection by
+``connect_timeout``.
+"""
+
+import asyncio
+import base64
+import re
+import socket
+import ssl
+from email.message import EmailMessage
+from email.policy import SMTP as SMTP_POLICY
+from email.utils import getaddresses
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_DOT_AT_LINE_START = re.compile(rb"(?m)^\.")
+
+# getfqdn() may do a reverse DNS lookup; resolve it once, off the loop
+_local_hostname: Optional[str] = None
+
+
+async def _default_local_hostname() -> str:
+    """This host's FQDN for ``EHLO``, resolved in a thread on first use."""
+    global _local_hostname
+    if _local_hostname is None:
+        _local_hostname = await asyncio.to_thread(socket.getfqdn)
+    return _local_hostname
+
+
+class SMTPError(Exception):
+    """The server answered with an unexpected reply code."""
+
+    def __init__(self, code: int, message: str, command: str = ""):
+        self.code = code
+        self.message = message
+        self.command = command
+        super().__init__(f"{command or 'SMTP'} failed: {code} {message}")
+
+
+class AsyncSMTP:
+    """One SMTP connection driven from the event loop."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        connect_timeout: float = 5.0,
+        timeout: float = 10.0,
+        local_hostname: Optional[str] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self.local_hostname = local_hostname
+        self.extensions: Dict[str, str] = {}
+        self.round_trips = 0
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def __aenter__(self) -> "AsyncSMTP":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # -- transport ---------------------------------------------------------
+
+    async def connect(self) -> None:
+        if not self.local_hostname:
+            self.local_hostname = await _default_local_hostname()
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout=self.connect_timeout
+        )
+        await self._expect(220, "connect", timeout=self.connect_timeout)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _write(self, *lines: bytes) -> None:
+        self._writer.write(b"".join(line + b"\r\n" for line in lines))
+
+    async def _read_reply(self, timeout: Optional[float] = None) -> Tuple[int, str]:
+        lines: List[str] = []
+        while True:
+            raw = await asyncio.wait_for(self._reader.readline(), timeout=timeout or self.timeout)
+            if not raw:
+                raise ConnectionResetError("SMTP server closed the connection")
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            try:
+                code = int(line[:3])
+            except ValueError:
+                raise SMTPError(-1, line, "reply") from None
+            lines.append(line[4:])
+            if line[3:4] != "-":
+                return code, "\n".join(lines)
+
+    async def _expect(self, expected: int, command: str, timeout: Optional[float] = None) -> str:
+        code, message = await self._read_reply(timeout)
+        if code != expected:
+            raise SMTPError(code, message, command)
+        return message
+
+    async def command(self, line: str, expected: int, name: Optional[str] = None) -> str:
+        """Send one command and wait for its reply (one round trip)."""
+        self._write(line.encode("utf-8"))
+        await self._writer.drain()
+        self.round_trips += 1
+        return await self._expect(expected, name or line.split(" ", 1)[0])
+
+    # -- ESMTP -------------------------------------------------------------
+
+    async def ehlo(self) -> Dict[str, str]:
+        reply = await self.command(f"EHLO {self.local_hostname}", 250)
+        self.extensions = {}
+        for line in reply.splitlines()[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.upper()] = params
+        return self.extensions
+
+    def supports(self, extension: str) -> bool:
+        return extension.upper() in self.extensions
+
+    async def starttls(self, context: Optional[ssl.SSLContext] = None) -> None:
+        if not self.supports("STARTTLS"):
+            raise SMTPError(-1, "server does not advertise STARTTLS", "STARTTLS")
+        await self.command("STARTTLS", 220)
+        await asyncio.wait_for(
+            self._writer.start_tls(context or ssl.create_default_context(), server_hostname=self.host),
+            timeout=self.timeout,
+        )
+        # RFC 3207: forget everything learned before the handshake
+        await self.ehlo()
+
+    async def login(self, username: str, password: str) -> None:
+        mechanisms = self.extensions.get("AUTH", "").upper().split()
+        if "PLAIN" in mechanisms or not mechanisms:
+            token = base64.b64encode(f"\0{username}\0{password}".encode("utf-8")).decode("ascii")
+            await self.command(f"AUTH PLAIN {token}", 235)
+        elif "LOGIN" in mechanisms:
+            await self.command("AUTH LOGIN", 334)
+            await self.command(base64.b64encode(username.encode("utf-8")).decode("ascii"), 334, name="AUTH")
+            await self.command(base64.b64encode(password.encode("utf-8")).decode("ascii"), 235, name="AUTH")
+        else:
+            raise SMTPError(-1, f"no supported AUTH mechanism in {mechanisms}", "AUTH")
+
+    async def sendmail(self, sender: str, recipients: Sequence[str], data: bytes) -> None:
+        """Send one message, pipelining the envelope when the server allows it."""
+        envelope = [f"MAIL FROM:<{sender}>".encode("utf-8")]
+        envelope += [f"RCPT TO:<{rcpt}>".encode("utf-8") for rcpt in recipients]
+        envelope.append(b"DATA")
+
+        if self.supports("PIPELINING"):
+            self._write(*envelope)
+            await self._writer.drain()
+            self.round_trips += 1
+            # Read every reply before judging, so the stream stays in sync
+            replies = [await self._read_reply() for _ in envelope]
+            expected = [250] * (len(envelope) - 1) + [354]
+            for line, (code, message), want in zip(envelope, replies, expected):
+                if code != want:
+                    if replies[-1][0] == 354:
+                        # DATA was accepted anyway. Terminating it would
+                        # deliver an empty message to the accepted RCPTs, so
+                        # drop the connection mid-DATA instead
+                        self.close()
+                    raise SMTPError(code, message, line.split(b" ", 1)[0].decode())
+        else:
+            for line, want in zip(envelope, [250] * (len(envelope) - 1) + [354]):
+                await self.command(line.decode("utf-8"), want)
+
+        body = _DOT_AT_LINE_START.sub(b"..", data)
+        if not body.endswith(b"\r\n"):
+            body += b"\r\n"
+        self._writer.write(body + b".\r\n")
+        await self._writer.drain()
+        self.round_trips += 1
+        await self._expect(250, "DATA")
+
+    async def quit(self) -> None:
+        """End the session, ignoring errors like ``smtplib`` does."""
+        # The message was already accepted; a bad QUIT reply is not a failure
+        try:
+            await self.command("QUIT", 221)
+        except (SMTPError, OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            self.close()
+
+
+def envelope_for(message: EmailMessage) -> Tuple[str, List[str]]:
+    """Envelope sender and recipients taken from the message headers."""
+    sender = getaddresses([message["From"]])[0][1]
+    recipients = [
+        address
+        for _, address in getaddresses(message.get_all("To", []) + message.get_all("Cc", []))
+        if address
+    ]
+    return sender, recipients
+
+
+def message_bytes(message: EmailMessage) -> bytes:
+    """The message with CRLF line endings, ready for ``DATA``."""
+    return message.as_bytes(policy=SMTP_POLICY)
@@ -1,6 +1,9 @@
 """Authentication and authorization."""
 
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import structlog
 
@@ -53,3 +56,47 @@ async def get_optional_user(
         return await get_current_user(credentials)
     except HTTPException:
         return "anonymous"
+
+
+async def require_debug_access(
+    x_debug_token: Optional[str] = Header(default=None)
+) -> None:
+    """Guard for ``/debug`` endpoints.
+
+    They answer 404 unless ``LANDING_API_DEBUG_ENDPOINTS_ENABLED`` is set,
+    and then only with ``X-Debug-Token`` matching ``LANDING_API_DEBUG_TOKEN``.
+    """
+    settings = get_settings()
+    if not settings.debug_endpoints_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not settings.debug_token or not x_debug_token or not hmac.compare_digest(
+        x_debug_token.encode(), settings.debug_token.encode()
+    ):
+        logger.warning("Rejected debug endpoint access")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid debug token"
+        )
+
+
+export_security = HTTPBearer(auto_error=False)
+
+
+async def require_leads_access(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(export_security)
+) -> None:
+    """Guard for lead exports (``GET /contact/submissions``).
+
+    Answers 404 unless ``LANDING_API_LEADS_EXPORT_TOKEN`` is set, then
+    requires it as the bearer token.
+    """
+    token = get_settings().leads_export_token
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), token.encode()):
+        logger.warning("Rejected lead export access")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid export token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
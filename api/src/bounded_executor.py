@@ -0,0 +1,159 @@
+"""Dedicated thread pool with admission control for blocking work.
+
+``asyncio.to_thread`` uses the loop's default executor, which is shared by
+everything and queues without limit. A ``BoundedExecutor`` owns its threads
+and admits at most ``workers + queue_size`` calls; beyond that ``run``
+raises ``ConcurrencyLimitError`` (429) immediately instead of letting
+latency grow unbounded.
+
+Executors are named and kept in a registry (like circuit breakers) so their
+queue depth, in-flight count and wait time are exported on ``/metrics``::
+
+    executor = bounded_executor.get("delivery", workers=4, queue_size=16)
+    await executor.run(send_email)
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+
+import structlog
+
+from exceptions import ConcurrencyLimitError
+import metrics
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """Thread pool that rejects work once ``workers + queue_size`` calls are admitted."""
+
+    def __init__(self, name: str, workers: int, queue_size: int):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self._pool = self._new_pool(workers)
+        self._admitted = 0
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def _new_pool(self, workers: int) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.name}-")
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    @property
+    def queued(self) -> int:
+        return max(0, self._admitted - self._running)
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def resize(self, workers: int, queue_size: int) -> None:
+        """Apply new limits; a new worker count starts a fresh pool.
+
+        Calls already running finish on the old pool, which shuts down once
+        they are done.
+        """
+        if workers != self.workers:
+            old, self._pool = self._pool, self._new_pool(workers)
+            old.shutdown(wait=False)
+            logger.info("Executor resized", executor=self.name, workers=workers, queue_size=queue_size)
+        self.workers = workers
+        self.queue_size = queue_size
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._admitted >= self.capacity:
+                _rejected.inc(executor=self.name)
+                raise ConcurrencyLimitError(
+                    f"{self.name} is at capacity ({self.workers} running, {self.queue_size} queued)"
+                )
+            self._admitted += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._admitted -= 1
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run ``func`` on the pool (with the caller's contextvars) or raise ``ConcurrencyLimitError``."""
+        self._admit()
+        submitted = time.perf_counter()
+        context = contextvars.copy_context()
+
+        def call() -> T:
+            _wait_seconds.observe(time.perf_counter() - submitted, executor=self.name)
+            with self._lock:
+                self._running += 1
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        try:
+            future = self._pool.submit(call)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is released when the call finishes, not when the caller
+        # stops waiting, so timed-out work still counts against capacity. A
+        # caller cancelled while still queued cancels the future, so the
+        # call never runs; the done callback fires in that case too.
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "queued": self.queued,
+        }
+
+
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get(name: str, workers: Optional[int] = None, queue_size: Optional[int] = None) -> BoundedExecutor:
+    """Get (or create) the named executor, applying any changed limits."""
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = _executors[name] = BoundedExecutor(name, workers or 4, queue_size or 0)
+            return executor
+    workers = executor.workers if workers is None else workers
+    queue_size = executor.queue_size if queue_size is None else queue_size
+    if (workers, queue_size) != (executor.workers, executor.queue_size):
+        executor.resize(workers, queue_size)
+    return executor
+
+
+def snapshot() -> Dict[str, dict]:
+    with _executors_lock:
+        executors = list(_executors.values())
+    return {executor.name: executor.snapshot() for executor in executors}
+
+
+def _samples(field: str):
+    def collect():
+        return {metrics.labels(executor=name): info[field] for name, info in snapshot().items()}
+
+    return collect
+
+
+_rejected = metrics.counter("executor_rejected_total", "Calls rejected because the executor was full.")
+_wait_seconds = metrics.histogram(
+    "executor_queue_wait_seconds", "Time calls waited for an executor thread."
+)
+metrics.gauge("executor_queue_depth", "Calls admitted but waiting for a thread.", callback=_samples("queued"))
+metrics.gauge("executor_running", "Calls currently running on executor threads.", callback=_samples("running"))
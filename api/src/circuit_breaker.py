@@ -0,0 +1,181 @@
+"""Circuit breaker for calls to external services.
+
+``closed``: calls go through; ``failure_threshold`` consecutive failures
+open the circuit.
+``open``: calls fail fast with ``CircuitOpenError`` for ``reset_timeout``
+seconds.
+``half_open``: after the cool-down up to ``half_open_max_calls`` probe
+calls go through; a success closes the circuit, a failure re-opens it for
+another cool-down.
+
+Breakers are named and kept in a process-wide registry so ``/health`` and
+``/metrics`` can report them::
+
+    breaker = circuit_breaker.get("smtp", failure_threshold=5, reset_timeout=30)
+    with breaker:
+        await deliver()
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import structlog
+
+from exceptions import CircuitOpenError, ConcurrencyLimitError
+import metrics
+
+logger = structlog.get_logger()
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Numeric encoding for the state gauge
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (thread-safe)."""
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        logger.warning("Circuit breaker state change", breaker=self.name, old=self._state, new=state)
+        self._state = state
+        self._probes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == CLOSED:
+            self._failures = 0
+        _transitions.inc(breaker=self.name, state=state)
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed (0 unless open)."""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> None:
+        """Admit a call or raise ``CircuitOpenError``."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+            retry_after = self.reset_timeout - (time.monotonic() - self._opened_at) if state == OPEN else 1.0
+        _rejections.inc(breaker=self.name)
+        raise CircuitOpenError(self.name, max(1.0, retry_after))
+
+    def abandon(self) -> None:
+        """An admitted call was not attempted after all (frees a probe slot)."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+            }
+
+    def __enter__(self) -> "CircuitBreaker":
+        self.allow()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.record_success()
+        elif issubclass(exc_type, ConcurrencyLimitError) or not issubclass(exc_type, Exception):
+            # Shed before the call, or cancelled (CancelledError is a
+            # BaseException): says nothing about the service's health
+            self.abandon()
+        elif not issubclass(exc_type, CircuitOpenError):
+            self.record_failure()
+        return False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get(name: str, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None) -> CircuitBreaker:
+    """Get (or create) the named breaker, applying any changed thresholds.
+
+    Passing the current settings on every call lets a configuration reload
+    retune the breaker without resetting its state.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+    if failure_threshold is not None:
+        breaker.failure_threshold = failure_threshold
+    if reset_timeout is not None:
+        breaker.reset_timeout = reset_timeout
+    return breaker
+
+
+def snapshot() -> Dict[str, dict]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def _state_samples():
+    return {
+        metrics.labels(breaker=name): STATE_VALUES[info["state"]]
+        for name, info in snapshot().items()
+    }
+
+
+_transitions = metrics.counter(
+    "circuit_breaker_transitions_total", "Circuit breaker state changes by new state."
+)
+_rejections = metrics.counter(
+    "circuit_breaker_rejected_total", "Calls rejected while the circuit was open."
+)
+metrics.gauge(
+    "circuit_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open).", callback=_state_samples
+)
@@ -0,0 +1,83 @@
+"""Client IP resolution behind trusted proxies.
+
+Behind an ALB the socket peer is the load balancer, and anything in
+``X-Forwarded-For`` left of the entries our own proxies appended is
+whatever the client chose to send. The client is therefore the
+right-most address that is not a trusted proxy:
+
+- if the peer is not in ``trusted_proxies`` it is the client (the header
+  is ignored, it could be forged);
+- otherwise ``X-Forwarded-For`` is walked from the right, skipping trusted
+  addresses, and the first untrusted one is the client.
+
+``trusted_proxies`` is a list of addresses/CIDRs (``10.0.0.0/8``); ``*``
+trusts every hop, i.e. the left-most address wins. On Lambda, Mangum
+puts API Gateway's ``sourceIp`` in the scope's ``client``, so
+``from_scope`` covers both entry points.
+"""
+
+import ipaddress
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from config import get_settings
+
+UNKNOWN = "unknown"
+
+
+class TrustedProxies:
+    """A precompiled set of trusted proxy networks."""
+
+    def __init__(self, networks: Iterable[str]):
+        self.trust_all = False
+        self.networks: List[ipaddress._BaseNetwork] = []
+        for network in networks:
+            network = network.strip()
+            if network == "*":
+                self.trust_all = True
+            elif network:
+                self.networks.append(ipaddress.ip_network(network, strict=False))
+
+    def __contains__(self, address: str) -> bool:
+        if self.trust_all:
+            return True
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.networks)
+
+    def client_ip(self, peer: Optional[str], forwarded_for: Optional[str]) -> str:
+        """The client address for a connection from ``peer``."""
+        if not peer:
+            return UNKNOWN
+        if not forwarded_for or peer not in self:
+            return peer
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if hop not in self:
+                return hop
+        # Every hop is trusted: the left-most one is the furthest we can see
+        return hops[0] if hops else peer
+
+
+@lru_cache(maxsize=8)
+def _compile(networks: Tuple[str, ...]) -> TrustedProxies:
+    return TrustedProxies(networks)
+
+
+def trusted_proxies() -> TrustedProxies:
+    """``TrustedProxies`` for the current ``Settings.trusted_proxies``."""
+    return _compile(tuple(get_settings().trusted_proxies))
+
+
+def from_scope(scope) -> str:
+    """Client IP for an ASGI HTTP scope."""
+    client = scope.get("client")
+    forwarded_for = None
+    for name, value in scope.get("headers") or ():
+        if name == b"x-forwarded-for":
+            # Repeated headers are one list (RFC 9110 section 5.3)
+            value = value.decode("latin-1")
+            forwarded_for = f"{forwarded_for},{value}" if forwarded_for else value
+    return trusted_proxies().client_ip(client[0] if client else None, forwarded_for)
@@ -0,0 +1,268 @@
+"""Negotiated gzip/brotli response compression for the API service."""
+
+import gzip
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+try:  # brotli is optional; gzip is always available
+    import brotli
+except ImportError:  # pragma: no cover - depends on the deployment image
+    brotli = None
+
+
+# Content types worth compressing. Images, fonts and archives are already
+# compressed and only cost CPU.
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def available_encodings() -> List[str]:
+    """Return the encodings this process can produce, in preference order."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str, available: Optional[List[str]] = None) -> Optional[str]:
+    """Pick the best content-coding for an ``Accept-Encoding`` header.
+
+    Honours q-values (``gzip;q=0`` disables gzip) and the ``*`` wildcard.
+    Ties are broken by server preference, so brotli wins over gzip when the
+    client rates them equally. Returns ``None`` when the response should be
+    sent uncompressed.
+    """
+    if not accept_encoding:
+        return None
+
+    available = available if available is not None else available_encodings()
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best: Optional[str] = None
+    best_q = 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """Check whether a response content type should be compressed."""
+    content_type = (content_type or "").lower()
+    return any(content_type.startswith(t) for t in COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    """Incremental compressor with a uniform interface for gzip and brotli."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 selects the gzip container
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """One-shot compression helper used by the middleware and benchmarks."""
+    if encoding == "br":
+        if brotli is None:
+            raise RuntimeError("brotli is not installed")
+        return brotli.compress(body, quality=4 if level is None else level)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses according to ``Accept-Encoding``.
+
+    Bodies sent in a single message are compressed in one shot and only when
+    they reach ``minimum_size``. Streaming bodies (``more_body=True``) are
+    compressed incrementally so large responses never have to be buffered.
+    Responses that already carry a ``Content-Encoding``, partial content
+    (``Content-Range``) and non-compressible content types pass through
+    untouched. A strong ``ETag`` on a response that does get compressed is
+    made weak, since the bytes on the wire no longer match it.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request ``send`` wrapper holding the response start message."""
+
+    def __init__(self, send, encoding: str, config: CompressionMiddleware):
+        self._send = send
+        self.encoding = encoding
+        self.config = config
+        self.start_message: Optional[dict] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: dict) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = _Headers(message.get("headers", []))
+            if (
+                headers.get("content-encoding")
+                or headers.get("content-range")
+                or not is_compressible(headers.get("content-type"))
+            ):
+                self.passthrough = True
+            return
+
+        if message_type != "http.response.body":
+            # e.g. http.response.pathsend (FileResponse): the body bypasses
+            # us, so it goes out as is
+            if self.start_message is not None:
+                await self._send(self.start_message)
+                self.start_message = None
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self._send(self.start_message)
+                self.start_message = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = _Headers(self.start_message.get("headers", []))
+            headers.add_vary("Accept-Encoding")
+
+            if not more_body:
+                # Whole body in one message: skip small payloads entirely
+                if len(body) < self.config.minimum_size:
+                    self.start_message["headers"] = headers.raw
+                    await self._send(self.start_message)
+                    await self._send(message)
+                    return
+                compressed = compress(
+                    body,
+                    self.encoding,
+                    self.config.brotli_quality if self.encoding == "br" else self.config.gzip_level,
+                )
+                headers.set("content-encoding", self.encoding)
+                headers.set("content-length", str(len(compressed)))
+                headers.weaken_etag()
+                self.start_message["headers"] = headers.raw
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming body: length is unknown up front
+            self.compressor = _Compressor(
+                self.encoding, self.config.gzip_level, self.config.brotli_quality
+            )
+            headers.set("content-encoding", self.encoding)
+            headers.remove("content-length")
+            headers.weaken_etag()
+            self.start_message["headers"] = headers.raw
+            await self._send(self.start_message)
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.flush()
+            await self._send({"type": "http.response.body", "body": chunk})
+            return
+        if chunk:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+
+class _Headers:
+    """Minimal mutable view over raw ASGI header pairs."""
+
+    def __init__(self, raw: List[Tuple[bytes, bytes]]):
+        self.raw = list(raw)
+
+    def get(self, name: str) -> str:
+        key = name.lower().encode("latin-1")
+        for k, v in self.raw:
+            if k.lower() == key:
+                return v.decode("latin-1")
+        return ""
+
+    def remove(self, name: str) -> None:
+        key = name.lower().encode("latin-1")
+        self.raw = [(k, v) for k, v in self.raw if k.lower() != key]
+
+    def set(self, name: str, value: str) -> None:
+        self.remove(name)
+        self.raw.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+
+    def weaken_etag(self) -> None:
+        etag = self.get("etag")
+        if etag and not etag.startswith("W/"):
+            self.set("etag", "W/" + etag)
+
+    def add_vary(self, value: str) -> None:
+        existing = self.get("vary")
+        tokens = [t.strip().lower() for t in existing.split(",") if t.strip()]
+        if value.lower() in tokens or "*" in tokens:
+            return
+        self.set("vary", f"{existing}, {value}" if existing else value)
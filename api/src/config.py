@@ -1,27 +1,46 @@
 """Configuration management for the API service."""
 
 import json
+import logging
 import os
-from typing import List, Optional
+import threading
+import time
+import weakref
+from typing import Annotated, Callable, List, Literal, Optional
 
 import boto3
 from botocore.exceptions import BotoCoreError, ClientError
-from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode
 
 
 class Settings(BaseSettings):
     """API configuration settings."""
     
     # API Configuration
-    version: str = Field(default="0.1.0", env="VERSION")
+    version: str = Field(default="0.1.0", validation_alias="VERSION", env="VERSION")
     debug: bool = Field(default=False, env="LANDING_API_DEBUG")
     rate_limit: int = Field(default=100, env="LANDING_API_RATE_LIMIT")
-    allowed_hosts: List[str] = Field(default=["*"], env="LANDING_API_ALLOWED_HOSTS")
-    cors_origins: Optional[List[str]] = Field(default=None, env="LANDING_API_CORS_ORIGINS")
+    # Per-route overrides of rate_limit, see route_policies.py
+    rate_limit_policies: Annotated[List[str], NoDecode] = Field(
+        default=["/health=exempt"], env="LANDING_API_RATE_LIMIT_POLICIES"
+    )
+    # Proxies whose X-Forwarded-For is believed (addresses/CIDRs, "*" for any), see client_ip.py
+    trusted_proxies: Annotated[List[str], NoDecode] = Field(default=[], env="LANDING_API_TRUSTED_PROXIES")
+    allowed_hosts: Annotated[List[str], NoDecode] = Field(default=["*"], env="LANDING_API_ALLOWED_HOSTS")
+    # Routes served whatever the Host header (health probes use localhost / the task IP)
+    allowed_hosts_exempt_routes: Annotated[List[str], NoDecode] = Field(
+        default=["/health"], env="LANDING_API_ALLOWED_HOSTS_EXEMPT_ROUTES"
+    )
+    cors_origins: Annotated[Optional[List[str]], NoDecode] = Field(default=None, env="LANDING_API_CORS_ORIGINS")
     
-    # Logging
+    # Logging (see request_log.py for sampling and summaries)
     log_level: str = Field(default="INFO", env="LANDING_API_LOG_LEVEL")
+    log_sample_rate: float = Field(default=1.0, env="LANDING_API_LOG_SAMPLE_RATE")
+    log_sample_rules: Annotated[List[str], NoDecode] = Field(default=["/health=0"], env="LANDING_API_LOG_SAMPLE_RULES")
+    log_slow_request_ms: float = Field(default=1000.0, env="LANDING_API_LOG_SLOW_REQUEST_MS")
+    log_summary_interval: float = Field(default=60.0, env="LANDING_API_LOG_SUMMARY_INTERVAL")
+    log_summary_level: str = Field(default="INFO", env="LANDING_API_LOG_SUMMARY_LEVEL")
     
     smtp_host: str = Field(default="localhost", env="LANDING_API_SMTP_HOST")
     smtp_port: int = Field(default=587, env="LANDING_API_SMTP_PORT")
@@ -30,26 +49,244 @@ class Settings(BaseSettings):
     smtp_use_tls: bool = Field(default=True, env="LANDING_API_SMTP_USE_TLS")
     email_from: str = Field(default="no-reply@example.com", env="LANDING_API_EMAIL_FROM")
     email_to: str = Field(default="contact@example.com", env="LANDING_API_EMAIL_TO")
+    # thread: smtplib on the delivery pool; asyncio: async_smtp on the event loop
+    smtp_transport: Literal["thread", "asyncio"] = Field(default="thread", env="LANDING_API_SMTP_TRANSPORT")
+    smtp_async_max_in_flight: int = Field(default=1000, env="LANDING_API_SMTP_ASYNC_MAX_IN_FLIGHT")
+    smtp_connect_timeout: float = Field(default=5.0, env="LANDING_API_SMTP_CONNECT_TIMEOUT")
+    smtp_timeout: float = Field(default=10.0, env="LANDING_API_SMTP_TIMEOUT")  # per SMTP command
+    smtp_deadline: float = Field(default=30.0, env="LANDING_API_SMTP_DEADLINE")  # whole delivery
+    smtp_breaker_failure_threshold: int = Field(default=5, env="LANDING_API_SMTP_BREAKER_FAILURE_THRESHOLD")
+    smtp_breaker_reset_seconds: float = Field(default=30.0, env="LANDING_API_SMTP_BREAKER_RESET_SECONDS")
+    # Dedicated delivery threads and how many submissions may wait for one
+    delivery_workers: int = Field(default=4, env="LANDING_API_DELIVERY_WORKERS")
+    delivery_queue_size: int = Field(default=16, env="LANDING_API_DELIVERY_QUEUE_SIZE")
+    
+    # Lead store (see lead_store.py); unset disables recording
+    lead_store_url: Optional[str] = Field(default=None, env="LANDING_API_LEAD_STORE_URL")
+    leads_export_token: Optional[str] = Field(default=None, env="LANDING_API_LEADS_EXPORT_TOKEN")
+    lead_rollup_hourly_days: int = Field(default=30, env="LANDING_API_LEAD_ROLLUP_HOURLY_DAYS")
+    
+    # Load shedding (see load_shedding.py; ecs-full only); 0 disables a threshold
+    load_shed_max_lag_ms: float = Field(default=250.0, env="LANDING_API_LOAD_SHED_MAX_LAG_MS")
+    load_shed_max_in_flight: int = Field(default=0, env="LANDING_API_LOAD_SHED_MAX_IN_FLIGHT")
+    load_shed_lag_interval_ms: float = Field(default=100.0, env="LANDING_API_LOAD_SHED_LAG_INTERVAL_MS")
+    load_shed_retry_after: int = Field(default=5, env="LANDING_API_LOAD_SHED_RETRY_AFTER")
+    load_shed_protected_routes: Annotated[List[str], NoDecode] = Field(
+        default=["/health", "/contact", "/metrics"], env="LANDING_API_LOAD_SHED_PROTECTED_ROUTES"
+    )
+    
+    # Landing site bundle served by ecs-full (see static_files.py); unset disables it
+    static_dir: Optional[str] = Field(default=None, env="LANDING_API_STATIC_DIR")
+    static_mount_path: str = Field(default="/", env="LANDING_API_STATIC_MOUNT_PATH")
+    static_cache_mb: float = Field(default=8.0, env="LANDING_API_STATIC_CACHE_MB")
+    static_cache_max_file_kb: float = Field(default=64.0, env="LANDING_API_STATIC_CACHE_MAX_FILE_KB")
+    
+    # Response compression
+    compression_enabled: bool = Field(default=True, env="LANDING_API_COMPRESSION_ENABLED")
+    compression_minimum_size: int = Field(default=1024, env="LANDING_API_COMPRESSION_MINIMUM_SIZE")
+    compression_gzip_level: int = Field(default=6, env="LANDING_API_COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=4, env="LANDING_API_COMPRESSION_BROTLI_QUALITY")
+    
+    # Tracing (see tracing.py); 0 disables it entirely
+    trace_sample_rate: float = Field(default=0.0, env="LANDING_API_TRACE_SAMPLE_RATE")
+    trace_exporter: str = Field(default="json", env="LANDING_API_TRACE_EXPORTER")  # json | otlp
+    trace_file: str = Field(default="/tmp/landing-api-traces.ndjson", env="LANDING_API_TRACE_FILE")
+    trace_otlp_endpoint: str = Field(
+        default="http://127.0.0.1:4318/v1/traces", env="LANDING_API_TRACE_OTLP_ENDPOINT"
+    )
+    
+    # Diagnostics (see routers/debug.py); everything is off by default
+    debug_endpoints_enabled: bool = Field(default=False, env="LANDING_API_DEBUG_ENDPOINTS_ENABLED")
+    debug_token: Optional[str] = Field(default=None, env="LANDING_API_DEBUG_TOKEN")
+    profile_max_seconds: float = Field(default=60.0, env="LANDING_API_PROFILE_MAX_SECONDS")
+    slow_request_threshold_ms: float = Field(default=0.0, env="LANDING_API_SLOW_REQUEST_THRESHOLD_MS")
+    
+    # Memory reporting (see memory.py); 0 disables the soft limit / report
+    memory_soft_limit_mb: float = Field(default=0.0, env="LANDING_API_MEMORY_SOFT_LIMIT_MB")
+    memory_report_interval: float = Field(default=300.0, env="LANDING_API_MEMORY_REPORT_INTERVAL")
+    memory_tracemalloc_frames: int = Field(default=1, env="LANDING_API_MEMORY_TRACEMALLOC_FRAMES")
+    
+    # Reloading (see reload_settings / reloader.py)
+    settings_ttl_seconds: float = Field(default=0, env="LANDING_API_SETTINGS_TTL_SECONDS")
+    config_watch_interval: float = Field(default=5.0, env="LANDING_API_CONFIG_WATCH_INTERVAL")
+    
+    @field_validator(
+        "allowed_hosts", "allowed_hosts_exempt_routes", "cors_origins", "log_sample_rules", "rate_limit_policies",
+        "trusted_proxies", "load_shed_protected_routes", mode="before"
+    )
+    @classmethod
+    def _split_comma_separated(cls, value):
+        """Accept the comma-separated lists used in ``config/*.env``."""
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+    
+    @field_validator("log_level", "log_summary_level")
+    @classmethod
+    def _check_log_level(cls, value: str) -> str:
+        level = value.strip().upper()
+        if not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Unknown log level {value!r}")
+        return level
+    
+    @field_validator("log_sample_rules")
+    @classmethod
+    def _check_log_sample_rules(cls, value: List[str]) -> List[str]:
+        from request_log import parse_rules
+        
+        parse_rules(value)
+        return value
+    
+    @field_validator("rate_limit_policies")
+    @classmethod
+    def _check_rate_limit_policies(cls, value: List[str]) -> List[str]:
+        from route_policies import parse_policies
+        
+        parse_policies(value)
+        return value
+    
+    @field_validator("trusted_proxies")
+    @classmethod
+    def _check_trusted_proxies(cls, value: List[str]) -> List[str]:
+        import ipaddress
+        
+        for network in value:
+            if network != "*":
+                ipaddress.ip_network(network, strict=False)
+        return value
     
     model_config = {
+        # Fields are read from LANDING_API_<FIELD>; ``env=`` on Field is
+        # ignored by pydantic-settings v2
+        "env_prefix": "LANDING_API_",
         "case_sensitive": False,
         "extra": "ignore",
         "validate_by_name": True  # This replaces allow_population_by_field_name
     }
 
 
+logger = logging.getLogger(__name__)
+
 # Global settings instance
 _settings: Optional[Settings] = None
+_loaded_at = 0.0
+_reload_lock = threading.Lock()
+_refresh_lock = threading.Lock()  # not _reload_lock, which is held during a reload
+_refreshing = False
+_subscribers: List[Callable[[], Optional[Callable[[Settings, Settings], None]]]] = []
 
 
 def get_settings() -> Settings:
-    """Get application settings (singleton)."""
-    global _settings
+    """Get application settings (singleton).
+
+    With ``settings_ttl_seconds`` set (Lambda), settings older than the TTL
+    are refreshed in a background thread while callers keep getting the
+    current ones; the Secrets Manager fetch never runs on the request path.
+    """
+    global _settings, _loaded_at
     if _settings is None:
-        _settings = _load_settings()
+        with _reload_lock:
+            if _settings is None:
+                _settings = _load_settings()
+                _loaded_at = time.monotonic()
+    elif settings_stale():
+        _refresh_in_background()
     return _settings
 
 
+def settings_stale() -> bool:
+    """Whether the settings are older than ``settings_ttl_seconds`` (when set)."""
+    settings = _settings
+    return bool(
+        settings is not None
+        and settings.settings_ttl_seconds
+        and time.monotonic() - _loaded_at >= settings.settings_ttl_seconds
+    )
+
+
+def refresh_if_stale() -> bool:
+    """Reload now (blocking) if the TTL has expired; returns whether it did.
+
+    For callers that are off the request path anyway, such as Lambda warmup
+    invocations.
+    """
+    if not settings_stale():
+        return False
+    reload_settings()
+    return True
+
+
+def _refresh_in_background() -> None:
+    global _refreshing
+    with _refresh_lock:
+        if _refreshing:
+            return
+        _refreshing = True
+    try:
+        threading.Thread(target=_background_refresh, name="settings-refresh", daemon=True).start()
+    except RuntimeError:
+        _refresh_done()
+        raise
+
+
+def _background_refresh() -> None:
+    try:
+        reload_settings()
+    finally:
+        _refresh_done()
+
+
+def _refresh_done() -> None:
+    global _refreshing
+    with _refresh_lock:
+        _refreshing = False
+
+
+def subscribe(callback: Callable[[Settings, Settings], None]) -> None:
+    """Call ``callback(old, new)`` after every successful reload.
+
+    Bound methods are held weakly, so subscribing a component does not keep
+    it alive.
+    """
+    if hasattr(callback, "__self__"):
+        ref = weakref.WeakMethod(callback)
+    else:
+        ref = lambda: callback  # noqa: E731
+    _subscribers.append(ref)
+
+
+def reload_settings() -> Settings:
+    """Rebuild settings from the environment and swap them in atomically.
+
+    Readers see either the old or the new ``Settings`` object, never a mix.
+    If the new values fail validation the old settings stay in place.
+    Subscribers are notified after the swap.
+    """
+    global _settings, _loaded_at
+    with _reload_lock:
+        old = _settings
+        try:
+            new = _load_settings()
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Settings reload failed; keeping current settings: %s", exc)
+            _loaded_at = time.monotonic()
+            return old
+        _settings = new
+        _loaded_at = time.monotonic()
+
+    if old is not None:
+        for ref in list(_subscribers):
+            callback = ref()
+            if callback is None:
+                _subscribers.remove(ref)
+                continue
+            try:
+                callback(old, new)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Settings subscriber %r failed: %s", callback, exc)
+    return new
+
+
 def _load_settings() -> Settings:
     settings = Settings()
     secret_name = os.getenv("LANDING_API_CONFIG_SECRET_NAME")
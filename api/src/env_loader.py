@@ -4,7 +4,19 @@ import os
 from pathlib import Path
 
 
-def load_environment_config():
+# Values this loader wrote into os.environ, so a reload can tell them apart
+# from variables set by the real environment (which always win)
+_file_values = {}
+
+
+def env_file_path(environment=None):
+    """Return the config file for ``environment`` (default: ``ENVIRONMENT``)."""
+    environment = environment or os.getenv('ENVIRONMENT', 'local')
+    # This file is in src/, so env files are in ../config/
+    return Path(__file__).parent.parent / 'config' / f'{environment}.env'
+
+
+def load_environment_config(reload=False):
     """
     Load environment-specific configuration from config files.
     
@@ -15,18 +27,19 @@ def load_environment_config():
     - prod: For production environment
     
     If ENVIRONMENT is not set, defaults to 'local'.
+
+    With ``reload=True`` values previously loaded from the file are replaced
+    by the file's current contents (and removed if the key is gone), while
+    variables set by the system environment are still left untouched.
     """
     environment = os.getenv('ENVIRONMENT', 'local')
+    path = env_file_path(environment)
     
-    # Get the path to the env file relative to this file's location
-    # This file is in src/, so env files are in ../config/
-    current_dir = Path(__file__).parent  # /path/to/api/src/
-    env_file_path = current_dir.parent / 'config' / f'{environment}.env'  # /path/to/api/config/environment.env
-    
-    if env_file_path.exists():
-        print(f"Loading environment config: {env_file_path}")
+    if path.exists():
+        print(f"Loading environment config: {path}")
+        values = {}
         try:
-            with open(env_file_path, 'r', encoding='utf-8') as f:
+            with open(path, 'r', encoding='utf-8') as f:
                 for line_num, line in enumerate(f, 1):
                     line = line.strip()
                     # Skip empty lines and comments
@@ -34,19 +47,27 @@ def load_environment_config():
                         # Handle key=value pairs
                         if '=' in line:
                             key, value = line.split('=', 1)
-                            key = key.strip()
-                            value = value.strip()
-                            
-                            # Only set if not already set by system environment
-                            # This allows system env vars to override file values
-                            if key not in os.environ:
-                                os.environ[key] = value
+                            values[key.strip()] = value.strip()
                         else:
-                            print(f"Warning: Invalid line format in {env_file_path}:{line_num}: {line}")
+                            print(f"Warning: Invalid line format in {path}:{line_num}: {line}")
         except Exception as e:
-            print(f"Error loading environment config from {env_file_path}: {e}")
+            print(f"Error loading environment config from {path}: {e}")
+            return environment
+
+        for key, value in values.items():
+            # Only set if not already set by system environment
+            # This allows system env vars to override file values
+            owned = reload and key in _file_values and os.environ.get(key) == _file_values[key]
+            if key not in os.environ or owned:
+                os.environ[key] = value
+                _file_values[key] = value
+        if reload:
+            for key in set(_file_values) - set(values):
+                if os.environ.get(key) == _file_values[key]:
+                    del os.environ[key]
+                del _file_values[key]
     else:
-        print(f"Warning: Environment file not found: {env_file_path}")
+        print(f"Warning: Environment file not found: {path}")
     
     print(f"Environment: {environment}")
     return environment
@@ -11,12 +11,14 @@ class LandingAPIException(Exception):
         status_code: int,
         error_code: str,
         message: str,
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.status_code = status_code
         self.error_code = error_code
         self.message = message
         self.details = details or {}
+        self.headers = headers
         super().__init__(message)
 
 
@@ -65,6 +67,32 @@ class ConcurrencyLimitError(LandingAPIException):
         )
 
 
+class CircuitOpenError(LandingAPIException):
+    """Downstream service circuit is open; the call was not attempted."""
+    
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(
+            status_code=503,
+            error_code="SERVICE_UNAVAILABLE",
+            message=f"{service} is temporarily unavailable",
+            details={"service": service, "retry_after_seconds": round(retry_after, 1)},
+            headers={"Retry-After": str(int(retry_after + 0.999))}
+        )
+
+
+class OverloadedError(LandingAPIException):
+    """The server is shedding load; the request was not processed."""
+    
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(
+            status_code=503,
+            error_code="SERVER_OVERLOADED",
+            message="Server is overloaded, retry later",
+            details={"reason": reason},
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
 class RateLimitError(LandingAPIException):
     """Rate limit exceeded error."""
     
@@ -0,0 +1,350 @@
+"""FastAPI application factory with per-deployment profiles.
+
+``create_app(settings, profile)`` builds the app for one deployment:
+
+- ``ecs-full``: every router (including ``/metrics``),
+  ``/docs``/``/redoc``/``/openapi.json``, the root endpoint, per-worker stats, in-process config reload on SIGHUP or
+  env-file change, the periodic memory report, event-loop-lag load
+  shedding and the landing site from ``static_dir`` (long-lived
+  multi-worker server);
+- ``lambda-minimal``: only the routes the landing form uses (``/contact``
+  and ``/health``), no OpenAPI schema or docs, no worker stats; settings
+  are refreshed by TTL (``settings_ttl_seconds``) instead. Router
+  modules that are not mounted are never imported, which keeps the Lambda
+  cold start and per-request middleware stack small.
+
+Either profile mounts ``/debug`` (profiler, slow requests, memory) only when
+``debug_endpoints_enabled`` is set.
+"""
+
+import importlib
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import structlog
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from config import Settings, get_settings, subscribe
+from middleware import (
+    RateLimitMiddleware,
+    LoggingMiddleware,
+    ReloadableCORSMiddleware,
+    SlowRequestMiddleware,
+    TrustedHostMiddleware,
+)
+from compression import CompressionMiddleware
+import load_shedding
+from load_shedding import LoadSheddingMiddleware
+from memory import MemoryMonitor
+from reloader import ConfigReloader
+from static_files import StaticSite
+import request_log
+import tracing
+from tracing import TracedMiddleware, TracingMiddleware
+from worker_stats import WorkerStatsMiddleware
+from exceptions import LandingAPIException
+
+
+@dataclass(frozen=True)
+class AppProfile:
+    """What a deployment mounts and which optional features it enables."""
+
+    name: str
+    routers: Tuple[str, ...]
+    docs: bool
+    worker_stats: bool
+    root_endpoint: bool
+    config_reload: bool
+    memory_monitor: bool
+    load_shedding: bool
+    static_site: bool
+
+
+PROFILES = {
+    "ecs-full": AppProfile(
+        name="ecs-full",
+        routers=("routers.health", "routers.runs", "routers.contact", "routers.metrics"),
+        docs=True,
+        worker_stats=True,
+        root_endpoint=True,
+        config_reload=True,
+        memory_monitor=True,
+        load_shedding=True,
+        static_site=True,
+    ),
+    "lambda-minimal": AppProfile(
+        name="lambda-minimal",
+        routers=("routers.health", "routers.contact"),
+        docs=False,
+        worker_stats=False,
+        root_endpoint=False,
+        config_reload=False,
+        memory_monitor=False,
+        load_shedding=False,
+        static_site=False,
+    ),
+}
+
+logger = structlog.get_logger()
+
+
+def configure_logging(settings: Optional[Settings] = None) -> None:
+    """Configure structlog for JSON output and apply ``log_level`` (idempotent).
+
+    structlog hands records to the stdlib root logger, so its level is what
+    ``filter_by_level`` enforces. If nothing has installed a handler (the
+    Lambda runtime does; gunicorn/uvicorn only configure their own
+    loggers) the rendered JSON lines go to stdout.
+    """
+    settings = settings or get_settings()
+    root = logging.getLogger()
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        root.addHandler(handler)
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer()
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+    set_log_level(settings.log_level)
+    request_log.set_summary_level(settings.log_summary_level)
+
+
+def set_log_level(level: str) -> None:
+    """Apply ``level`` to the root logger (stdlib and structlog records)."""
+    root = logging.getLogger()
+    if logging.getLevelName(root.level) != level:
+        root.setLevel(level)
+        logger.info("Log level set", log_level=level)
+
+
+def _on_settings_reload(old: Settings, new: Settings) -> None:
+    if new.log_level != old.log_level:
+        set_log_level(new.log_level)
+    if new.log_summary_level != old.log_summary_level:
+        request_log.set_summary_level(new.log_summary_level)
+
+
+subscribe(_on_settings_reload)
+
+
+def default_profile() -> str:
+    """Profile for the current runtime: ``LANDING_API_APP_PROFILE``, else by platform."""
+    explicit = os.getenv("LANDING_API_APP_PROFILE")
+    if explicit:
+        return explicit
+    return "lambda-minimal" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "ecs-full"
+
+
+def create_app(settings: Optional[Settings] = None, profile: str = "ecs-full") -> FastAPI:
+    """Build the Landing API application for ``profile``."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown app profile {profile!r}; expected one of {sorted(PROFILES)}")
+    app_profile = PROFILES[profile]
+    # Components follow settings reloads only when built from the global
+    # settings; an explicit ``settings`` pins them
+    live = settings is None
+    settings = settings or get_settings()
+    configure_logging(settings)
+
+    # PATH_PREFIX tells FastAPI where the app is mounted (e.g., "/dev/v1")
+    root_path = os.getenv("PATH_PREFIX", "")
+
+    app = FastAPI(
+        title="Landing API",
+        description="Backend API for the Credomax landing site",
+        version="0.1.0",
+        docs_url="/docs" if app_profile.docs else None,
+        redoc_url="/redoc" if app_profile.docs else None,
+        openapi_url="/openapi.json" if app_profile.docs else None,
+        root_path=root_path,
+    )
+    app.state.profile = app_profile.name
+
+    # With tracing on, each middleware is wrapped so its time shows up as a
+    # span; otherwise it is added as is
+    tracing_enabled = settings.trace_sample_rate > 0
+
+    def add_middleware(middleware_class, span_name: str, **options) -> None:
+        if tracing_enabled:
+            app.add_middleware(
+                TracedMiddleware, wrapped=middleware_class, span_name=f"middleware.{span_name}", **options
+            )
+        else:
+            app.add_middleware(middleware_class, **options)
+
+    # Add middleware
+    if app_profile.worker_stats:
+        add_middleware(WorkerStatsMiddleware, "worker_stats")
+    add_middleware(LoggingMiddleware, "logging", settings=None if live else settings)
+    add_middleware(
+        RateLimitMiddleware,
+        "rate_limit",
+        rate_limit=None if live else settings.rate_limit,
+        policies=None if live else settings.rate_limit_policies,
+    )
+
+    # Response compression (registered after the others so it wraps them and
+    # compresses error responses too)
+    if settings.compression_enabled:
+        add_middleware(
+            CompressionMiddleware,
+            "compression",
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+        )
+
+    cors_options = {
+        "allow_credentials": True,
+        "allow_methods": ["*"],
+        "allow_headers": ["*"],
+    }
+    if live:
+        add_middleware(ReloadableCORSMiddleware, "cors", **cors_options)
+    elif settings.cors_origins:
+        add_middleware(CORSMiddleware, "cors", allow_origins=settings.cors_origins, **cors_options)
+
+    # Slow-request capture (off unless a threshold is configured)
+    if settings.slow_request_threshold_ms > 0:
+        add_middleware(SlowRequestMiddleware, "slow_request", threshold_ms=settings.slow_request_threshold_ms)
+
+    # Trusted host middleware for production (health probes are exempt)
+    if not settings.debug:
+        add_middleware(
+            TrustedHostMiddleware,
+            "trusted_host",
+            allowed_hosts=settings.allowed_hosts,
+            exempt_routes=settings.allowed_hosts_exempt_routes,
+        )
+
+    # Shed low-priority requests while the worker is saturated, before any
+    # other middleware spends time on them
+    if app_profile.load_shedding:
+        add_middleware(LoadSheddingMiddleware, "load_shedding", settings=None if live else settings)
+
+    # Outermost: sample the request and open its root span
+    if tracing_enabled:
+        tracing.configure(settings)
+        app.add_middleware(TracingMiddleware, sample_rate=settings.trace_sample_rate)
+
+    routers = app_profile.routers
+    if settings.debug_endpoints_enabled:
+        routers += ("routers.debug",)
+    for module_name in routers:
+        app.include_router(importlib.import_module(module_name).router)
+
+    _register_handlers(
+        app,
+        config_reload=app_profile.config_reload and live,
+        memory_monitor=app_profile.memory_monitor,
+    )
+
+    # The landing site replaces the JSON root endpoint when mounted at "/"
+    static_site = app_profile.static_site and settings.static_dir
+    if static_site and not os.path.isdir(settings.static_dir):
+        logger.warning("Static directory missing; landing site not served", static_dir=settings.static_dir)
+        static_site = False
+    if app_profile.root_endpoint and not (static_site and settings.static_mount_path.rstrip("/") == ""):
+        @app.get("/")
+        async def root():
+            """Root endpoint."""
+            # When deployed via API Gateway, docs are accessible at the root_path + /docs
+            docs_url = None
+            if settings.debug:
+                docs_url = f"{root_path}/docs" if root_path else "/docs"
+
+            return {
+                "name": "Landing API",
+                "version": "0.1.0",
+                "description": "Backend API for the Credomax landing site",
+                "docs_url": docs_url,
+                "root_path": root_path if root_path else None  # Show deployment context
+            }
+
+    # Mounted last so every API route takes precedence over a file of the same name
+    if static_site:
+        app.mount(
+            settings.static_mount_path.rstrip("/"),
+            StaticSite(
+                settings.static_dir,
+                cache_bytes=int(settings.static_cache_mb * 1024 * 1024),
+                max_file_bytes=int(settings.static_cache_max_file_kb * 1024),
+            ),
+            name="static",
+        )
+
+    logger.info("Landing API app created", profile=app_profile.name, root_path=root_path or None)
+    return app
+
+
+def _register_handlers(app: FastAPI, config_reload: bool, memory_monitor: bool) -> None:
+    @app.exception_handler(LandingAPIException)
+    async def landing_exception_handler(request: Request, exc: LandingAPIException):
+        """Handle API exceptions."""
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={
+                "error": {
+                    "code": exc.error_code,
+                    "message": exc.message,
+                    "details": exc.details
+                }
+            },
+            headers=exc.headers
+        )
+
+    @app.exception_handler(Exception)
+    async def general_exception_handler(request: Request, exc: Exception):
+        """Handle general exceptions."""
+        logger.error("Unhandled exception", error=str(exc), path=request.url.path)
+
+        return JSONResponse(
+            status_code=500,
+            content={
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": "An internal error occurred"
+                }
+            }
+        )
+
+    @app.on_event("startup")
+    async def startup_event():
+        """Application startup event."""
+        logger.info("Landing API starting up", version="0.1.0", profile=app.state.profile)
+        if config_reload:
+            app.state.reloader = ConfigReloader()
+            app.state.reloader.start()
+        if memory_monitor:
+            app.state.memory_monitor = MemoryMonitor()
+            app.state.memory_monitor.start()
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """Application shutdown event."""
+        logger.info("Landing API shutting down")
+        request_log.flush_all()
+        load_shedding.stop_monitors()
+        if getattr(app.state, "reloader", None) is not None:
+            app.state.reloader.stop()
+        if getattr(app.state, "memory_monitor", None) is not None:
+            app.state.memory_monitor.stop()
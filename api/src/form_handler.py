@@ -2,13 +2,22 @@ import base64
 import json
 import logging
 import os
-from urllib.parse import parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
 
+import lead_store
 
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get("LANDING_API_LOG_LEVEL", "INFO").upper())
 
 ALLOWED_ORIGIN = os.environ.get("CORS_ALLOW_ORIGIN", "*")
+# Records of one SQS batch processed at the same time
+BATCH_CONCURRENCY = int(os.environ.get("FORM_BATCH_CONCURRENCY", "8"))
+
+
+class InvalidSubmission(ValueError):
+    """The submission can never succeed (retrying will not help)."""
 
 
 def _build_response(status_code: int, body: dict) -> dict:
@@ -24,7 +33,114 @@ def _build_response(status_code: int, body: dict) -> dict:
     }
 
 
+def _parse_body(raw_body: str, content_type: str) -> dict:
+    data: dict = {}
+
+    if "application/json" in content_type:
+        if raw_body:
+            data = json.loads(raw_body)
+    elif "application/x-www-form-urlencoded" in content_type:
+        parsed = parse_qs(raw_body)
+        data = {k: v[0] for k, v in parsed.items()}
+    else:
+        if raw_body:
+            try:
+                data = json.loads(raw_body)
+            except Exception:
+                parsed = parse_qs(raw_body)
+                data = {k: v[0] for k, v in parsed.items()}
+    return data
+
+
+def _origin(headers: dict) -> Optional[str]:
+    origin = headers.get("origin") or headers.get("Origin")
+    if not origin:
+        referer = urlsplit(headers.get("referer") or headers.get("Referer") or "")
+        origin = f"{referer.scheme}://{referer.netloc}" if referer.netloc else None
+    return origin
+
+
+def _submit(data: dict, headers: dict, request_id: str, source: str, strict: bool = False) -> None:
+    """Validate and record one submission; raises ``InvalidSubmission``."""
+    if not isinstance(data, dict):
+        raise InvalidSubmission("Submission must be an object.")
+    name = data.get("name") or ""
+    phone = data.get("phone") or ""
+    if not isinstance(name, str) or not isinstance(phone, str):
+        raise InvalidSubmission("'name' and 'phone' must be strings.")
+    name, phone = name.strip(), phone.strip()
+
+    if not name or not phone:
+        raise InvalidSubmission("Both 'name' and 'phone' are required.")
+
+    lead_store.record(name, phone, source, _origin(headers), strict=strict)
+
+    logger.info(
+        "Landing form submission",
+        # "name" is a reserved LogRecord attribute and would raise KeyError
+        extra={"contact_name": name, "phone": phone, "request_id": request_id},
+    )
+
+
+def _process_record(record: dict) -> None:
+    """One SQS message: the form body as API Gateway received it.
+
+    The API Gateway -> SQS integration may pass the original ``Content-Type``,
+    ``Origin`` and ``Referer`` as message attributes.
+    """
+    attributes = {
+        key.lower(): value.get("stringValue")
+        for key, value in (record.get("messageAttributes") or {}).items()
+        if isinstance(value, dict)
+    }
+    try:
+        data = _parse_body(record.get("body") or "", attributes.get("content-type") or "")
+    except ValueError as exc:
+        raise InvalidSubmission(f"Unparseable body: {exc}") from exc
+    # Store failures raise, so the message is retried instead of lost
+    _submit(data, attributes, record.get("messageId", "unknown"), "sqs", strict=True)
+
+
+def handle_sqs_batch(event: dict) -> dict:
+    """Process an SQS batch concurrently and report partial failures.
+
+    Invalid submissions are logged and dropped (a retry would fail the same
+    way); any other error lists the message in ``batchItemFailures`` so SQS
+    redelivers only that message (``ReportBatchItemFailures``).
+    """
+    records = event.get("Records") or []
+
+    def process(record: dict) -> Optional[str]:
+        message_id = record.get("messageId")
+        try:
+            _process_record(record)
+        except InvalidSubmission as exc:
+            logger.warning(f"Dropping invalid submission {message_id}: {exc}")
+        except Exception:
+            logger.exception(f"Failed to process submission {message_id}")
+            return message_id
+        return None
+
+    if len(records) == 1:
+        failed = [process(records[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(BATCH_CONCURRENCY, len(records)))) as pool:
+            failed = list(pool.map(process, records))
+
+    failures = [{"itemIdentifier": message_id} for message_id in failed if message_id]
+    logger.info(f"Processed SQS batch: {len(records)} records, {len(failures)} failed")
+    return {"batchItemFailures": failures}
+
+
+def _is_sqs_event(event) -> bool:
+    records = event.get("Records") if isinstance(event, dict) else None
+    return bool(records) and records[0].get("eventSource") == "aws:sqs"
+
+
 def handler(event, context):  # AWS Lambda entrypoint
+    if _is_sqs_event(event):
+        return handle_sqs_batch(event)
+
     if event.get("httpMethod") == "OPTIONS":
         return _build_response(200, {})
 
@@ -36,37 +152,13 @@ def handler(event, context):  # AWS Lambda entrypoint
         headers = event.get("headers") or {}
         content_type = headers.get("content-type") or headers.get("Content-Type") or ""
 
-        data: dict = {}
-
-        if "application/json" in content_type:
-            if raw_body:
-                data = json.loads(raw_body)
-        elif "application/x-www-form-urlencoded" in content_type:
-            parsed = parse_qs(raw_body)
-            data = {k: v[0] for k, v in parsed.items()}
-        else:
-            if raw_body:
-                try:
-                    data = json.loads(raw_body)
-                except Exception:
-                    parsed = parse_qs(raw_body)
-                    data = {k: v[0] for k, v in parsed.items()}
-
-        name = (data.get("name") or "").strip()
-        phone = (data.get("phone") or "").strip()
-
-        if not name or not phone:
-            return _build_response(
-                400,
-                {"message": "Both 'name' and 'phone' are required."},
-            )
-
+        data = _parse_body(raw_body, content_type)
         request_id = getattr(context, "aws_request_id", "unknown")
 
-        logger.info(
-            "Landing form submission",
-            extra={"name": name, "phone": phone, "request_id": request_id},
-        )
+        try:
+            _submit(data, headers, request_id, "form_handler")
+        except InvalidSubmission as exc:
+            return _build_response(400, {"message": str(exc)})
 
         return _build_response(200, {"message": "Form submitted"})
     except Exception:
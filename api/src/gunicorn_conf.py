@@ -0,0 +1,98 @@
+"""Gunicorn configuration for the ECS/self-hosted production server.
+
+Run from ``api/src``::
+
+    gunicorn -c gunicorn_conf.py main:app
+
+- Worker count follows the CPUs actually available to the container (cgroup
+  v2/v1 CPU quota, then scheduler affinity), overridable with
+  ``WEB_CONCURRENCY`` or ``LANDING_API_WORKERS``.
+- Workers run uvicorn on uvloop + httptools (``workers.LandingUvicornWorker``).
+- The app is imported once in the master (``preload_app``) so workers fork
+  with settings and routes already loaded.
+- Workers are recycled after ``LANDING_API_MAX_REQUESTS`` requests (with
+  jitter so they don't all restart together) and shut down gracefully;
+  ``kill -HUP <master>`` reloads settings and rolls all workers without
+  dropping connections.
+- TLS follows ``LANDING_API_TLS_PROFILE`` (see ``tls.py``), or plain HTTP
+  behind a terminating load balancer.
+- Per-worker request stats are published to a shared directory and served at
+  ``/health/workers``.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import tls
+from workers import available_cpus, worker_count
+
+
+# Server socket
+bind = os.getenv("LANDING_API_BIND", "0.0.0.0:8000")
+backlog = int(os.getenv("LANDING_API_BACKLOG", "2048"))
+
+# Workers
+workers = worker_count()
+worker_class = "workers.LandingUvicornWorker"
+preload_app = True
+max_requests = int(os.getenv("LANDING_API_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("LANDING_API_MAX_REQUESTS_JITTER", "1000"))
+timeout = int(os.getenv("LANDING_API_WORKER_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("LANDING_API_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("LANDING_API_KEEPALIVE", "75"))  # above the ALB's 60 s idle timeout
+
+# TLS: see tls.py for the profiles. The context is built here, in the master,
+# so every forked worker shares its session-ticket keys. With
+# LANDING_API_TLS_PROFILE=off the server speaks plain HTTP for a load balancer
+# that terminates TLS; set FORWARDED_ALLOW_IPS to the balancer's subnet so
+# X-Forwarded-Proto/-For are honoured.
+tls_profile = tls.profile_name()
+if tls_profile != "off":
+    certfile, keyfile = tls.cert_paths()
+    tls.server_context()
+
+# Logging
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LANDING_API_LOG_LEVEL", "info").lower()
+
+# Shared directory for per-worker stats snapshots (see worker_stats.py)
+# (this file is re-executed on SIGHUP; keep the directory already in use)
+_stats_dir = os.environ.get("LANDING_API_WORKER_STATS_DIR") or tempfile.mkdtemp(prefix="landing-api-workers-")
+os.environ["LANDING_API_WORKER_STATS_DIR"] = _stats_dir
+
+
+def on_starting(server):
+    Path(_stats_dir).mkdir(parents=True, exist_ok=True)
+    server.log.info(
+        "Starting %s workers (%s CPUs available, TLS profile %s)", workers, available_cpus(), tls_profile
+    )
+
+
+def on_reload(server):
+    # SIGHUP to the master: refresh settings here so the replacement workers
+    # fork with the new values (workers also reload in place on env-file
+    # change, see reloader.py)
+    from reloader import reload_configuration
+
+    reload_configuration("SIGHUP to gunicorn master")
+
+
+def post_fork(server, worker):
+    from worker_stats import stats
+
+    stats.reset_after_fork()
+    stats.publish(force=True)
+
+
+def child_exit(server, worker):
+    try:
+        (Path(_stats_dir) / f"{worker.pid}.json").unlink()
+    except OSError:
+        pass
+
+
+def on_exit(server):
+    shutil.rmtree(_stats_dir, ignore_errors=True)
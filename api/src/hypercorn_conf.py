@@ -0,0 +1,35 @@
+"""Hypercorn configuration: HTTP/2-capable alternative to ``gunicorn_conf.py``.
+
+Run from ``api/src`` (``SERVER_MODE=hypercorn`` in ``entrypoint.sh``)::
+
+    hypercorn --config python:hypercorn_conf main:app
+
+Negotiates ``h2`` over ALPN, so browsers multiplex requests over one TLS
+connection instead of opening several. Uses the same worker sizing, key/cert
+and TLS 1.2 cipher list as the gunicorn server. Hypercorn builds its own
+context, so the ``modern`` profile's TLS 1.3-only floor is not applied here,
+and its workers are spawned rather than forked, so session tickets only
+resume against the worker that issued them.
+"""
+
+import os
+
+import tls
+from workers import worker_count
+
+bind = [os.getenv("LANDING_API_BIND", "0.0.0.0:8000")]
+backlog = int(os.getenv("LANDING_API_BACKLOG", "2048"))
+
+workers = worker_count()
+worker_class = "uvloop"
+keep_alive_timeout = int(os.getenv("LANDING_API_KEEPALIVE", "75"))
+graceful_timeout = int(os.getenv("LANDING_API_GRACEFUL_TIMEOUT", "30"))
+
+if tls.profile_name() != "off":
+    certfile, keyfile = tls.cert_paths()
+    ciphers = tls.PROFILES[tls.profile_name()].ciphers
+    alpn_protocols = ["h2", "http/1.1"]
+
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LANDING_API_LOG_LEVEL", "info").upper()
@@ -1,7 +1,30 @@
-"""AWS Lambda handler for the FastAPI application using Mangum adapter."""
+"""AWS Lambda handler for the FastAPI application using Mangum adapter.
 
+Everything expensive happens once per execution environment, while this
+module is imported (the Lambda init phase, which provisioned concurrency
+and SnapStart also run ahead of traffic): settings and the Secrets Manager
+secret, the lead store, SMTP host resolution, the ASGI middleware stack and
+the app's startup handlers. Mangum itself runs with ``lifespan="off"`` so
+those handlers do not run again on every invocation. The init phase is
+logged with a per-step breakdown.
+
+Warmup pings (EventBridge schedules, ``{"warmup": true}``) are answered
+without entering FastAPI. They also refresh settings whose
+``settings_ttl_seconds`` has expired, so a warmed environment rarely needs
+the background refresh that requests would otherwise trigger.
+"""
+
+import time
+
+_INIT_STARTED = time.perf_counter()
+
+import asyncio
+import base64
+import json
 import logging
 import os
+import signal
+import socket
 import sys
 from mangum import Mangum
 
@@ -10,10 +33,13 @@ if CURRENT_DIR not in sys.path:
     sys.path.insert(0, CURRENT_DIR)
 
 from .app import app  # Import the FastAPI instance from app.py (env_loader is imported there)
+from config import get_settings, refresh_if_stale, subscribe
+import lead_store
+import tracing
 
-# Configure logging for CloudWatch
+# CloudWatch logging; the level is LANDING_API_LOG_LEVEL, applied by
+# factory.configure_logging when the app is built
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
 
 
 def _parse_allowed_origins() -> set[str]:
@@ -28,6 +54,15 @@ def _parse_allowed_origins() -> set[str]:
 ALLOWED_ORIGINS = _parse_allowed_origins()
 
 
+def _on_settings_reload(old, new) -> None:
+    """Follow CORS origin changes picked up by the settings TTL reload."""
+    global ALLOWED_ORIGINS
+    ALLOWED_ORIGINS = set(new.cors_origins or [])
+
+
+subscribe(_on_settings_reload)
+
+
 def _add_cors_headers(response: dict | None, origin: str | None) -> dict | None:
     """Add CORS headers to the Lambda proxy response if origin is allowed.
 
@@ -55,16 +90,65 @@ def _add_cors_headers(response: dict | None, origin: str | None) -> dict | None:
     return response
 
 
+def _ensure_binary_encoding(response: dict | None) -> dict | None:
+    """Base64-encode compressed bodies for API Gateway.
+
+    Mangum only base64-encodes bodies that fail UTF-8 decoding for text
+    content types, so a gzip/brotli body that happens to decode cleanly would
+    be returned as mangled text. Any response carrying a Content-Encoding is
+    binary and must be flagged ``isBase64Encoded``.
+    """
+    if not isinstance(response, dict) or response.get("isBase64Encoded"):
+        return response
+
+    encoding = None
+    for key, value in (response.get("headers") or {}).items():
+        if key.lower() == "content-encoding":
+            encoding = value
+    for key, values in (response.get("multiValueHeaders") or {}).items():
+        if key.lower() == "content-encoding" and values:
+            encoding = values[0]
+
+    body = response.get("body")
+    if encoding and encoding != "identity" and isinstance(body, str) and body:
+        response["body"] = base64.b64encode(body.encode("utf-8")).decode("ascii")
+        response["isBase64Encoded"] = True
+    return response
+
+
+def is_warmup_event(event) -> bool:
+    """Scheduled/plugin warmup pings, as opposed to API Gateway requests."""
+    if not isinstance(event, dict):
+        return False
+    if event.get("warmup") or event.get("source") == "serverless-plugin-warmup":
+        return True
+    return event.get("source") == "aws.events" and event.get("detail-type") == "Scheduled Event"
+
+
+_cold_start = True
+
+
 def lambda_handler(event, context):
     """Lambda handler for the FastAPI application."""
+    global _cold_start
     request_id = getattr(context, 'aws_request_id', 'unknown')
     origin = None
+    cold_start, _cold_start = _cold_start, False
+
+    if is_warmup_event(event):
+        # Keep the environment (and everything built in the init phase)
+        # warm without running a request through FastAPI; no request is
+        # waiting, so this is where an expired settings TTL is paid for
+        refreshed = refresh_if_stale()
+        logger.info(
+            f"Warmup event - cold_start={cold_start} - settings_refreshed={refreshed} - RequestID: {request_id}"
+        )
+        return {"warmup": True, "cold_start": cold_start, "init_ms": INIT_TIMINGS.get("total_ms")}
     
     try:
         # Safely extract key request info for logging
         method = "UNKNOWN"
         path = "UNKNOWN"
-        source_ip = "unknown"
         user_agent = "unknown"
         status_code = "unknown"
         
@@ -72,22 +156,9 @@ def lambda_handler(event, context):
             method = event.get("httpMethod", event.get("requestContext", {}).get("http", {}).get("method", "UNKNOWN"))
             path = event.get("rawPath", event.get("path", "UNKNOWN"))
 
-            # Get real client IP from X-Forwarded-For header (preferred) or fallback to sourceIp
             headers = event.get("headers") or {}
             origin = headers.get("origin") or headers.get("Origin")
 
-            x_forwarded_for = headers.get("x-forwarded-for")
-            if x_forwarded_for:
-                try:
-                    source_ip = x_forwarded_for.split(",")[0].strip()
-                except (AttributeError, IndexError):
-                    pass
-            if source_ip == "unknown":
-                try:
-                    source_ip = event.get("requestContext", {}).get("http", {}).get("sourceIp", "unknown")
-                except (AttributeError, TypeError):
-                    pass
-
             user_agent = headers.get("user-agent", "unknown")
             if user_agent and len(user_agent) > 50:
                 user_agent = user_agent[:50] + "..."
@@ -109,6 +180,11 @@ def lambda_handler(event, context):
 
         # Ensure CORS headers are present on the proxy response
         response = _add_cors_headers(response, origin)
+        response = _ensure_binary_encoding(response)
+
+        # The execution environment may be frozen right after we return, so
+        # sampled traces are written now rather than by the exporter thread
+        tracing.flush()
         
         # Single combined log line with request and response info
         try:
@@ -117,7 +193,7 @@ def lambda_handler(event, context):
             logger.error(f"Error extracting status code: {type(e).__name__}: {str(e)} - RequestID: {request_id}")
 
         # We have success logging already in the app
-        # logger.info(f"RequestID: {request_id} - {method} {path} - {status_code} - IP: {source_ip} - UserAgent: {user_agent}")
+        # logger.info(f"RequestID: {request_id} - {method} {path} - {status_code} - UserAgent: {user_agent}")
 
         return response
         
@@ -128,8 +204,71 @@ def lambda_handler(event, context):
         raise
 
 
-# Create the Mangum handler
+# Create the Mangum handler (this also sets up the event loop it reuses for
+# every invocation)
 mangum_handler = Mangum(app, lifespan="off")
 
+_lifespan = None
+
+
+def _run_startup() -> None:
+    """Enter the app's lifespan once; it is left on SIGTERM, if ever."""
+    global _lifespan
+    _lifespan = app.router.lifespan_context(app)
+    asyncio.get_event_loop().run_until_complete(_lifespan.__aenter__())
+
+
+def _run_shutdown(signum, frame) -> None:
+    if _lifespan is not None:
+        try:
+            asyncio.get_event_loop().run_until_complete(_lifespan.__aexit__(None, None, None))
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Shutdown handlers failed: {type(e).__name__}: {e}")
+    tracing.flush()
+    sys.exit(0)
+
+
+def _resolve_smtp_host() -> None:
+    settings = get_settings()
+    socket.getaddrinfo(settings.smtp_host, settings.smtp_port, type=socket.SOCK_STREAM)
+
+
+def _build_middleware_stack() -> None:
+    if app.middleware_stack is None:
+        app.middleware_stack = app.build_middleware_stack()
+
+
+def _init_phase() -> dict:
+    """Do per-container startup work now instead of on the first request."""
+    timings = {"import_ms": round((time.perf_counter() - _INIT_STARTED) * 1000, 1)}
+    steps = (
+        ("settings", get_settings),
+        ("lead_store", lead_store.get_store),
+        ("smtp_dns", _resolve_smtp_host),
+        ("middleware_stack", _build_middleware_stack),
+        ("startup", _run_startup),
+    )
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:  # noqa: BLE001
+            # Best effort: whatever failed here is retried by the first request
+            logger.warning(f"Init step {name} failed: {type(e).__name__}: {e}")
+        timings[f"{name}_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    timings["total_ms"] = round((time.perf_counter() - _INIT_STARTED) * 1000, 1)
+    logger.info(
+        "Lambda init phase: "
+        + json.dumps({"init_type": os.getenv("AWS_LAMBDA_INITIALIZATION_TYPE", "unknown"), **timings})
+    )
+    return timings
+
+
+INIT_TIMINGS = _init_phase()
+try:
+    signal.signal(signal.SIGTERM, _run_shutdown)
+except ValueError:  # not the main thread (e.g. imported by a test runner)
+    pass
+
 # Export the handler
 handler = lambda_handler
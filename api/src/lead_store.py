@@ -0,0 +1,388 @@
+"""Append-only store for contact submissions (leads).
+
+Every submission accepted by ``/contact`` or ``form_handler`` is recorded
+here before any email is attempted, so a lead survives an SMTP outage and
+"which leads came in last week" is an indexed query instead of a log grep.
+
+The backend is chosen by ``LANDING_API_LEAD_STORE_URL``:
+
+- unset: recording is a no-op;
+- ``sqlite:///relative.db`` / ``sqlite:////abs/path.db``: ``SQLiteLeadStore``
+  (WAL journal, so readers such as the export never block writers, and
+  gunicorn workers can share one file);
+- any other scheme registered with ``register_backend`` (e.g. a DynamoDB or
+  Postgres implementation in production).
+
+Rows are never updated or deleted (enforced by triggers in SQLite). Reads
+use keyset pagination on ``id``, so iterating the whole table holds one
+page in memory at a time however many leads there are.
+
+Alongside the raw rows the store keeps rollups: submission counts per UTC
+hour and landing origin, updated in the same transaction as the insert.
+Hour buckets older than ``lead_rollup_hourly_days`` are compacted into day
+buckets, so ``/contact/stats`` reads a number of buckets bounded by the
+time range, never the number of submissions.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+import structlog
+
+from config import get_settings
+
+logger = structlog.get_logger()
+
+PAGE_SIZE = 1000
+HOUR = 3600
+DAY = 86400
+# Minimum seconds between compaction attempts per process
+COMPACT_INTERVAL = 3600
+
+
+@dataclass
+class Lead:
+    """One contact submission."""
+
+    name: str
+    phone: str
+    created_at: float
+    source: str = "api"  # api | form_handler
+    origin: Optional[str] = None  # landing page origin (Origin/Referer header)
+    id: Optional[int] = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class LeadStore:
+    """Backend interface; implementations must be safe to call from threads."""
+
+    def add(self, lead: Lead) -> int:
+        raise NotImplementedError
+
+    def page(
+        self,
+        after_id: int = 0,
+        limit: int = PAGE_SIZE,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        phone: Optional[str] = None,
+    ) -> List[Lead]:
+        """Up to ``limit`` leads with ``id > after_id`` in id order."""
+        raise NotImplementedError
+
+    def iter_pages(
+        self,
+        after_id: int = 0,
+        limit: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        phone: Optional[str] = None,
+    ) -> Iterator[List[Lead]]:
+        """Matching leads one page at a time (constant memory)."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = PAGE_SIZE if remaining is None else min(PAGE_SIZE, remaining)
+            rows = self.page(after_id, size, since=since, until=until, phone=phone)
+            if not rows:
+                return
+            yield rows
+            after_id = rows[-1].id
+            if remaining is not None:
+                remaining -= len(rows)
+            if len(rows) < size:
+                return
+
+    def iter_leads(self, **filters) -> Iterator[Lead]:
+        for rows in self.iter_pages(**filters):
+            yield from rows
+
+    def counts(
+        self, since: float, until: float, granularity: str = "hour", by_origin: bool = False
+    ) -> List[dict]:
+        """Rolled-up counts in ``[since, until)`` as ``{start, resolution, origin?, count}``.
+
+        ``granularity="day"`` folds hour buckets into days. With ``"hour"``,
+        ranges that were already compacted come back as day buckets
+        (``resolution="day"``); a day bucket that only partly overlaps the
+        range is included whole, so its count may cover hours outside it.
+        """
+        raise NotImplementedError
+
+    def compact(self, before: float) -> int:
+        """Fold hour buckets older than ``before`` into day buckets."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteLeadStore(LeadStore):
+    """SQLite in WAL mode with one connection per thread."""
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS submissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at REAL NOT NULL,
+            name TEXT NOT NULL,
+            phone TEXT NOT NULL,
+            source TEXT NOT NULL,
+            origin TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS submissions_created_at ON submissions (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS submissions_phone ON submissions (phone, id)",
+        """
+        CREATE TRIGGER IF NOT EXISTS submissions_no_update BEFORE UPDATE ON submissions
+        BEGIN SELECT RAISE(ABORT, 'submissions are append-only'); END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS submissions_no_delete BEFORE DELETE ON submissions
+        BEGIN SELECT RAISE(ABORT, 'submissions are append-only'); END
+        """,
+        # origin is '' when unknown so it can be part of the key
+        """
+        CREATE TABLE IF NOT EXISTS rollups (
+            resolution TEXT NOT NULL,
+            bucket_start INTEGER NOT NULL,
+            origin TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (resolution, bucket_start, origin)
+        ) WITHOUT ROWID
+        """,
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+        self._backfill_rollups()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL: durable across process crashes, fsync at checkpoints
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _write(self, *statements) -> None:
+        """Run ``(sql, params)`` statements in one write transaction."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                conn.execute(sql, params)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _backfill_rollups(self) -> None:
+        # Stores created before rollups existed: count what is already there
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM rollups LIMIT 1").fetchone():
+            return
+        self._write((
+            "INSERT OR IGNORE INTO rollups (resolution, bucket_start, origin, count)"
+            " SELECT 'hour', CAST(created_at / 3600 AS INTEGER) * 3600, COALESCE(origin, ''), COUNT(*)"
+            " FROM submissions GROUP BY 2, 3",
+            (),
+        ))
+
+    def add(self, lead: Lead) -> int:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "INSERT INTO submissions (created_at, name, phone, source, origin) VALUES (?, ?, ?, ?, ?)",
+                (lead.created_at, lead.name, lead.phone, lead.source, lead.origin),
+            )
+            conn.execute(
+                "INSERT INTO rollups (resolution, bucket_start, origin, count) VALUES ('hour', ?, ?, 1)"
+                " ON CONFLICT (resolution, bucket_start, origin) DO UPDATE SET count = count + 1",
+                (int(lead.created_at // HOUR) * HOUR, lead.origin or ""),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        lead.id = cursor.lastrowid
+        return lead.id
+
+    def counts(self, since, until, granularity="hour", by_origin=False) -> List[dict]:
+        if granularity == "day":
+            bucket = "bucket_start - bucket_start % 86400"
+            resolution = "'day'"
+            since, until = since - since % DAY, until + (-until % DAY)
+            where = "bucket_start >= ? AND bucket_start < ?"
+            params = (int(since), int(until))
+        else:
+            bucket = "bucket_start"
+            resolution = "resolution"
+            since = since - since % HOUR
+            # Compacted days start at midnight, possibly before ``since``:
+            # take every day bucket that overlaps the range
+            where = (
+                "(resolution = 'hour' AND bucket_start >= ? AND bucket_start < ?)"
+                " OR (resolution = 'day' AND bucket_start > ? AND bucket_start < ?)"
+            )
+            params = (int(since), int(until), int(since) - DAY, int(until))
+        origin = "origin" if by_origin else "NULL"
+        rows = self._connect().execute(
+            f"SELECT {bucket} AS start, {resolution} AS res, {origin} AS org, SUM(count)"
+            f" FROM rollups WHERE {where}"
+            " GROUP BY start, res, org ORDER BY start, org",
+            params,
+        ).fetchall()
+        result = []
+        for start, res, org, count in rows:
+            row = {"start": start, "resolution": res, "count": count}
+            if by_origin:
+                row["origin"] = org or None
+            result.append(row)
+        return result
+
+    def compact(self, before: float) -> int:
+        cutoff = int(before - before % DAY)
+        conn = self._connect()
+        (pending,) = conn.execute(
+            "SELECT COUNT(*) FROM rollups WHERE resolution = 'hour' AND bucket_start < ?", (cutoff,)
+        ).fetchone()
+        if not pending:
+            return 0
+        self._write(
+            (
+                "INSERT INTO rollups (resolution, bucket_start, origin, count)"
+                " SELECT 'day', bucket_start - bucket_start % 86400, origin, SUM(count) FROM rollups"
+                " WHERE resolution = 'hour' AND bucket_start < ? GROUP BY 2, 3"
+                " ON CONFLICT (resolution, bucket_start, origin) DO UPDATE SET count = count + excluded.count",
+                (cutoff,),
+            ),
+            ("DELETE FROM rollups WHERE resolution = 'hour' AND bucket_start < ?", (cutoff,)),
+        )
+        return pending
+
+    def page(self, after_id=0, limit=PAGE_SIZE, since=None, until=None, phone=None) -> List[Lead]:
+        clauses = ["id > ?"]
+        params: list = [after_id]
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        if phone is not None:
+            clauses.append("phone = ?")
+            params.append(phone)
+        params.append(limit)
+        rows = self._connect().execute(
+            "SELECT id, created_at, name, phone, source, origin FROM submissions"
+            f" WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?",
+            params,
+        ).fetchall()
+        return [
+            Lead(id=row[0], created_at=row[1], name=row[2], phone=row[3], source=row[4], origin=row[5])
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def _sqlite_backend(url: str) -> LeadStore:
+    # sqlite:///relative.db -> relative.db, sqlite:////abs.db -> /abs.db
+    return SQLiteLeadStore(url[len("sqlite:///"):])
+
+
+_backends: Dict[str, Callable[[str], LeadStore]] = {"sqlite": _sqlite_backend}
+_store: Optional[LeadStore] = None
+_store_url: Optional[str] = None
+_store_lock = threading.Lock()
+_last_compaction = 0.0
+
+
+def register_backend(scheme: str, factory: Callable[[str], LeadStore]) -> None:
+    """Make ``<scheme>://...`` URLs build stores with ``factory(url)``."""
+    _backends[scheme] = factory
+
+
+def get_store() -> Optional[LeadStore]:
+    """The configured store, or None when ``lead_store_url`` is unset.
+
+    Rebuilt when the URL changes on a settings reload.
+    """
+    global _store, _store_url
+    url = get_settings().lead_store_url
+    if url == _store_url:
+        return _store
+    with _store_lock:
+        if url != _store_url:
+            # The previous store is dropped, not closed: requests in flight
+            # may still be streaming from it
+            if url:
+                scheme = url.split(":", 1)[0]
+                if scheme not in _backends:
+                    raise ValueError(f"Unknown lead store scheme {scheme!r} in {url!r}")
+                _store = _backends[scheme](url)
+            else:
+                _store = None
+            _store_url = url
+    return _store
+
+
+def record(
+    name: str, phone: str, source: str, origin: Optional[str] = None, strict: bool = False
+) -> Optional[Lead]:
+    """Persist a submission (blocking); returns None when no store is configured.
+
+    Failures are logged, not raised: losing the audit row must not lose the
+    lead's email as well. With ``strict`` they are raised instead, for
+    callers that can retry (SQS batches).
+    """
+    try:
+        store = get_store()
+        if store is None:
+            return None
+        lead = Lead(name=name, phone=phone, created_at=time.time(), source=source, origin=origin)
+        store.add(lead)
+    except Exception as exc:  # noqa: BLE001
+        if strict:
+            raise
+        logger.error("Failed to record lead", error=str(exc), source=source)
+        return None
+    maybe_compact(store)
+    return lead
+
+
+def maybe_compact(store: LeadStore) -> None:
+    """Compact old hour buckets at most once per ``COMPACT_INTERVAL`` per process."""
+    global _last_compaction
+    now = time.time()
+    if now - _last_compaction < COMPACT_INTERVAL:
+        return
+    _last_compaction = now
+    try:
+        compacted = store.compact(now - get_settings().lead_rollup_hourly_days * DAY)
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Rollup compaction failed", error=str(exc))
+        return
+    if compacted:
+        logger.info("Compacted lead rollups", hour_buckets=compacted)
@@ -0,0 +1,173 @@
+"""Load shedding on event-loop lag and in-flight requests.
+
+A saturated event loop does not fail requests, it just gets later at
+everything, ``/health`` included, until the load balancer's health check
+times out and ECS replaces the task (which moves the load elsewhere, or
+nowhere). ``LoadSheddingMiddleware`` rejects low-priority requests early
+with ``503`` and ``Retry-After`` instead:
+
+- ``LoopLagMonitor`` wakes every ``load_shed_lag_interval_ms`` and records
+  how late it woke up. Lag rises as soon as it is measured and decays
+  gradually, so shedding does not flap on every sample.
+- A request is shed when lag is over ``load_shed_max_lag_ms`` or
+  ``load_shed_max_in_flight`` requests are already in progress (0 disables
+  either check).
+- Routes under ``load_shed_protected_routes`` (``/health``, ``/contact``
+  and ``/metrics`` by default) are always admitted: health checks keep
+  passing, leads are never turned away and the shedding stays observable.
+
+State is exported on ``/metrics`` (``event_loop_lag_seconds``,
+``requests_in_flight``, ``load_shedding_active``, ``load_shed_total``).
+"""
+
+import asyncio
+import weakref
+from typing import List, Optional, Tuple
+
+import structlog
+from starlette.responses import JSONResponse
+
+from config import Settings, get_settings, subscribe
+from exceptions import OverloadedError
+import metrics
+
+logger = structlog.get_logger()
+
+# Share of the previous lag kept when a sample is lower (per interval)
+LAG_DECAY = 0.7
+
+
+class LoopLagMonitor:
+    """Measures event-loop scheduling lag from a sleeping task."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            sample = max(0.0, loop.time() - start - self.interval)
+            self.lag = sample if sample >= self.lag else self.lag * LAG_DECAY + sample * (1 - LAG_DECAY)
+
+    def ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class LoadSheddingMiddleware:
+    """Reject unprotected requests with 503 while the worker is saturated.
+
+    Without explicit ``settings`` the thresholds follow ``Settings`` across
+    reloads.
+    """
+
+    def __init__(self, app, settings: Optional[Settings] = None):
+        self.app = app
+        if settings is None:
+            settings = get_settings()
+            subscribe(self._on_settings_reload)
+        self._configure(settings)
+        self.monitor = LoopLagMonitor(settings.load_shed_lag_interval_ms / 1000)
+        self.in_flight = 0
+        self.shedding: Optional[str] = None
+        _shedders.add(self)
+
+    def _configure(self, settings: Settings) -> None:
+        self.max_lag = settings.load_shed_max_lag_ms / 1000
+        self.max_in_flight = settings.load_shed_max_in_flight
+        self.retry_after = settings.load_shed_retry_after
+        self.protected: Tuple[str, ...] = tuple(route.rstrip("/") for route in settings.load_shed_protected_routes)
+
+    def _on_settings_reload(self, old, new) -> None:
+        self._configure(new)
+        self.monitor.interval = new.load_shed_lag_interval_ms / 1000
+
+    def _is_protected(self, path: str) -> bool:
+        return any(path == route or path.startswith(route + "/") for route in self.protected)
+
+    def _overload_reason(self) -> Optional[str]:
+        if self.max_lag > 0 and self.monitor.lag > self.max_lag:
+            return "event_loop_lag"
+        if self.max_in_flight > 0 and self.in_flight >= self.max_in_flight:
+            return "in_flight"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.monitor.ensure_started()
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):] or "/"
+
+        reason = self._overload_reason()
+        if reason != self.shedding:
+            logger.warning(
+                "Load shedding started" if reason else "Load shedding stopped",
+                reason=reason or self.shedding,
+                lag_ms=round(self.monitor.lag * 1000, 1),
+                in_flight=self.in_flight,
+            )
+            self.shedding = reason
+        if reason and not self._is_protected(path):
+            _shed.inc(reason=reason)
+            exc = OverloadedError(reason, self.retry_after)
+            response = JSONResponse(
+                status_code=exc.status_code,
+                content={"error": {"code": exc.error_code, "message": exc.message, "details": exc.details}},
+                headers=exc.headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+
+_shedders: "weakref.WeakSet[LoadSheddingMiddleware]" = weakref.WeakSet()
+
+
+def stop_monitors() -> None:
+    """Cancel the lag monitors (at shutdown)."""
+    for shedder in list(_shedders):
+        shedder.monitor.stop()
+
+
+def _samples(value) -> dict:
+    shedders: List[LoadSheddingMiddleware] = list(_shedders)
+    if not shedders:
+        return {}
+    return {metrics.labels(): max(value(shedder) for shedder in shedders)}
+
+
+_shed = metrics.counter("load_shed_total", "Requests rejected by load shedding, by reason.")
+metrics.gauge(
+    "event_loop_lag_seconds",
+    "Smoothed event-loop scheduling lag.",
+    callback=lambda: _samples(lambda shedder: shedder.monitor.lag),
+)
+metrics.gauge(
+    "requests_in_flight",
+    "Requests currently being processed.",
+    callback=lambda: _samples(lambda shedder: shedder.in_flight),
+)
+metrics.gauge(
+    "load_shedding_active",
+    "1 while unprotected requests are being shed.",
+    callback=lambda: _samples(lambda shedder: 1 if shedder._overload_reason() else 0),
+)
@@ -0,0 +1,216 @@
+"""Memory introspection for in-process state.
+
+Components that keep data in memory (the rate limiter's per-client
+history, caches) ``register`` a stats callback returning
+``(entries, approx_bytes)`` and optionally an ``evict`` callback. The
+registry is reported by ``/debug/memory`` and logged periodically by
+``MemoryMonitor`` together with the process RSS. When RSS goes over
+``memory_soft_limit_mb`` every registered ``evict`` callback is asked to
+drop what it can, before the container limit OOM-kills the process.
+
+Bound methods are held weakly (like ``config.subscribe``), so registering
+a component does not keep it alive; it disappears from the report when it
+is garbage collected.
+
+Allocation sites come from ``tracemalloc``, which is only started on
+demand (it slows allocation-heavy code noticeably).
+"""
+
+import asyncio
+import logging
+import resource
+import sys
+import threading
+import tracemalloc
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+StatsCallback = Callable[[], Tuple[int, int]]
+EvictCallback = Callable[[], int]
+
+
+def _ref(callback):
+    if hasattr(callback, "__self__"):
+        return weakref.WeakMethod(callback)
+    return lambda: callback
+
+
+_registry: Dict[str, Tuple[Callable, Optional[Callable]]] = {}
+_registry_lock = threading.Lock()
+
+
+def register(name: str, stats: StatsCallback, evict: Optional[EvictCallback] = None) -> None:
+    """Publish a component's ``(entries, approx_bytes)`` under ``name``.
+
+    ``evict()`` is called when the soft limit is exceeded and returns the
+    number of entries it dropped. Registering the same name again replaces
+    the previous entry.
+    """
+    with _registry_lock:
+        _registry[name] = (_ref(stats), _ref(evict) if evict is not None else None)
+
+
+def unregister(name: str) -> None:
+    with _registry_lock:
+        _registry.pop(name, None)
+
+
+def _live_entries() -> List[Tuple[str, Callable, Optional[Callable]]]:
+    live = []
+    with _registry_lock:
+        for name, (stats_ref, evict_ref) in list(_registry.items()):
+            stats = stats_ref()
+            if stats is None:
+                del _registry[name]
+                continue
+            live.append((name, stats, evict_ref() if evict_ref is not None else None))
+    return live
+
+
+def approximate_size(items: Iterable) -> int:
+    """Sum of ``sys.getsizeof`` over ``items`` (shallow, cheap)."""
+    return sum(sys.getsizeof(item) for item in items)
+
+
+def rss_bytes() -> int:
+    """Current resident set size; falls back to the peak where /proc is missing."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KiB elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def component_stats() -> Dict[str, dict]:
+    report = {}
+    for name, stats, evict in _live_entries():
+        try:
+            entries, size = stats()
+        except Exception as exc:  # noqa: BLE001
+            report[name] = {"error": str(exc)}
+            continue
+        report[name] = {"entries": entries, "approx_bytes": size, "evictable": evict is not None}
+    return report
+
+
+def top_allocations(limit: int = 20, key_type: str = "lineno") -> List[dict]:
+    """Largest allocation sites since ``tracemalloc`` was started."""
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+    )
+    rows = []
+    for stat in snapshot.statistics(key_type)[:limit]:
+        frame = stat.traceback[0]
+        rows.append(
+            {
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+        )
+    return rows
+
+
+def start_tracemalloc(frames: int = 1) -> bool:
+    """Start tracing allocations; returns False if it was already running."""
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(frames)
+    return True
+
+
+def stop_tracemalloc() -> bool:
+    if not tracemalloc.is_tracing():
+        return False
+    tracemalloc.stop()
+    return True
+
+
+def soft_limit_bytes() -> int:
+    return int(get_settings().memory_soft_limit_mb * 1024 * 1024)
+
+
+def evict_all(reason: str) -> Dict[str, int]:
+    """Ask every registered component to drop what it can."""
+    dropped = {}
+    for name, _, evict in _live_entries():
+        if evict is None:
+            continue
+        try:
+            dropped[name] = evict()
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Memory eviction for %s failed: %s", name, exc)
+    logger.warning("Memory eviction (%s): %s", reason, dropped)
+    return dropped
+
+
+def check_soft_limit() -> Optional[Dict[str, int]]:
+    """Run the eviction callbacks if RSS is over the soft limit."""
+    limit = soft_limit_bytes()
+    if limit <= 0:
+        return None
+    rss = rss_bytes()
+    if rss <= limit:
+        return None
+    return evict_all(f"rss {rss // (1024 * 1024)} MiB over soft limit {limit // (1024 * 1024)} MiB")
+
+
+def report(top: int = 0) -> dict:
+    data = {
+        "rss_bytes": rss_bytes(),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "soft_limit_bytes": soft_limit_bytes() or None,
+        "components": component_stats(),
+        "tracemalloc": tracemalloc.is_tracing(),
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        data["traced_bytes"] = current
+        data["traced_peak_bytes"] = peak
+        if top:
+            data["top_allocations"] = top_allocations(top)
+    return data
+
+
+class MemoryMonitor:
+    """Logs the memory report and enforces the soft limit on an interval."""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = get_settings().memory_report_interval if interval is None else interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            snapshot = report()
+            logger.info(
+                "Memory: rss=%d MiB components=%s",
+                snapshot["rss_bytes"] // (1024 * 1024),
+                {name: stats.get("entries") for name, stats in snapshot["components"].items()},
+            )
+            check_soft_limit()
+
+    def start(self) -> None:
+        if self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -1,102 +1,352 @@
 """Custom middleware for the API service."""
 
+import asyncio
+import math
+import sys
+import threading
 import time
+from collections import deque
 import structlog
-from typing import Dict
+from typing import Deque, Dict, List, Optional, Tuple
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.trustedhost import TrustedHostMiddleware as _StarletteTrustedHostMiddleware
 from starlette.responses import JSONResponse
 
+from client_ip import from_scope as client_ip_from_scope
+from config import Settings, get_settings, subscribe
 from exceptions import RateLimitError
+import memory
+from profiler import MAX_STACK_DEPTH, format_stack, thread_stack
+from request_log import RequestSummary, SamplingPolicy
+from route_policies import PolicyMatcher, RoutePolicy, parse_policies
 
 logger = structlog.get_logger()
 
 
 class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for request/response logging."""
+    """Middleware for request/response logging.
+
+    The per-request line is sampled (see ``request_log.SamplingPolicy``);
+    every request is counted in the per-interval ``RequestSummary``. Without
+    explicit ``settings`` both follow ``Settings`` across reloads.
+    """
+    
+    def __init__(self, app, settings: Optional[Settings] = None):
+        super().__init__(app)
+        if settings is None:
+            settings = get_settings()
+            subscribe(self._on_settings_reload)
+        self.policy = SamplingPolicy.from_settings(settings)
+        self.summary = RequestSummary(settings.log_summary_interval)
+    
+    def _on_settings_reload(self, old, new) -> None:
+        self.policy = SamplingPolicy.from_settings(new)
+        self.summary.interval = new.log_summary_interval
     
     async def dispatch(self, request: Request, call_next):
         start_time = time.time()
         
-        # Log request
-        logger.info(
+        logger.debug(
             "Request started",
             method=request.method,
             path=request.url.path,
             query_params=str(request.query_params),
-            client_ip=request.client.host if request.client else None
+            client_ip=client_ip_from_scope(request.scope)
         )
         
         # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            "Request completed",
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
-            duration_ms=round(duration * 1000, 2)
-        )
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            duration = time.time() - start_time
+            self._log_completed(request, status_code, duration * 1000)
         
         # Add timing header
         response.headers["X-Process-Time"] = str(duration)
         
         return response
+    
+    def _log_completed(self, request: Request, status_code: int, duration_ms: float) -> None:
+        path = request.url.path
+        # The route template keeps the summary keys bounded (/runs/{run_id})
+        route = request.scope.get("route")
+        self.summary.record(request.method, getattr(route, "path", "unmatched"), status_code, duration_ms)
+        
+        level, rate = self.policy.decide(path, status_code, duration_ms)
+        if level is None:
+            return
+        logger.log(
+            level,
+            "Request completed",
+            method=request.method,
+            path=path,
+            status_code=status_code,
+            duration_ms=round(duration_ms, 2),
+            sample_rate=rate,
+        )
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiting middleware."""
+    """Simple in-memory rate limiting middleware.
+
+    Limits come from the route policy table (see ``route_policies.py``),
+    matched once per request; requests no policy matches get
+    ``rate_limit``. Clients are identified by ``client_ip.from_scope``
+    (``X-Forwarded-For`` through trusted proxies) and counted separately
+    per policy. Without explicit values both follow ``Settings`` across
+    reloads.
+    """
     
-    def __init__(self, app, rate_limit: int = 100):
+    def __init__(self, app, rate_limit: Optional[int] = None, policies: Optional[List[str]] = None):
         super().__init__(app)
+        if rate_limit is None or policies is None:
+            settings = get_settings()
+            rate_limit = settings.rate_limit if rate_limit is None else rate_limit
+            policies = settings.rate_limit_policies if policies is None else policies
+            subscribe(self._on_settings_reload)
         self.rate_limit = rate_limit
-        self.requests: Dict[str, list] = {}
+        self.policy_specs = list(policies)
+        self.matcher = self._build_matcher(self.policy_specs, rate_limit)
+        self.requests: Dict[Tuple[str, str], list] = {}
         self.window_size = 60  # 1 minute window
+        memory.register("rate_limiter", self.memory_stats, self.evict_expired)
+    
+    @staticmethod
+    def _build_matcher(specs: List[str], rate_limit: int) -> PolicyMatcher:
+        return PolicyMatcher(parse_policies(specs), default=RoutePolicy("*", None, "/", rate_limit))
+    
+    def memory_stats(self):
+        """Tracked clients and the approximate size of their histories."""
+        history = list(self.requests.items())
+        size = sys.getsizeof(self.requests)
+        for key, times in history:
+            size += sys.getsizeof(key) + sys.getsizeof(key[1]) + sys.getsizeof(times) + len(times) * sys.getsizeof(0.0)
+        return len(history), size
+    
+    def evict_expired(self) -> int:
+        """Drop clients with no request inside the current window."""
+        cutoff = time.time() - self.window_size
+        stale = [key for key, times in list(self.requests.items()) if not times or times[-1] <= cutoff]
+        for key in stale:
+            self.requests.pop(key, None)
+        return len(stale)
+    
+    def _on_settings_reload(self, old, new) -> None:
+        if new.rate_limit != self.rate_limit or new.rate_limit_policies != self.policy_specs:
+            logger.info(
+                "Rate limit updated",
+                old=self.rate_limit,
+                new=new.rate_limit,
+                policies=new.rate_limit_policies,
+            )
+            self.matcher = self._build_matcher(new.rate_limit_policies, new.rate_limit)
+            self.rate_limit = new.rate_limit
+            self.policy_specs = list(new.rate_limit_policies)
     
     async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for health checks
-        if request.url.path.startswith("/health"):
+        path = request.scope["path"]
+        root_path = request.scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):] or "/"
+        policy = self.matcher.match(request.method, path)
+        if policy.limit is None:
             return await call_next(request)
         
-        # Get client identifier (IP address for now)
-        client_ip = request.client.host if request.client else "unknown"
+        client_ip = client_ip_from_scope(request.scope)
         
         # Check rate limit
-        if not self._check_rate_limit(client_ip):
+        retry_after = self._check_rate_limit((policy.name, client_ip), policy.limit)
+        if retry_after is not None:
             return JSONResponse(
                 status_code=429,
                 content={
                     "error": {
                         "code": "RATE_LIMIT_EXCEEDED",
-                        "message": f"Rate limit of {self.rate_limit} requests per minute exceeded"
+                        "message": f"Rate limit of {policy.limit} requests per minute exceeded"
                     }
-                }
+                },
+                headers={"Retry-After": str(retry_after)},
             )
         
         return await call_next(request)
     
-    def _check_rate_limit(self, client_ip: str) -> bool:
-        """Check if client is within rate limit."""
+    def _check_rate_limit(self, key: Tuple[str, str], limit: int) -> Optional[int]:
+        """Count a request for ``key``; seconds to wait if it is over ``limit``."""
         current_time = time.time()
         
-        # Initialize client request history if not exists
-        if client_ip not in self.requests:
-            self.requests[client_ip] = []
-        
         # Remove old requests outside the window
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
+        times = [
+            req_time for req_time in self.requests.get(key, ())
             if current_time - req_time < self.window_size
         ]
+        self.requests[key] = times
         
         # Check if under limit
-        if len(self.requests[client_ip]) >= self.rate_limit:
-            return False
+        if len(times) >= limit:
+            oldest = times[0] if times else current_time
+            return max(1, math.ceil(self.window_size - (current_time - oldest)))
         
         # Add current request
-        self.requests[client_ip].append(current_time)
-        return True
+        times.append(current_time)
+        return None
+
+
+class ReloadableCORSMiddleware:
+    """CORS middleware whose allowed origins follow ``Settings.cors_origins``.
+
+    Wraps Starlette's ``CORSMiddleware`` and rebuilds it when the origins
+    change on reload; requests in flight keep the instance they started
+    with. With no origins configured requests pass straight through.
+    """
+
+    def __init__(self, app, allow_methods: List[str], allow_headers: List[str], allow_credentials: bool = True):
+        self.app = app
+        self._options = {
+            "allow_methods": allow_methods,
+            "allow_headers": allow_headers,
+            "allow_credentials": allow_credentials,
+        }
+        self._cors = self._build(get_settings().cors_origins)
+        subscribe(self._on_settings_reload)
+
+    def _build(self, origins: Optional[List[str]]):
+        if not origins:
+            return None
+        return CORSMiddleware(self.app, allow_origins=origins, **self._options)
+
+    def _on_settings_reload(self, old, new) -> None:
+        if new.cors_origins != old.cors_origins:
+            logger.info("CORS origins updated", origins=new.cors_origins)
+            self._cors = self._build(new.cors_origins)
+
+    async def __call__(self, scope, receive, send):
+        cors = self._cors
+        if cors is None:
+            await self.app(scope, receive, send)
+        else:
+            await cors(scope, receive, send)
+
+
+class TrustedHostMiddleware:
+    """Starlette's ``TrustedHostMiddleware`` with routes that skip the check.
+
+    Health probes address the task by whatever reaches it: the Docker
+    ``HEALTHCHECK`` uses ``localhost`` and ALB target checks use the task IP,
+    neither of which is in a production ``allowed_hosts``. Requests under
+    ``exempt_routes`` (``/health`` by default) are passed through unchecked.
+    """
+
+    def __init__(self, app, allowed_hosts: List[str], exempt_routes: List[str] = ("/health",)):
+        self.app = app
+        self.checked = _StarletteTrustedHostMiddleware(app, allowed_hosts=allowed_hosts)
+        self.exempt: Tuple[str, ...] = tuple(route.rstrip("/") for route in exempt_routes)
+
+    def _is_exempt(self, scope) -> bool:
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):] or "/"
+        return any(path == route or path.startswith(route + "/") for route in self.exempt)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self._is_exempt(scope):
+            await self.app(scope, receive, send)
+        else:
+            await self.checked(scope, receive, send)
+
+
+# Most recent slow requests, newest last (served by /debug/slow-requests)
+slow_requests: Deque[dict] = deque(maxlen=50)
+
+
+class SlowRequestMiddleware:
+    """Capture a stack snapshot and timings for requests over a threshold.
+
+    A watchdog thread checks in-flight requests every half threshold. The
+    first time a request is over the limit it records both the event-loop
+    thread's stack (shows blocking code) and the request task's coroutine
+    stack (shows what it is awaiting). When the request finishes it is
+    logged and kept in ``slow_requests``.
+    """
+
+    def __init__(self, app, threshold_ms: float):
+        self.app = app
+        self.threshold = threshold_ms / 1000
+        self._active: Dict[int, dict] = {}
+        self._watchdog: Optional[threading.Thread] = None
+
+    def _ensure_watchdog(self) -> None:
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._watch, name="slow-request-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def _watch(self) -> None:
+        interval = max(self.threshold / 2, 0.01)
+        while True:
+            time.sleep(interval)
+            now = time.perf_counter()
+            for record in list(self._active.values()):
+                if record["snapshot"] is None and now - record["start"] >= self.threshold:
+                    record["snapshot"] = self._snapshot(record, now)
+
+    @staticmethod
+    def _snapshot(record: dict, now: float) -> dict:
+        task = record["task"]
+        try:
+            task_stack = format_stack(task.get_stack(limit=MAX_STACK_DEPTH)) if task else []
+        except RuntimeError:  # the coroutine moved on while we walked it
+            task_stack = []
+        return {
+            "at_ms": round((now - record["start"]) * 1000, 1),
+            "loop_thread_stack": thread_stack(record["thread_id"]),
+            "task_stack": task_stack,
+        }
+
+    async def __call__(self, scope, receive, send):
+        # /debug/profile is slow by design
+        if scope["type"] != "http" or scope["path"].startswith("/debug/"):
+            await self.app(scope, receive, send)
+            return
+
+        self._ensure_watchdog()
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "start": time.perf_counter(),
+            "task": asyncio.current_task(),
+            "thread_id": threading.get_ident(),
+            "snapshot": None,
+            "status": None,
+            "first_byte_ms": None,
+        }
+        key = id(record)
+        self._active[key] = record
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                record["status"] = message["status"]
+                record["first_byte_ms"] = round((time.perf_counter() - record["start"]) * 1000, 2)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            del self._active[key]
+            duration = time.perf_counter() - record["start"]
+            if duration >= self.threshold:
+                report = {
+                    "method": record["method"],
+                    "path": record["path"],
+                    "status": record["status"],
+                    "duration_ms": round(duration * 1000, 2),
+                    "first_byte_ms": record["first_byte_ms"],
+                    "threshold_ms": round(self.threshold * 1000, 2),
+                    "finished_at": time.time(),
+                    "snapshot": record["snapshot"],
+                }
+                slow_requests.append(report)
+                logger.warning("Slow request", **report)
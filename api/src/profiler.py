@@ -0,0 +1,106 @@
+"""Low-overhead sampling profiler and stack snapshot helpers.
+
+``SamplingProfiler`` walks ``sys._current_frames()`` from a background
+thread every ``interval`` seconds and counts identical stacks. The result is
+in the "collapsed stacks" format (``thread;outer;...;inner count`` per line)
+that flamegraph.pl, speedscope and inferno render directly. Nothing is
+installed in the interpreter (no ``sys.setprofile``), so the cost to the
+profiled code is one frame walk per sample.
+
+Only one profile runs per process at a time. Under gunicorn a profile covers
+the worker that served ``/debug/profile``.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+MAX_STACK_DEPTH = 128
+
+_profile_lock = threading.Lock()
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def collapse(frame, root: str = "") -> str:
+    """Render a frame and its callers as ``root;outer;...;inner``."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    if root:
+        labels.insert(0, root)
+    return ";".join(labels)
+
+
+def format_stack(frames) -> List[str]:
+    """Outermost-first ``func (file:line)`` labels for a list of frames."""
+    return [frame_label(frame) for frame in frames]
+
+
+def thread_stack(thread_id: int) -> List[str]:
+    """Current stack of another thread, outermost first."""
+    frame = sys._current_frames().get(thread_id)
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class ProfilerBusy(RuntimeError):
+    """Another profile is already running in this process."""
+
+
+class SamplingProfiler:
+    """Sample every thread's stack at a fixed interval."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        if not _profile_lock.acquire(blocking=False):
+            raise ProfilerBusy("a profile is already running")
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.elapsed = time.perf_counter() - self.started_at
+            _profile_lock.release()
+        return self
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names: Dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.counts[collapse(frame, names.get(thread_id, str(thread_id)))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, most frequent first."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.counts.most_common())
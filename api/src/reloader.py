@@ -0,0 +1,91 @@
+"""In-process configuration reload for the long-running servers.
+
+Each server process reloads ``config/<env>.env`` and the settings (including
+Secrets Manager values) when:
+
+- it receives ``SIGHUP`` (single-process uvicorn/hypercorn, or a signal sent
+  to an individual gunicorn worker);
+- the env file's modification time changes, checked every
+  ``config_watch_interval`` seconds (0 disables polling).
+
+Reloading swaps the ``Settings`` object atomically (``config.reload_settings``)
+and notifies subscribers such as the rate limiter and CORS middleware, so
+nothing restarts and no connection is dropped. ``SIGHUP`` to the gunicorn
+master instead reloads settings in the master and rolls the workers
+gracefully (see ``gunicorn_conf.on_reload``).
+
+Lambda does not run this; it reloads on ``settings_ttl_seconds`` instead.
+"""
+
+import asyncio
+import logging
+import signal
+import threading
+from typing import Optional
+
+import config
+import env_loader
+
+logger = logging.getLogger(__name__)
+
+
+def reload_configuration(reason: str) -> config.Settings:
+    """Re-read the env file and rebuild settings (blocking)."""
+    env_loader.load_environment_config(reload=True)
+    settings = config.reload_settings()
+    logger.info("Configuration reloaded (%s)", reason)
+    return settings
+
+
+class ConfigReloader:
+    """Watches for SIGHUP and env-file changes on the running event loop."""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = config.get_settings().config_watch_interval if interval is None else interval
+        self._path = env_loader.env_file_path()
+        self._mtime = self._read_mtime()
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._signal_installed = False
+
+    def _read_mtime(self) -> Optional[float]:
+        try:
+            return self._path.stat().st_mtime
+        except OSError:
+            return None
+
+    async def reload(self, reason: str) -> None:
+        # Serialise reloads; the Secrets Manager call runs off the loop
+        async with self._lock:
+            self._mtime = self._read_mtime()
+            try:
+                await asyncio.to_thread(reload_configuration, reason)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Configuration reload failed: %s", exc)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if self._read_mtime() != self._mtime:
+                await self.reload(f"{self._path.name} changed")
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if threading.current_thread() is threading.main_thread():
+            try:
+                loop.add_signal_handler(
+                    signal.SIGHUP, lambda: loop.create_task(self.reload("SIGHUP"))
+                )
+                self._signal_installed = True
+            except (NotImplementedError, RuntimeError, AttributeError):  # pragma: no cover - Windows
+                pass
+        if self.interval > 0:
+            self._task = loop.create_task(self._watch())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._signal_installed:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+            self._signal_installed = False
@@ -0,0 +1,222 @@
+"""Request log sampling and per-interval request summaries.
+
+Logging every request (including the load balancer and Docker ``/health``
+probes) costs more in log ingestion than it tells anyone. ``LoggingMiddleware``
+asks ``SamplingPolicy`` whether to write the per-request line:
+
+- server errors (5xx or an exception) are always logged, at ``error``;
+- requests slower than ``log_slow_request_ms`` are always logged, at
+  ``warning``;
+- everything else is logged at ``info`` with the probability of the first
+  matching rule in ``log_sample_rules``, else ``log_sample_rate``.
+
+Rules are ``<path prefix>[:<status>]=<rate>``, where status is an exact
+code (``404``) or a class (``4xx``)::
+
+    LANDING_API_LOG_SAMPLE_RULES=/health=0,/contact:4xx=1,/runs=0.05
+
+Every request, logged or not, is counted in ``RequestSummary``, which writes
+one ``Request summary`` line per route and status class every
+``log_summary_interval`` seconds. Each line has the count, errors and
+latency (mean, p50, p95, max). Sampled lines carry ``sample_rate``, so
+counts can be scaled back up.
+
+Summaries go to their own ``request_log.summary`` logger at ``info``. Its
+level is ``log_summary_level`` (``set_summary_level``), independent of
+``log_level``, so a production root level of ``WARNING`` keeps the
+summaries without raising them to warnings.
+"""
+
+import logging
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+import metrics
+
+SUMMARY_LOGGER = "request_log.summary"
+
+summary_logger = structlog.get_logger(SUMMARY_LOGGER)
+
+# Latencies kept per route and interval for the percentiles (reservoir)
+RESERVOIR_SIZE = 512
+# Distinct (method, route, status class) keys per interval; further keys are
+# folded into route "other" so a scan of random paths cannot grow memory
+MAX_KEYS = 200
+
+
+@dataclass(frozen=True)
+class SampleRule:
+    prefix: str
+    status: Optional[str]  # "404", "4xx" or None for any
+    rate: float
+
+    def matches(self, path: str, status: int) -> bool:
+        if not path.startswith(self.prefix):
+            return False
+        if self.status is None:
+            return True
+        if self.status.endswith("xx"):
+            return str(status)[:1] == self.status[:1]
+        return str(status) == self.status
+
+
+def parse_rules(specs: Sequence[str]) -> List[SampleRule]:
+    """Parse ``<prefix>[:<status>]=<rate>`` rules; raises ``ValueError``."""
+    rules = []
+    for spec in specs:
+        target, sep, rate = spec.rpartition("=")
+        if not sep or not target:
+            raise ValueError(f"Invalid log sample rule {spec!r}; expected <path>[:<status>]=<rate>")
+        prefix, _, status = target.partition(":")
+        rate_value = float(rate)
+        if not 0.0 <= rate_value <= 1.0:
+            raise ValueError(f"Log sample rate must be between 0 and 1 in {spec!r}")
+        rules.append(SampleRule(prefix.strip(), status.strip().lower() or None, rate_value))
+    return rules
+
+
+class SamplingPolicy:
+    """Decides whether and at which level a completed request is logged."""
+
+    def __init__(self, default_rate: float = 1.0, rules: Sequence[SampleRule] = (), slow_ms: float = 0.0):
+        self.default_rate = default_rate
+        self.rules = list(rules)
+        self.slow_ms = slow_ms
+
+    @classmethod
+    def from_settings(cls, settings) -> "SamplingPolicy":
+        return cls(settings.log_sample_rate, parse_rules(settings.log_sample_rules), settings.log_slow_request_ms)
+
+    def rate_for(self, path: str, status: int) -> float:
+        for rule in self.rules:
+            if rule.matches(path, status):
+                return rule.rate
+        return self.default_rate
+
+    def decide(self, path: str, status: int, duration_ms: float) -> Tuple[Optional[int], float]:
+        """``(level, rate)`` for the request line; ``level`` is None to skip it."""
+        if status >= 500:
+            return logging.ERROR, 1.0
+        if self.slow_ms > 0 and duration_ms >= self.slow_ms:
+            return logging.WARNING, 1.0
+        rate = self.rate_for(path, status)
+        if rate >= 1.0 or (rate > 0.0 and random.random() < rate):
+            return logging.INFO, rate
+        _sampled_out.inc()
+        return None, rate
+
+
+class _RouteStats:
+    __slots__ = ("count", "errors", "total", "max", "reservoir")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.reservoir: List[float] = []
+
+    def add(self, duration_ms: float, error: bool) -> None:
+        self.count += 1
+        self.errors += error
+        self.total += duration_ms
+        self.max = max(self.max, duration_ms)
+        if len(self.reservoir) < RESERVOIR_SIZE:
+            self.reservoir.append(duration_ms)
+        else:
+            slot = random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.reservoir[slot] = duration_ms
+
+    def summary(self) -> dict:
+        ordered = sorted(self.reservoir)
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 2)
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total / self.count, 2),
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "max_ms": round(self.max, 2),
+        }
+
+
+class RequestSummary:
+    """Aggregates every request and logs per-route totals on an interval.
+
+    ``record`` flushes the previous interval when it is due, so no
+    background task is needed (a frozen Lambda just flushes on its next
+    request); ``flush`` at shutdown writes the last partial interval.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stats: Dict[Tuple[str, str, str], _RouteStats] = {}
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        _summaries.add(self)
+
+    def record(self, method: str, route: str, status: int, duration_ms: float) -> None:
+        if self.interval <= 0:
+            return
+        key = (method, route, f"{status // 100}xx")
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= MAX_KEYS:
+                    key = (method, "other", key[2])
+                    stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = _RouteStats()
+            stats.add(duration_ms, status >= 500)
+            due = time.monotonic() - self._started >= self.interval
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            elapsed = time.monotonic() - self._started
+            self._started = time.monotonic()
+        if not stats:
+            return
+        for (method, route, status_class), route_stats in sorted(stats.items()):
+            summary_logger.info(
+                "Request summary",
+                method=method,
+                route=route,
+                status=status_class,
+                interval_s=round(elapsed, 1),
+                **route_stats.summary(),
+            )
+
+
+_summaries: "weakref.WeakSet[RequestSummary]" = weakref.WeakSet()
+
+
+def set_summary_level(level: str) -> None:
+    """Level of the summary logger, independent of the root ``log_level``."""
+    logging.getLogger(SUMMARY_LOGGER).setLevel(level)
+
+
+set_summary_level("INFO")
+
+
+def flush_all() -> None:
+    """Write out every live summary's partial interval (at shutdown)."""
+    for summary in list(_summaries):
+        summary.flush()
+
+
+_sampled_out = metrics.counter(
+    "request_logs_sampled_out_total", "Per-request log lines skipped by log sampling."
+)
@@ -0,0 +1,75 @@
+"""Per-route rate-limit policies.
+
+Each policy is ``[<METHOD>] [<path prefix>]=<limit>|exempt``, ``limit``
+being requests per client per minute; the first match wins and requests
+matching nothing get ``Settings.rate_limit``::
+
+    LANDING_API_RATE_LIMIT_POLICIES=/health=exempt,POST /contact=10,GET=300
+
+A prefix matches whole path segments (``/contact`` matches
+``/contact/stats`` but not ``/contacts``); a missing method or ``*``
+matches any method. The table is compiled into one anchored regular
+expression over ``"METHOD /path"``, so matching a request is a single
+``re.match`` whatever the number of policies.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+EXEMPT = "exempt"
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    name: str  # the spec's target, e.g. "POST /contact"; keys the counters
+    method: Optional[str]
+    prefix: str
+    limit: Optional[int]  # None: exempt from rate limiting
+
+
+def parse_policies(specs: Sequence[str]) -> List[RoutePolicy]:
+    """Parse ``[<METHOD>] [<prefix>]=<limit>|exempt`` specs; raises ``ValueError``."""
+    policies = []
+    for spec in specs:
+        target, sep, limit = spec.rpartition("=")
+        target = target.strip()
+        if not sep or not target:
+            raise ValueError(f"Invalid rate limit policy {spec!r}; expected [METHOD] [/path]=<limit>|exempt")
+        method, prefix = None, "/"
+        for part in target.split():
+            if part.startswith("/"):
+                prefix = part
+            elif part != "*":
+                method = part.upper()
+        limit = limit.strip().lower()
+        if limit == EXEMPT:
+            limit_value = None
+        else:
+            limit_value = int(limit)
+            if limit_value < 0:
+                raise ValueError(f"Rate limit must not be negative in {spec!r}")
+        policies.append(RoutePolicy(target, method, prefix, limit_value))
+    return policies
+
+
+class PolicyMatcher:
+    """The policy table compiled into one regular expression."""
+
+    def __init__(self, policies: Sequence[RoutePolicy], default: RoutePolicy):
+        self.policies = list(policies)
+        self.default = default
+        alternatives = []
+        for index, policy in enumerate(self.policies):
+            method = re.escape(policy.method) if policy.method else r"[^ ]+"
+            prefix = re.escape(policy.prefix.rstrip("/"))
+            alternatives.append(rf"(?P<p{index}>{method} {prefix}(?:/|$))")
+        # Alternation is tried left to right, which keeps first-match-wins
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+    def match(self, method: str, path: str) -> RoutePolicy:
+        if self._pattern is not None:
+            found = self._pattern.match(f"{method} {path}")
+            if found is not None:
+                return self.policies[int(found.lastgroup[1:])]
+        return self.default
@@ -1,17 +1,100 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import asyncio
+import csv
+import io
 import smtplib
 import ssl
 import logging
+import re
+import time
+from datetime import datetime, timezone
 from email.message import EmailMessage
+from typing import Iterator, List, Literal, Optional
+from urllib.parse import urlsplit
 
+from async_smtp import AsyncSMTP, envelope_for, message_bytes
+from auth import require_leads_access
+import bounded_executor
+import circuit_breaker
 from config import get_settings
-from exceptions import LandingAPIException
+from exceptions import CircuitOpenError, ConcurrencyLimitError, LandingAPIException
+import lead_store
+import metrics
+from serialization import JSONBytesResponse, dumps, project
+import tracing
+from tracing import TracedRoute
 
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/contact", tags=["contact"])
+router = APIRouter(prefix="/contact", tags=["contact"], route_class=TracedRoute)
+
+deliveries = metrics.counter("contact_deliveries_total", "Contact email deliveries by outcome.")
+delivery_seconds = metrics.histogram("contact_delivery_seconds", "Time spent delivering a contact email.")
+
+# Deliveries in progress on the asyncio transport (admission control there
+# is a counter rather than a thread pool)
+_async_in_flight = 0
+metrics.gauge(
+    "contact_async_deliveries_in_flight",
+    "Deliveries in progress on the asyncio SMTP transport.",
+    callback=lambda: {metrics.labels(): _async_in_flight},
+)
+
+
+def smtp_breaker() -> circuit_breaker.CircuitBreaker:
+    """The SMTP circuit breaker, tuned from the current settings."""
+    settings = get_settings()
+    return circuit_breaker.get(
+        "smtp",
+        failure_threshold=settings.smtp_breaker_failure_threshold,
+        reset_timeout=settings.smtp_breaker_reset_seconds,
+    )
+
+
+def delivery_executor() -> bounded_executor.BoundedExecutor:
+    """Threads reserved for SMTP delivery, sized from the current settings."""
+    settings = get_settings()
+    return bounded_executor.get(
+        "delivery",
+        workers=settings.delivery_workers,
+        queue_size=settings.delivery_queue_size,
+    )
+
+
+async def _deliver_async(settings, message: EmailMessage) -> None:
+    """Deliver ``message`` on the event loop (``smtp_transport=asyncio``)."""
+    global _async_in_flight
+    if _async_in_flight >= settings.smtp_async_max_in_flight:
+        raise ConcurrencyLimitError(
+            f"{_async_in_flight} deliveries in flight (limit {settings.smtp_async_max_in_flight})"
+        )
+    _async_in_flight += 1
+    client = AsyncSMTP(
+        settings.smtp_host,
+        settings.smtp_port,
+        connect_timeout=settings.smtp_connect_timeout,
+        timeout=settings.smtp_timeout,
+    )
+    try:
+        with tracing.span("smtp.connect", host=settings.smtp_host, port=settings.smtp_port):
+            await client.connect()
+            await client.ehlo()
+        if settings.smtp_use_tls:
+            with tracing.span("smtp.starttls"):
+                await client.starttls(ssl.create_default_context())
+        if settings.smtp_username and settings.smtp_password:
+            with tracing.span("smtp.login"):
+                await client.login(settings.smtp_username, settings.smtp_password)
+        sender, recipients = envelope_for(message)
+        with tracing.span("smtp.send", pipelining=client.supports("PIPELINING")):
+            await client.sendmail(sender, recipients, message_bytes(message))
+        with tracing.span("smtp.quit"):
+            await client.quit()
+    finally:
+        client.close()
+        _async_in_flight -= 1
 
 
 class ContactRequest(BaseModel):
@@ -34,36 +117,100 @@ async def _send_contact_email(name: str, phone: str) -> None:
         settings.email_to,
     )
 
-    message = EmailMessage()
-    message["Subject"] = "New contact submission"
-    message["From"] = settings.email_from
-    message["To"] = settings.email_to
+    with tracing.span("contact.build_message"):
+        message = EmailMessage()
+        message["Subject"] = "New contact submission"
+        message["From"] = settings.email_from
+        message["To"] = settings.email_to
 
-    body_lines = [
-        f"Name: {name}",
-        f"Phone: {phone}",
-    ]
-    message.set_content("\n".join(body_lines))
+        body_lines = [
+            f"Name: {name}",
+            f"Phone: {phone}",
+        ]
+        message.set_content("\n".join(body_lines))
 
     def send_email() -> None:
-        if settings.smtp_use_tls:
-            context = ssl.create_default_context()
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-                server.starttls(context=context)
-                if settings.smtp_username and settings.smtp_password:
-                    server.login(settings.smtp_username, settings.smtp_password)
-                server.send_message(message)
-        else:
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-                if settings.smtp_username and settings.smtp_password:
+        """Blocking delivery with smtplib (``smtp_transport=thread``)."""
+        # Time between handing off to the delivery pool and a thread picking it up
+        tracing.record_span("contact.queue_wait", submitted_ns)
+        with tracing.span("smtp.connect", host=settings.smtp_host, port=settings.smtp_port):
+            server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=settings.smtp_connect_timeout)
+        # The connect timeout only bounds the TCP handshake and greeting;
+        # every later command gets the operation timeout
+        server.sock.settimeout(settings.smtp_timeout)
+        with server:
+            if settings.smtp_use_tls:
+                context = ssl.create_default_context()
+                with tracing.span("smtp.starttls"):
+                    server.starttls(context=context)
+            if settings.smtp_username and settings.smtp_password:
+                with tracing.span("smtp.login"):
                     server.login(settings.smtp_username, settings.smtp_password)
+            with tracing.span("smtp.send"):
                 server.send_message(message)
+            with tracing.span("smtp.quit"):
+                server.quit()
+
+    # Fail fast while the mail server is known to be down; the socket
+    # timeouts bound each SMTP command, the deadline bounds the request
+    breaker = smtp_breaker()
+    try:
+        breaker.allow()
+    except CircuitOpenError:
+        deliveries.inc(outcome="rejected")
+        raise
+
+    started = time.perf_counter()
+    try:
+        with tracing.span("contact.deliver"):
+            if settings.smtp_transport == "asyncio":
+                delivery = _deliver_async(settings, message)
+            else:
+                submitted_ns = time.time_ns()
+                delivery = delivery_executor().run(send_email)
+            await asyncio.wait_for(delivery, timeout=settings.smtp_deadline)
+    except ConcurrencyLimitError:
+        # Shed before reaching the mail server; says nothing about its health
+        breaker.abandon()
+        deliveries.inc(outcome="throttled")
+        raise
+    except asyncio.CancelledError:
+        # Client disconnect or worker shutdown, not a mail server failure
+        breaker.abandon()
+        deliveries.inc(outcome="cancelled")
+        raise
+    except Exception:
+        # SMTP errors, socket timeouts and the deadline's asyncio.TimeoutError
+        breaker.record_failure()
+        deliveries.inc(outcome="failed")
+        raise
+    finally:
+        delivery_seconds.observe(time.perf_counter() - started)
+    breaker.record_success()
+    deliveries.inc(outcome="sent")
+
 
-    await asyncio.to_thread(send_email)
+def landing_origin(request: Request) -> Optional[str]:
+    """Scheme and host of the page that submitted the form, if known."""
+    origin = request.headers.get("origin")
+    if origin and origin != "null":
+        return origin
+    referer = request.headers.get("referer")
+    if referer:
+        parts = urlsplit(referer)
+        if parts.scheme and parts.netloc:
+            return f"{parts.scheme}://{parts.netloc}"
+    return None
 
 
 @router.post("")
-async def create_contact(request: ContactRequest):
+async def create_contact(request: ContactRequest, http_request: Request):
+    # Record the lead before attempting delivery so it survives SMTP failures
+    if get_settings().lead_store_url:
+        with tracing.span("contact.record"):
+            await asyncio.to_thread(
+                lead_store.record, request.name, request.phone, "api", landing_origin(http_request)
+            )
     try:
         s = get_settings()
         logger.info(
@@ -76,6 +223,8 @@ async def create_contact(request: ContactRequest):
             s.email_to,
         )
         await _send_contact_email(request.name, request.phone)
+    except LandingAPIException:
+        raise
     except Exception as exc:  # noqa: BLE001
         raise LandingAPIException(
             status_code=500,
@@ -85,3 +234,122 @@ async def create_contact(request: ContactRequest):
         ) from exc
 
     return {"status": "ok"}
+
+
+EXPORT_FIELDS = ("id", "created_at", "name", "phone", "source", "origin")
+_PHONE_LIKE = re.compile(r"[+\d\s().-]+")
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def _csv_safe(value) -> str:
+    # Keep spreadsheet apps from evaluating submitted text as a formula;
+    # plain phone numbers ("+1 555-0100") are left alone
+    text = "" if value is None else str(value)
+    if text[:1] in ("=", "+", "-", "@", "\t", "\r") and not _PHONE_LIKE.fullmatch(text):
+        return "'" + text
+    return text
+
+
+def _ndjson_chunks(pages: Iterator[List[lead_store.Lead]]) -> Iterator[bytes]:
+    for leads in pages:
+        rows = []
+        for lead in leads:
+            row = lead.as_dict()
+            row["created_at"] = _iso(lead.created_at)
+            rows.append(row)
+        yield b"".join(dumps(row) + b"\n" for row in project(rows, EXPORT_FIELDS))
+
+
+def _csv_chunks(pages: Iterator[List[lead_store.Lead]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for leads in pages:
+        for lead in leads:
+            row = lead.as_dict()
+            row["created_at"] = _iso(lead.created_at)
+            writer.writerow([_csv_safe(row[field]) for field in EXPORT_FIELDS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/submissions", dependencies=[Depends(require_leads_access)])
+async def export_submissions(
+    format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+    since: Optional[datetime] = Query(default=None, description="inclusive lower bound on created_at"),
+    until: Optional[datetime] = Query(default=None, description="exclusive upper bound on created_at"),
+    phone: Optional[str] = Query(default=None),
+    after_id: int = Query(default=0, ge=0, description="keyset cursor: return ids above this"),
+    limit: Optional[int] = Query(default=None, ge=1),
+) -> StreamingResponse:
+    """Stream recorded leads as NDJSON or CSV in id order.
+
+    Rows are read a page at a time with keyset pagination, so exporting the
+    whole store uses constant memory. For paged exports pass ``limit`` and
+    continue with ``after_id`` set to the last id received.
+    """
+    store = lead_store.get_store()
+    if store is None:
+        raise LandingAPIException(
+            status_code=404,
+            error_code="LEAD_STORE_DISABLED",
+            message="No lead store is configured",
+        )
+    # Sync generators: Starlette iterates them in the thread pool, which
+    # keeps the SQLite reads off the event loop. One chunk per page.
+    pages = store.iter_pages(
+        after_id=after_id,
+        limit=limit,
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None,
+        phone=phone,
+    )
+    if format == "csv":
+        return StreamingResponse(
+            _csv_chunks(pages),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="submissions.csv"'},
+        )
+    return StreamingResponse(_ndjson_chunks(pages), media_type="application/x-ndjson")
+
+
+@router.get("/stats", dependencies=[Depends(require_leads_access)], response_class=JSONBytesResponse)
+async def submission_stats(
+    since: Optional[datetime] = Query(default=None, description="default: 7 days before until"),
+    until: Optional[datetime] = Query(default=None, description="default: now"),
+    granularity: Literal["hour", "day"] = Query(default="day"),
+    by_origin: bool = Query(default=False),
+) -> JSONBytesResponse:
+    """Submission counts per hour or day (optionally per landing origin).
+
+    Answered from the rollups, so the cost grows with the number of buckets
+    in the range, not the number of submissions. Hourly detail is kept for
+    ``LANDING_API_LEAD_ROLLUP_HOURLY_DAYS``; older hours come back as day
+    buckets.
+    """
+    store = lead_store.get_store()
+    if store is None:
+        raise LandingAPIException(
+            status_code=404,
+            error_code="LEAD_STORE_DISABLED",
+            message="No lead store is configured",
+        )
+    end = until.timestamp() if until else time.time()
+    start = since.timestamp() if since else end - 7 * lead_store.DAY
+    buckets = await asyncio.to_thread(store.counts, start, end, granularity, by_origin)
+    for bucket in buckets:
+        bucket["start"] = _iso(bucket["start"])
+    # Hourly per-origin ranges run to thousands of buckets: encode them once
+    return JSONBytesResponse(dumps({
+        "since": _iso(start),
+        "until": _iso(end),
+        "granularity": granularity,
+        "total": sum(bucket["count"] for bucket in buckets),
+        "buckets": buckets,
+    }))
@@ -0,0 +1,99 @@
+"""Diagnostics endpoints (disabled unless explicitly enabled).
+
+Mounted only when ``LANDING_API_DEBUG_ENDPOINTS_ENABLED`` is true, and every
+request must carry ``X-Debug-Token`` (see ``auth.require_debug_access``).
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from auth import require_debug_access
+from config import get_settings
+from exceptions import ConcurrencyLimitError, LandingAPIException
+import memory
+import middleware
+from profiler import ProfilerBusy, SamplingProfiler
+from tracing import TracedRoute
+
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    route_class=TracedRoute,
+    dependencies=[Depends(require_debug_access)],
+)
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: float = Query(default=5.0, ge=1.0, le=100.0),
+) -> PlainTextResponse:
+    """Sample this process for ``seconds`` and return collapsed stacks.
+
+    The output feeds straight into flamegraph.pl or speedscope. Live traffic
+    keeps being served while the profile runs.
+    """
+    settings = get_settings()
+    if seconds > settings.profile_max_seconds:
+        raise LandingAPIException(
+            status_code=400,
+            error_code="PROFILE_TOO_LONG",
+            message=f"seconds must be at most {settings.profile_max_seconds}",
+        )
+    try:
+        profiler = SamplingProfiler(interval=interval_ms / 1000).start()
+    except ProfilerBusy as exc:
+        raise ConcurrencyLimitError(str(exc)) from exc
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+
+    return PlainTextResponse(
+        profiler.collapsed() + "\n",
+        headers={
+            "X-Profile-Samples": str(profiler.samples),
+            "X-Profile-Seconds": f"{profiler.elapsed:.3f}",
+        },
+    )
+
+
+@router.get("/slow-requests")
+async def slow_requests(limit: int = Query(default=20, ge=1, le=50)) -> dict:
+    """Most recent requests over ``LANDING_API_SLOW_REQUEST_THRESHOLD_MS``."""
+    recent = list(middleware.slow_requests)[-limit:]
+    return {
+        "threshold_ms": get_settings().slow_request_threshold_ms,
+        "requests": list(reversed(recent)),
+    }
+
+
+@router.get("/memory")
+async def memory_report(top: int = Query(default=0, ge=0, le=200)) -> dict:
+    """RSS, registered in-process structures and (with ``top``) allocation sites.
+
+    Asking for ``top`` while tracemalloc is off starts it; the next call
+    reports the sites that allocated since then.
+    """
+    started = False
+    if top:
+        started = memory.start_tracemalloc(get_settings().memory_tracemalloc_frames)
+    report = await asyncio.to_thread(memory.report, 0 if started else top)
+    if started:
+        report["tracemalloc_started"] = True
+    return report
+
+
+@router.delete("/memory/tracemalloc")
+async def stop_tracemalloc() -> dict:
+    """Stop allocation tracing (and its overhead)."""
+    return {"stopped": memory.stop_tracemalloc()}
+
+
+@router.post("/memory/evict")
+async def evict() -> dict:
+    """Run every registered eviction callback now."""
+    return {"evicted": memory.evict_all("requested via /debug/memory/evict")}
@@ -5,9 +5,11 @@ from pydantic import BaseModel
 
 from services.health_service import HealthService
 from config import get_settings
+import worker_stats
+from tracing import TracedRoute
 
 
-router = APIRouter(tags=["health"])
+router = APIRouter(tags=["health"], route_class=TracedRoute)
 
 
 class HealthCheck(BaseModel):
@@ -48,3 +50,15 @@ async def detailed_health_check(
         version=settings.version,
         checks=result.checks,
     )
+
+
+@router.get("/health/workers")
+async def worker_health() -> dict:
+    """Per-worker request statistics (one entry per server process)."""
+
+    workers = worker_stats.collect()
+    return {
+        "workers": workers,
+        "total_requests": sum(w["requests"] for w in workers),
+        "total_in_flight": sum(w["in_flight"] for w in workers),
+    }
@@ -0,0 +1,16 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+import metrics
+from tracing import TracedRoute
+
+
+router = APIRouter(tags=["metrics"], route_class=TracedRoute)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def scrape() -> PlainTextResponse:
+    """Metrics for this process in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
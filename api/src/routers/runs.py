@@ -6,9 +6,10 @@ breaking imports and can be repurposed for future Landing API functionality.
 """
 
 from fastapi import APIRouter
+from tracing import TracedRoute
 
 
-router = APIRouter(prefix="/runs", tags=["runs"])
+router = APIRouter(prefix="/runs", tags=["runs"], route_class=TracedRoute)
 
 
 @router.get("")
@@ -0,0 +1,68 @@
+"""Projection-based JSON fast path for list responses.
+
+The model path for a list page validates every stored item into a pydantic
+model in the service and again against ``response_model`` on the way out,
+then goes through ``jsonable_encoder`` and ``json.dumps``. Items were
+validated when they were written, so a list response can instead copy the
+fields it needs straight from the stored dicts and encode them once::
+
+    body = encode_page(project(items, ("id", "status", "created_at")))
+    return JSONBytesResponse(body)
+
+``GET /contact/stats`` answers this way, and ``GET /contact/submissions``
+encodes its NDJSON rows with ``dumps``.
+
+Encoding uses ``orjson`` when installed (optional, like ``brotli``) and
+falls back to compact ``json.dumps``. Values the stored dicts may hold
+that JSON does not (DynamoDB ``Decimal``, ``datetime``, enums, sets) are
+converted by ``_default``.
+
+``benchmarks/bench_list_serialization.py`` compares both paths.
+"""
+
+import datetime as dt
+import json
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Sequence
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+def project(items: Iterable[Dict[str, Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Copy ``fields`` out of each stored item (``None`` when missing, like a model default)."""
+    return [{field: item.get(field) for field in fields} for item in items]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, (dt.datetime, dt.date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode ``value`` as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_page(items: List[Dict[str, Any]]) -> bytes:
+    """The list response body: ``{"items": [...], "count": n}``."""
+    return dumps({"items": items, "count": len(items)})
+
+
+class JSONBytesResponse(Response):
+    """A JSON response whose body is already encoded (skips FastAPI's encoder)."""
+
+    media_type = "application/json"
@@ -7,6 +7,8 @@ reports basic API health.
 from dataclasses import dataclass
 from typing import Dict
 
+import circuit_breaker
+
 
 @dataclass
 class HealthResult:
@@ -18,9 +20,16 @@ class HealthService:
     """Service for checking basic system health."""
 
     async def check_basic_health(self) -> HealthResult:
-        """Basic health check - API availability only."""
+        """Basic health check - API availability plus circuit breaker states.
+
+        An open circuit means a downstream service is failing, not this
+        process, so it is reported without marking the task unhealthy.
+        """
 
-        return HealthResult(healthy=True, checks={"api": "OK"})
+        checks = {"api": "OK"}
+        for name, breaker in circuit_breaker.snapshot().items():
+            checks[f"{name}_circuit"] = breaker["state"]
+        return HealthResult(healthy=True, checks=checks)
 
     async def check_detailed_health(self) -> HealthResult:
         """Detailed health check - currently same as basic for Landing API."""
@@ -10,12 +10,18 @@ from legacy_common_backend.dynamodb import DynamoDBStateManager, DynamoDBConfig
 from legacy_common_backend.sqs import TypedSQSManager
 from config import get_settings
 from exceptions import RunNotFoundError, WorkflowNotFoundError
+import single_flight
 
 logger = structlog.get_logger()
 
 
 class RunService:
-    """Service for managing workflow runs."""
+    """Service for managing workflow runs.
+    
+    Concurrent identical reads (several tabs polling one run) share a
+    single backend call through ``single_flight``; ownership is still
+    checked for every caller.
+    """
     
     def __init__(self):
         self.settings = get_settings()
@@ -41,7 +47,7 @@ class RunService:
         """Create and start a new run."""
         
         # Verify workflow exists
-        workflow_item = await self.db_manager.get_workflow(workflow_id)
+        workflow_item = await self._fetch_workflow(workflow_id)
         
         if not workflow_item or workflow_item.get("created_by") != created_by:
             raise WorkflowNotFoundError(workflow_id)
@@ -73,16 +79,28 @@ class RunService:
         logger.info("Run created and queued", run_id=run.id, workflow_id=workflow_id)
         return run
     
+    async def _fetch_run(self, run_id: str) -> Optional[Run]:
+        """The run as stored (shared by concurrent callers; do not mutate)."""
+        
+        async def fetch() -> Optional[Run]:
+            item = await self.db_manager.get_run(run_id)
+            return Run(**item) if item else None
+        
+        return await single_flight.get("run").do(run_id, fetch)
+    
+    async def _fetch_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        return await single_flight.get("workflow").do(
+            workflow_id, lambda: self.db_manager.get_workflow(workflow_id)
+        )
+    
     async def get_run(self, run_id: str, user_id: str) -> Run:
         """Get a run by ID."""
         
-        item = await self.db_manager.get_run(run_id)
+        run = await self._fetch_run(run_id)
         
-        if not item:
+        if not run:
             raise RunNotFoundError(run_id)
         
-        run = Run(**item)
-        
         # Check ownership
         if run.created_by != user_id:
             raise RunNotFoundError(run_id)
@@ -97,8 +115,12 @@ class RunService:
     ) -> List[Run]:
         """List runs for a user."""
         
-        # Get runs (filter by user since backend doesn't have user filtering yet)
-        items = await self.db_manager.list_runs(workflow_id=workflow_id, status=status)
+        # Get runs (filter by user since backend doesn't have user filtering yet);
+        # the unfiltered listing is the same for every user, so it is shared
+        items = await single_flight.get("run_list").do(
+            (workflow_id, status),
+            lambda: self.db_manager.list_runs(workflow_id=workflow_id, status=status),
+        )
         
         # Filter by user
         user_items = [item for item in items if item.get("created_by") == created_by]
@@ -8,6 +8,7 @@ from legacy_common_all.models import Workflow
 from legacy_common_backend.dynamodb import DynamoDBStateManager, DynamoDBConfig
 from config import get_settings
 from exceptions import WorkflowNotFoundError
+import single_flight
 
 logger = structlog.get_logger()
 
@@ -51,7 +52,9 @@ class WorkflowService:
     async def get_workflow(self, workflow_id: str, user_id: str) -> Workflow:
         """Get a workflow by ID."""
         
-        item = await self.db_manager.get_workflow(workflow_id)
+        item = await single_flight.get("workflow").do(
+            workflow_id, lambda: self.db_manager.get_workflow(workflow_id)
+        )
         
         if not item:
             raise WorkflowNotFoundError(workflow_id)
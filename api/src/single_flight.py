@@ -0,0 +1,79 @@
+"""Single-flight coalescing of concurrent identical async calls.
+
+While a call for ``key`` is in flight, further calls for the same key wait
+for it and share its result (or exception) instead of issuing their own::
+
+    runs = single_flight.get("run")
+    item = await runs.do(run_id, lambda: db_manager.get_run(run_id))
+
+Only concurrent calls are coalesced; nothing is cached once the call
+completes. The shared call runs in its own task, so a caller that is
+cancelled (client disconnect) does not cancel it for the others. Callers
+receive the same object and must not mutate it; per-caller checks such as
+ownership belong after ``do``.
+
+Groups are named and kept in a registry (like circuit breakers); the
+``single_flight_calls_total{group,result}`` counter on ``/metrics`` splits
+calls into ``leader`` (hit the backend) and ``shared`` (coalesced), which
+gives the hit rate.
+"""
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+import metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls per key (one event loop)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is not None and not task.done():
+            _calls.inc(group=self.name, result="shared")
+        else:
+            _calls.inc(group=self.name, result="leader")
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get(name: str) -> SingleFlight:
+    """Get (or create) the named group."""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+    return group
+
+
+_calls = metrics.counter(
+    "single_flight_calls_total", "Coalesced reads by group: leader (backend call) or shared."
+)
+metrics.gauge(
+    "single_flight_in_flight",
+    "Distinct keys with a backend call in flight.",
+    callback=lambda: {metrics.labels(group=name): group.in_flight() for name, group in list(_groups.items())},
+)
@@ -0,0 +1,223 @@
+"""Static delivery of the landing site bundle (``html/dist``).
+
+``StaticSite`` is an ASGI app mounted by the ``ecs-full`` profile when
+``static_dir`` is set, so self-hosted and local setups need no separate web
+server. It serves what ``html/build.py`` produces:
+
+- **Pre-compressed variants**: ``index.html.br`` / ``index.html.gz`` are
+  picked by ``Accept-Encoding`` (``compression.negotiate_encoding``), so
+  nothing is compressed per request. Responses carry ``Vary:
+  Accept-Encoding`` whenever a variant exists.
+- **Strong ETags** from a content hash of each variant (``"<sha256>-br"``)
+  and ``If-None-Match`` -> ``304``.
+- **Caching**: content-hashed names (``logo.55f43f92.svg``) never change
+  and get ``Cache-Control: public, max-age=31536000, immutable``; anything
+  else (``index.html``) is revalidated on every use (``no-cache``).
+- **Small hot assets in memory**: files up to ``static_cache_max_file_kb``
+  are kept in an LRU of at most ``static_cache_mb``, registered with
+  ``memory`` so the soft limit can evict it.
+- **Larger files** go through Starlette's ``FileResponse``, which hands the
+  path to the server (``http.response.pathsend``, i.e. sendfile) when the
+  server supports that ASGI extension and otherwise streams 64 KiB chunks.
+  It also answers ``Range`` requests.
+
+Files are looked up on every request (a ``stat`` per variant, in a worker
+thread), so a rebuilt bundle is picked up without a restart. Missing files
+and other methods raise ``HTTPException``, so the 404/405 look like any
+other from the app even when the site is mounted at ``/``.
+"""
+
+import asyncio
+import hashlib
+import mimetypes
+import os
+import re
+import stat as stat_module
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+
+from compression import negotiate_encoding
+import memory
+
+# Content-coding -> file suffix written by html/build.py, in preference order
+VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# ``name.<8+ hex>.ext``: the content hash html/build.py puts in asset names
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.[^./]+$")
+
+# Content-coding -> (path, stat) of each pre-compressed sibling on disk
+_Variants = Dict[str, Tuple[Path, os.stat_result]]
+
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("font/woff2", ".woff2")
+
+
+class _CachedFile:
+    __slots__ = ("body", "etag", "mtime_ns", "size")
+
+    def __init__(self, body: Optional[bytes], etag: str, mtime_ns: int, size: int):
+        self.body = body
+        self.etag = etag
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+
+class StaticSite:
+    """Serve a pre-built static bundle with negotiated pre-compressed variants."""
+
+    def __init__(self, directory: str, cache_bytes: int = 8 * 1024 * 1024, max_file_bytes: int = 64 * 1024):
+        self.directory = Path(directory).resolve()
+        if not self.directory.is_dir():
+            raise ValueError(f"Static directory {directory!r} does not exist")
+        self.cache_bytes = cache_bytes
+        self.max_file_bytes = max_file_bytes
+        # (path, encoding) -> ETag and, for small files, the body
+        self._files: "OrderedDict[Tuple[str, Optional[str]], _CachedFile]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        memory.register("static_cache", self.memory_stats, self.evict_all)
+
+    # -- memory registry ---------------------------------------------------
+
+    def memory_stats(self):
+        with self._lock:
+            return len(self._files), self._cached_bytes
+
+    def evict_all(self) -> int:
+        with self._lock:
+            dropped = len(self._files)
+            self._files.clear()
+            self._cached_bytes = 0
+        return dropped
+
+    # -- lookup ------------------------------------------------------------
+
+    def _resolve(self, relative: str) -> Optional[Path]:
+        relative = relative.lstrip("/")
+        if not relative or relative.endswith("/"):
+            relative += "index.html"
+        path = (self.directory / relative).resolve()
+        if path != self.directory and self.directory not in path.parents:
+            return None  # escaped the bundle (.., symlinks)
+        if path.is_dir():
+            path = path / "index.html"
+        return path
+
+    def _lookup(self, relative: str) -> Optional[Tuple[Path, os.stat_result, _Variants]]:
+        """The file for ``relative`` and its pre-compressed variants; runs in a worker thread."""
+        path = self._resolve(relative)
+        try:
+            stat = path.stat() if path is not None else None
+        except OSError:
+            stat = None
+        if stat is None or not stat_module.S_ISREG(stat.st_mode):
+            return None
+        variants: _Variants = {}
+        for encoding, suffix in VARIANTS:
+            candidate = path.with_name(path.name + suffix)
+            try:
+                variants[encoding] = (candidate, candidate.stat())
+            except OSError:
+                continue
+        return path, stat, variants
+
+    def _cached(self, path: Path, encoding: Optional[str], stat: os.stat_result) -> Optional[_CachedFile]:
+        key = (str(path), encoding)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                self._files.move_to_end(key)
+                return entry
+        return None
+
+    def _load(self, path: Path, encoding: Optional[str], stat: os.stat_result) -> _CachedFile:
+        """Read (small files) and hash ``path``; runs in a worker thread."""
+        key = (str(path), encoding)
+        data = path.read_bytes() if stat.st_size <= self.max_file_bytes else None
+        digest = hashlib.sha256()
+        if data is not None:
+            digest.update(data)
+        else:
+            with open(path, "rb") as handle:
+                for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        etag = f'"{digest.hexdigest()[:32]}{"-" + encoding if encoding else ""}"'
+        entry = _CachedFile(data, etag, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            previous = self._files.pop(key, None)
+            if previous is not None and previous.body is not None:
+                self._cached_bytes -= len(previous.body)
+            self._files[key] = entry
+            if data is not None:
+                self._cached_bytes += len(data)
+                while self._cached_bytes > self.cache_bytes and self._files:
+                    _, old = self._files.popitem(last=False)
+                    if old.body is not None:
+                        self._cached_bytes -= len(old.body)
+                if key not in self._files:
+                    # Larger than the whole cache: serve it, remember nothing
+                    entry.body = data
+        return entry
+
+    # -- ASGI --------------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(405, headers={"Allow": "GET, HEAD"})
+
+        root_path = scope.get("root_path", "")
+        relative = scope["path"][len(root_path):] if scope["path"].startswith(root_path) else scope["path"]
+        found = await asyncio.to_thread(self._lookup, relative)
+        if found is None:
+            raise HTTPException(404)
+        path, stat, variants = found
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""), list(variants)) if variants else None
+        if encoding is not None:
+            file_path, file_stat = variants[encoding]
+        else:
+            file_path, file_stat = path, stat
+
+        entry = self._cached(file_path, encoding, file_stat)
+        if entry is None:
+            entry = await asyncio.to_thread(self._load, file_path, encoding, file_stat)
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": IMMUTABLE if _HASHED_NAME.search(path.name) else REVALIDATE,
+        }
+        if variants:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or entry.etag in _etags(if_none_match)):
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if media_type.startswith("text/"):
+            media_type += "; charset=utf-8"
+        if entry.body is not None:
+            response = Response(entry.body, media_type=media_type, headers=headers)
+        else:
+            response = FileResponse(file_path, media_type=media_type, headers=headers, stat_result=file_stat)
+        await response(scope, receive, send)
+
+
+def _etags(header: str):
+    # Weak comparison for If-None-Match (RFC 9110 section 13.1.2)
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
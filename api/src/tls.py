@@ -0,0 +1,108 @@
+"""TLS termination profiles for the self-hosted (ECS) servers.
+
+``LANDING_API_TLS_PROFILE`` selects how the container terminates TLS:
+
+- ``intermediate`` (default): TLS 1.2 and 1.3, ECDHE key exchange with AEAD
+  ciphers only, so every handshake uses ephemeral ECDH and no CBC/RSA-kx
+  suites are negotiated;
+- ``modern``: TLS 1.3 only (one round trip, smallest cipher list);
+- ``off``: plain HTTP, for running behind a load balancer that already
+  terminates TLS. ``LANDING_API_SSL_ENABLED=false`` selects it as well.
+
+Session tickets are left enabled so returning clients resume without a full
+handshake. The context is built once in the gunicorn master (see
+``gunicorn_conf.py``); forked workers inherit it together with its ticket
+keys, so a ticket issued by one worker is accepted by all of them.
+"""
+
+import os
+import ssl
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+DEFAULT_KEYFILE = "/app/api/key.pem"
+DEFAULT_CERTFILE = "/app/api/cert.pem"
+
+# TLS 1.2 suites: ECDHE + AEAD, ECDSA first (the Dockerfile issues a P-256 key)
+TLS12_CIPHERS = ":".join(
+    (
+        "ECDHE-ECDSA-AES128-GCM-SHA256",
+        "ECDHE-RSA-AES128-GCM-SHA256",
+        "ECDHE-ECDSA-CHACHA20-POLY1305",
+        "ECDHE-RSA-CHACHA20-POLY1305",
+        "ECDHE-ECDSA-AES256-GCM-SHA384",
+        "ECDHE-RSA-AES256-GCM-SHA384",
+    )
+)
+
+
+@dataclass(frozen=True)
+class TLSProfile:
+    """Protocol versions and ciphers for one termination profile."""
+
+    name: str
+    minimum_version: ssl.TLSVersion
+    ciphers: str
+
+
+PROFILES: Dict[str, TLSProfile] = {
+    "intermediate": TLSProfile("intermediate", ssl.TLSVersion.TLSv1_2, TLS12_CIPHERS),
+    "modern": TLSProfile("modern", ssl.TLSVersion.TLSv1_3, TLS12_CIPHERS),
+}
+
+_server_context: Optional[ssl.SSLContext] = None
+
+
+def profile_name() -> str:
+    """Return the configured profile name (``off`` when TLS is disabled)."""
+    if os.getenv("LANDING_API_SSL_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return "off"
+    name = os.getenv("LANDING_API_TLS_PROFILE", "intermediate").lower()
+    if name != "off" and name not in PROFILES:
+        raise ValueError(f"Unknown LANDING_API_TLS_PROFILE {name!r}; expected one of {sorted(PROFILES) + ['off']}")
+    return name
+
+
+def cert_paths() -> tuple:
+    """Return ``(certfile, keyfile)`` from the environment."""
+    return (
+        os.getenv("LANDING_API_SSL_CERTFILE", DEFAULT_CERTFILE),
+        os.getenv("LANDING_API_SSL_KEYFILE", DEFAULT_KEYFILE),
+    )
+
+
+def create_server_context(
+    certfile: str,
+    keyfile: str,
+    profile: str = "intermediate",
+    alpn_protocols: Sequence[str] = ("http/1.1",),
+) -> ssl.SSLContext:
+    """Build a server-side ``SSLContext`` for ``profile``."""
+    settings = PROFILES[profile]
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.minimum_version = settings.minimum_version
+    context.set_ciphers(settings.ciphers)
+    context.options |= ssl.OP_NO_COMPRESSION | ssl.OP_NO_RENEGOTIATION
+    # Stateless resumption: tickets for TLS 1.2 and (by default two per
+    # connection) for TLS 1.3
+    context.options &= ~ssl.OP_NO_TICKET
+    context.set_alpn_protocols(list(alpn_protocols))
+    context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+def server_context() -> Optional[ssl.SSLContext]:
+    """Return the process-wide context for the configured profile.
+
+    Built on first use and cached; ``None`` when the profile is ``off``.
+    """
+    global _server_context
+    if _server_context is None and profile_name() != "off":
+        certfile, keyfile = cert_paths()
+        _server_context = create_server_context(certfile, keyfile, profile_name())
+    return _server_context
+
+
+def uvicorn_context_factory(config, default_factory) -> ssl.SSLContext:
+    """``ssl_context_factory`` for uvicorn: reuse the shared context."""
+    return server_context() or default_factory()
@@ -0,0 +1,434 @@
+"""Lightweight in-process request tracing.
+
+A trace is started per request by ``TracingMiddleware`` (head sampling at
+``trace_sample_rate``) and spans are opened with ``span(name)`` anywhere below
+it, including threads started through ``asyncio.to_thread`` (the context is
+copied). Unsampled requests carry no trace and every helper returns after a
+single context-variable lookup.
+
+Trace IDs reuse the upstream request identifier when there is one: the API
+Gateway ``requestContext.requestId`` (Lambda, via Mangum), the ALB
+``X-Amzn-Trace-Id`` root, or a W3C ``traceparent``. Finished traces are
+exported off the request path:
+
+- ``json``: one JSON object per trace appended to ``trace_file``;
+- ``otlp``: OTLP/HTTP JSON posted to ``trace_otlp_endpoint`` (any OTLP
+  collector, or ``python -m loadtest.otlp_sink`` locally).
+"""
+
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "landing-api"
+
+_HEX32 = re.compile(r"^[0-9a-f]{32}$")
+_AMZN_ROOT = re.compile(r"Root=1-([0-9a-f]{8})-([0-9a-f]{24})")
+
+
+@dataclass
+class Span:
+    """One timed operation inside a trace."""
+
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, object] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+@dataclass
+class Trace:
+    """Spans collected for one sampled request."""
+
+    trace_id: str
+    spans: List[Span] = field(default_factory=list)
+
+
+_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("landing_trace", default=None)
+_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("landing_span", default=None)
+_route_start: contextvars.ContextVar[int] = contextvars.ContextVar("landing_route_start", default=0)
+
+_exporter = None
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def trace_id_from(upstream: Optional[str]) -> str:
+    """Derive a 32-hex trace ID from an upstream request ID (or make one)."""
+    if upstream:
+        candidate = upstream.replace("-", "").lower()
+        if _HEX32.match(candidate):
+            return candidate
+        return hashlib.sha256(upstream.encode("utf-8")).hexdigest()[:32]
+    return f"{random.getrandbits(128):032x}"
+
+
+def upstream_request_id(scope: dict) -> Optional[str]:
+    """Find the caller's request identifier in an ASGI scope."""
+    event = scope.get("aws.event")
+    if isinstance(event, dict):
+        request_id = (event.get("requestContext") or {}).get("requestId")
+        if request_id:
+            return request_id
+    for name, value in scope.get("headers") or ():
+        if name == b"x-amzn-trace-id":
+            match = _AMZN_ROOT.search(value.decode("latin-1"))
+            if match:
+                return match.group(1) + match.group(2)
+        elif name == b"traceparent":
+            parts = value.decode("latin-1").split("-")
+            if len(parts) == 4:
+                return parts[1]
+    return None
+
+
+def active() -> bool:
+    """Whether the current request is being traced."""
+    return _trace.get() is not None
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _trace.get()
+    return trace.trace_id if trace else None
+
+
+@contextmanager
+def start_trace(name: str, trace_id: str, **attributes):
+    """Open the root span of a sampled trace; export it when it closes."""
+    trace = Trace(trace_id)
+    root = Span(name, _new_span_id(), None, time.time_ns(), attributes=attributes)
+    trace.spans.append(root)
+    trace_token = _trace.set(trace)
+    span_token = _span.set(root)
+    try:
+        yield root
+    except BaseException as exc:
+        root.error = type(exc).__name__
+        raise
+    finally:
+        root.end_ns = time.time_ns()
+        _span.reset(span_token)
+        _trace.reset(trace_token)
+        if _exporter is not None:
+            _exporter.export(trace)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a block as a child of the current span (no-op when unsampled)."""
+    trace = _trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _span.get()
+    current = Span(name, _new_span_id(), parent.span_id if parent else None, time.time_ns(), attributes=attributes)
+    trace.spans.append(current)
+    token = _span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = type(exc).__name__
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _span.reset(token)
+
+
+def record_span(name: str, start_ns: int, end_ns: Optional[int] = None, **attributes) -> None:
+    """Add an already-measured interval (e.g. a queue wait) as a child span."""
+    trace = _trace.get()
+    if trace is None:
+        return
+    parent = _span.get()
+    trace.spans.append(
+        Span(name, _new_span_id(), parent.span_id if parent else None, start_ns,
+             end_ns or time.time_ns(), attributes=attributes)
+    )
+
+
+def set_attribute(key: str, value) -> None:
+    current = _span.get()
+    if current is not None and _trace.get() is not None:
+        current.attributes[key] = value
+
+
+def mark_route_start() -> None:
+    """Remember when routing handed the request to FastAPI (see ``TracedRoute``)."""
+    _route_start.set(time.time_ns())
+
+
+def route_start_ns() -> int:
+    return _route_start.get()
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def trace_to_dict(trace: Trace) -> dict:
+    """Plain JSON form used by the file exporter."""
+    return {
+        "trace_id": trace.trace_id,
+        "spans": [
+            {
+                "name": s.name,
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "start_ns": s.start_ns,
+                "duration_ms": round(s.duration_ms, 3),
+                "attributes": s.attributes,
+                **({"error": s.error} if s.error else {}),
+            }
+            for s in trace.spans
+        ],
+    }
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def traces_to_otlp(traces: List[Trace]) -> dict:
+    """Encode traces as an OTLP/HTTP JSON ``ExportTraceServiceRequest``."""
+    spans = []
+    for trace in traces:
+        for s in trace.spans:
+            spans.append(
+                {
+                    "traceId": trace.trace_id,
+                    "spanId": s.span_id,
+                    **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                    "name": s.name,
+                    "kind": 1 if s.parent_id else 2,  # INTERNAL / SERVER
+                    "startTimeUnixNano": str(s.start_ns),
+                    "endTimeUnixNano": str(s.end_ns),
+                    "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                    "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+                }
+            )
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class BatchExporter:
+    """Queue finished traces and write them from a background thread."""
+
+    def __init__(self, max_batch: int = 256, interval_s: float = 1.0, max_queue: int = 10_000):
+        self.max_batch = max_batch
+        self.interval_s = interval_s
+        self.dropped = 0
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> List[Trace]:
+        batch = []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self) -> None:
+        """Write everything queued so far (Lambda calls this per invocation)."""
+        with self._lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return
+                try:
+                    self.write(batch)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Trace export failed (%d traces): %s", len(batch), exc)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval_s)
+            self.flush()
+
+    def write(self, traces: List[Trace]) -> None:
+        raise NotImplementedError
+
+
+class JSONFileExporter(BatchExporter):
+    """Append one JSON line per trace to a local file."""
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        super().__init__(**kwargs)
+
+    def write(self, traces: List[Trace]) -> None:
+        with open(self.path, "a", encoding="utf-8") as fh:
+            for trace in traces:
+                fh.write(json.dumps(trace_to_dict(trace)) + "\n")
+
+
+class OTLPExporter(BatchExporter):
+    """POST OTLP/HTTP JSON to a collector."""
+
+    def __init__(self, endpoint: str, timeout_s: float = 2.0, **kwargs):
+        self.endpoint = endpoint
+        self.timeout_s = timeout_s
+        super().__init__(**kwargs)
+
+    def write(self, traces: List[Trace]) -> None:
+        body = json.dumps(traces_to_otlp(traces)).encode("utf-8")
+        request = urllib.request.Request(
+            self.endpoint, data=body, method="POST", headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout_s) as response:
+            response.read()
+
+
+def configure(settings) -> None:
+    """Install the exporter selected by ``settings`` (once per process)."""
+    global _exporter
+    if _exporter is not None:
+        return
+    if settings.trace_exporter == "otlp":
+        _exporter = OTLPExporter(settings.trace_otlp_endpoint)
+    elif settings.trace_exporter == "json":
+        _exporter = JSONFileExporter(settings.trace_file)
+
+
+def flush() -> None:
+    if _exporter is not None:
+        _exporter.flush()
+
+
+# ---------------------------------------------------------------------------
+# ASGI integration
+# ---------------------------------------------------------------------------
+
+class TracingMiddleware:
+    """Outermost middleware: head-sample and open the request's root span."""
+
+    def __init__(self, app, sample_rate: float):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        upstream = upstream_request_id(scope)
+        trace_id = trace_id_from(upstream)
+        attributes = {"http.method": scope["method"], "http.target": scope["path"]}
+        if upstream:
+            attributes["upstream.request_id"] = upstream
+        context = scope.get("aws.context")
+        if context is not None:
+            attributes["faas.invocation_id"] = getattr(context, "aws_request_id", "")
+
+        async def send_with_trace_id(message):
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-trace-id", trace_id.encode())]
+            await send(message)
+
+        with start_trace(f"{scope['method']} {scope['path']}", trace_id, **attributes) as root:
+            await self.app(scope, receive, send_with_trace_id)
+
+
+class TracedMiddleware:
+    """Wrap another middleware so its (inclusive) time shows up as a span."""
+
+    def __init__(self, app, wrapped, span_name: str, **options):
+        self.inner = wrapped(app, **options)
+        self.span_name = span_name
+
+    async def __call__(self, scope, receive, send):
+        if _trace.get() is None:
+            await self.inner(scope, receive, send)
+            return
+        with span(self.span_name):
+            await self.inner(scope, receive, send)
+
+
+def _trace_endpoint(endpoint: Callable, name: str) -> Callable:
+    """Wrap an async endpoint: span the time since routing started (request
+    parsing and validation) and the endpoint body separately."""
+
+    @functools.wraps(endpoint)
+    async def traced(*args, **kwargs):
+        if _trace.get() is None:
+            return await endpoint(*args, **kwargs)
+        if route_start_ns():
+            record_span("validate", route_start_ns())
+        with span(name):
+            return await endpoint(*args, **kwargs)
+
+    return traced
+
+
+class TracedRoute(APIRoute):
+    """``APIRoute`` that spans routing, validation and the endpoint itself.
+
+    Use as ``APIRouter(route_class=TracedRoute)``. Untraced requests go
+    straight through.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _trace_endpoint(endpoint, f"endpoint {endpoint.__name__}")
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        span_name = f"route {','.join(sorted(self.methods))} {self.path}"
+
+        async def traced_handler(request):
+            if _trace.get() is None:
+                return await handler(request)
+            with span(span_name):
+                mark_route_start()
+                return await handler(request)
+
+        return traced_handler
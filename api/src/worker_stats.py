@@ -0,0 +1,120 @@
+"""Per-worker request statistics for multi-process deployments.
+
+Each worker counts the requests it serves and periodically publishes a JSON
+snapshot to ``LANDING_API_WORKER_STATS_DIR`` (one file per PID), so any
+worker can answer ``/health/workers`` for the whole pool. Without a stats
+directory (single-process uvicorn, Lambda) only the current process is
+reported.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Minimum seconds between snapshot writes per worker
+PUBLISH_INTERVAL = 1.0
+
+
+class WorkerStats:
+    """Request counters for the current process."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.started_at = time.time()
+        self.requests = 0
+        self.in_flight = 0
+        self.errors = 0
+        self.last_request_at: Optional[float] = None
+        self._last_publish = 0.0
+        self._publish_scheduled = False
+
+    def snapshot(self) -> dict:
+        return {
+            "pid": self.pid,
+            "started_at": round(self.started_at, 3),
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "errors": self.errors,
+            "last_request_at": round(self.last_request_at, 3) if self.last_request_at else None,
+        }
+
+    def reset_after_fork(self) -> None:
+        """Start fresh counters in a forked worker (``preload_app``)."""
+        self.__init__()
+
+    def publish(self, force: bool = False) -> None:
+        stats_dir = os.getenv("LANDING_API_WORKER_STATS_DIR")
+        if not stats_dir:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_publish < PUBLISH_INTERVAL:
+            # Throttled: make sure the latest counters still land on disk
+            if not self._publish_scheduled:
+                self._publish_scheduled = True
+                asyncio.get_running_loop().call_later(PUBLISH_INTERVAL, self.publish, True)
+            return
+        self._publish_scheduled = False
+        self._last_publish = now
+        path = Path(stats_dir) / f"{self.pid}.json"
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(self.snapshot()))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+
+stats = WorkerStats()
+
+
+def collect() -> List[dict]:
+    """Return snapshots for every live worker (or just this process)."""
+    stats.publish(force=True)
+    stats_dir = os.getenv("LANDING_API_WORKER_STATS_DIR")
+    if not stats_dir:
+        return [stats.snapshot()]
+    snapshots = []
+    for path in sorted(Path(stats_dir).glob("*.json")):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+class WorkerStatsMiddleware:
+    """ASGI middleware counting requests served by this process."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if stats.pid != os.getpid():
+            stats.reset_after_fork()
+
+        stats.in_flight += 1
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stats.in_flight -= 1
+            stats.requests += 1
+            stats.last_request_at = time.time()
+            if status >= 500:
+                stats.errors += 1
+            stats.publish()
@@ -0,0 +1,68 @@
+"""Gunicorn worker classes and pool sizing for the ECS deployment."""
+
+import math
+import os
+from pathlib import Path
+
+try:
+    from uvicorn_worker import UvicornWorker
+except ImportError:  # pragma: no cover - older images bundle it with uvicorn
+    from uvicorn.workers import UvicornWorker
+
+import tls
+
+
+def _cgroup_cpu_limit():
+    """Return the container CPU quota in cores, or None when unlimited."""
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1
+    try:
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring container quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - non-Linux
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, math.ceil(limit)))
+    return cpus
+
+
+def worker_count() -> int:
+    """Worker processes to run: explicit override, else CPUs × per-core factor."""
+    explicit = os.getenv("LANDING_API_WORKERS") or os.getenv("WEB_CONCURRENCY")
+    if explicit:
+        return max(1, int(explicit))
+    per_core = float(os.getenv("LANDING_API_WORKERS_PER_CORE", "1"))
+    return max(1, int(available_cpus() * per_core))
+
+
+class LandingUvicornWorker(UvicornWorker):
+    """Uvicorn worker pinned to the uvloop event loop and httptools parser.
+
+    TLS uses the shared context from ``tls.server_context()`` (profile
+    ciphers, session tickets) instead of uvicorn's default context.
+    """
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.cfg.is_ssl:
+            self.config.ssl_context_factory = tls.uvicorn_context_factory
@@ -0,0 +1,11 @@
+"""Shared test setup: the service modules import each other from ``src/``."""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+# Never reach out to Secrets Manager from a test run
+os.environ["LANDING_API_CONFIG_SECRET_NAME"] = ""
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if API_DIR not in sys.path:
+    sys.path.insert(0, API_DIR)
+
+import circuit_breaker  # noqa: E402
+from async_smtp import AsyncSMTP, SMTPError  # noqa: E402
+from config import Settings  # noqa: E402
+from loadtest.smtp_sink import SinkConfig, SMTPSink  # noqa: E402
+from routers import contact  # noqa: E402
+
+MESSAGE = b"Subject: hi\r\n\r\nhello\r\n.leading dot\r\n"
+
+
+async def deliver(sink, recipients=("to@example.com",)):
+    async with AsyncSMTP("127.0.0.1", sink.port, local_hostname="client.test") as client:
+        await client.ehlo()
+        await client.sendmail("from@example.com", list(recipients), MESSAGE)
+        await client.quit()
+    return client
+
+
+async def test_pipelined_dialogue_batches_the_envelope():
+    async with SMTPSink() as sink:
+        client = await deliver(sink, ["a@example.com", "b@example.com"])
+    assert client.supports("PIPELINING")
+    # EHLO, envelope (MAIL + 2 RCPT + DATA), body, QUIT
+    assert client.round_trips == 4
+    assert sink.stats.messages == 1
+
+
+async def test_dialogue_without_pipelining_sends_one_command_at_a_time():
+    async with SMTPSink(config=SinkConfig(pipelining=False)) as sink:
+        client = await deliver(sink, ["a@example.com", "b@example.com"])
+    assert not client.supports("PIPELINING")
+    # EHLO, MAIL, RCPT, RCPT, DATA, body, QUIT
+    assert client.round_trips == 7
+    assert sink.stats.messages == 1
+
+
+@pytest.mark.parametrize("pipelining", [True, False])
+async def test_rejected_recipient_delivers_nothing(pipelining):
+    config = SinkConfig(pipelining=pipelining, rejected_recipients=("bad@example.com",))
+    async with SMTPSink(config=config) as sink:
+        with pytest.raises(SMTPError) as excinfo:
+            await deliver(sink, ["good@example.com", "bad@example.com"])
+        await asyncio.sleep(0.05)
+    assert excinfo.value.code == 550
+    assert excinfo.value.command == "RCPT"
+    assert sink.stats.messages == 0
+
+
+async def test_quit_is_best_effort():
+    async def server(reader, writer):
+        writer.write(b"220 test\r\n")
+        await reader.readline()
+        writer.write(b"250 test\r\n")
+        await reader.readline()
+        writer.write(b"421 going away\r\n")
+        await writer.drain()
+        writer.close()
+
+    listener = await asyncio.start_server(server, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        client = AsyncSMTP("127.0.0.1", port, local_hostname="client.test")
+        await client.connect()
+        await client.ehlo()
+        await client.quit()
+    assert client._writer is None
+
+
+async def test_contact_delivery_over_the_asyncio_transport(monkeypatch):
+    async with SMTPSink() as sink:
+        settings = Settings(
+            smtp_transport="asyncio",
+            smtp_host="127.0.0.1",
+            smtp_port=sink.port,
+            smtp_use_tls=False,
+        )
+        monkeypatch.setattr(circuit_breaker, "_breakers", {})
+        monkeypatch.setattr(contact, "get_settings", lambda: settings)
+        await contact._send_contact_email("Ada", "+15550100")
+    assert sink.stats.messages == 1
+    assert contact.smtp_breaker().snapshot()["consecutive_failures"] == 0
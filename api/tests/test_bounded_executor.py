@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import pytest
+
+import bounded_executor
+from bounded_executor import BoundedExecutor
+from exceptions import ConcurrencyLimitError
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor("test", workers=1, queue_size=2)
+    yield executor
+    executor._pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+async def test_runs_with_the_callers_context(executor):
+    assert await executor.run(lambda a, b=0: a + b, 2, b=3) == 5
+
+
+async def test_rejects_beyond_workers_plus_queue(executor):
+    gate = threading.Event()
+    tasks = [asyncio.ensure_future(executor.run(gate.wait)) for _ in range(3)]
+    await wait_until(lambda: executor.running == 1)
+    assert executor.snapshot()["queued"] == 2
+    with pytest.raises(ConcurrencyLimitError):
+        await executor.run(gate.wait)
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert executor.snapshot() == {"workers": 1, "queue_size": 2, "running": 0, "queued": 0}
+
+
+async def test_timed_out_calls_release_their_slots(executor):
+    # Cancelled while queued (asyncio.wait_for, as the contact route does):
+    # the call never runs, but its slot must still come back
+    gate = threading.Event()
+    for _ in range(3):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(executor.run(gate.wait), timeout=0.01)
+    gate.set()
+    await wait_until(lambda: executor._admitted == 0)
+    assert executor.snapshot()["queued"] == 0
+    assert executor.snapshot()["running"] == 0
+    for _ in range(3):
+        assert await executor.run(lambda: "ok") == "ok"
+
+
+async def test_slot_is_held_until_running_work_finishes(executor):
+    gate = threading.Event()
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(executor.run(gate.wait), timeout=0.05)
+    # Already on the thread, so it cannot be cancelled and still counts
+    assert executor.running == 1
+    assert executor._admitted == 1
+    gate.set()
+    await wait_until(lambda: executor._admitted == 0)
+
+
+async def test_exceptions_propagate_and_release(executor):
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await executor.run(boom)
+    await wait_until(lambda: executor._admitted == 0)
+
+
+def test_get_resizes_the_named_executor(monkeypatch):
+    monkeypatch.setattr(bounded_executor, "_executors", {})
+    first = bounded_executor.get("delivery", workers=2, queue_size=4)
+    assert bounded_executor.get("delivery") is first
+    bounded_executor.get("delivery", workers=3, queue_size=1)
+    assert (first.workers, first.queue_size, first.capacity) == (3, 1, 4)
+    first._pool.shutdown(wait=True)
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from config import Settings
+from exceptions import CircuitOpenError, ConcurrencyLimitError
+from routers import contact
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+
+def test_success_resets_the_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_open_circuit_reports_retry_after(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 10
+    assert breaker.retry_after() == pytest.approx(20)
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.allow()
+    assert excinfo.value.headers["Retry-After"] == "20"
+
+
+def test_half_open_admits_one_probe_and_closes_on_success(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.allow()
+
+
+def test_half_open_probe_failure_reopens(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == pytest.approx(30)
+
+
+def test_abandon_frees_the_probe_slot(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+    breaker.abandon()
+    breaker.allow()
+
+
+@pytest.mark.parametrize("exc_type", [ConcurrencyLimitError, asyncio.CancelledError, KeyboardInterrupt])
+def test_context_manager_does_not_count_calls_that_never_ran(breaker, exc_type):
+    for _ in range(5):
+        with pytest.raises(exc_type):
+            with breaker:
+                raise exc_type()
+    assert breaker.snapshot()["consecutive_failures"] == 0
+    assert breaker.state == CLOSED
+
+
+def test_context_manager_counts_exceptions_as_failures(breaker):
+    for _ in range(3):
+        with pytest.raises(OSError):
+            with breaker:
+                raise OSError("connection refused")
+    assert breaker.state == OPEN
+
+
+def test_get_retunes_without_resetting_state(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    breaker = circuit_breaker.get("smtp", failure_threshold=2, reset_timeout=5)
+    breaker.record_failure()
+    assert circuit_breaker.get("smtp", failure_threshold=4) is breaker
+    assert breaker.failure_threshold == 4
+    assert breaker.snapshot()["consecutive_failures"] == 1
+
+
+class HangingExecutor:
+    async def run(self, func, *args, **kwargs):
+        await asyncio.sleep(60)
+
+
+@pytest.fixture
+def smtp_breaker(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(contact, "get_settings", lambda: Settings(smtp_deadline=0.05))
+    monkeypatch.setattr(contact, "delivery_executor", HangingExecutor)
+    return contact.smtp_breaker()
+
+
+async def test_cancelled_delivery_is_not_an_smtp_failure(smtp_breaker):
+    task = asyncio.ensure_future(contact._send_contact_email("Ada", "+15550100"))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert smtp_breaker.snapshot()["consecutive_failures"] == 0
+
+
+async def test_delivery_deadline_counts_as_an_smtp_failure(smtp_breaker):
+    with pytest.raises(asyncio.TimeoutError):
+        await contact._send_contact_email("Ada", "+15550100")
+    assert smtp_breaker.snapshot()["consecutive_failures"] == 1
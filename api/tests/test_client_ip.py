@@ -0,0 +1,61 @@
+import pytest
+
+import client_ip
+from client_ip import UNKNOWN, TrustedProxies
+from config import Settings
+
+ALB = TrustedProxies(["10.0.0.0/16"])
+
+
+@pytest.mark.parametrize(
+    "peer, forwarded_for, expected",
+    [
+        # Untrusted peer: the header could be forged, the peer is the client
+        ("203.0.113.9", "1.2.3.4", "203.0.113.9"),
+        # Through the ALB: right-most untrusted hop, not the spoofable left-most
+        ("10.0.1.5", "6.6.6.6, 198.51.100.7", "198.51.100.7"),
+        # Several trusted hops are skipped
+        ("10.0.1.5", "198.51.100.7, 10.0.2.2, 10.0.3.3", "198.51.100.7"),
+        # Every hop trusted: the furthest one we can see
+        ("10.0.1.5", "10.0.9.9, 10.0.2.2", "10.0.9.9"),
+        # Trusted peer without the header
+        ("10.0.1.5", None, "10.0.1.5"),
+        ("10.0.1.5", " , ", "10.0.1.5"),
+        # Garbage is never trusted, so it is what gets blamed
+        ("10.0.1.5", "198.51.100.7, not-an-ip", "not-an-ip"),
+        (None, "198.51.100.7", UNKNOWN),
+    ],
+)
+def test_client_ip_behind_trusted_proxies(peer, forwarded_for, expected):
+    assert ALB.client_ip(peer, forwarded_for) == expected
+
+
+def test_trust_all_takes_the_left_most_hop():
+    assert TrustedProxies(["*"]).client_ip("203.0.113.9", "1.2.3.4, 5.6.7.8") == "1.2.3.4"
+
+
+def test_no_trusted_proxies_ignores_the_header():
+    assert TrustedProxies([]).client_ip("203.0.113.9", "1.2.3.4") == "203.0.113.9"
+
+
+def test_ipv6_networks():
+    proxies = TrustedProxies(["2001:db8::/32", "10.0.0.1"])
+    assert "2001:db8::1" in proxies
+    assert "10.0.0.1" in proxies
+    assert "10.0.0.2" not in proxies
+    assert proxies.client_ip("2001:db8::1", "2001:db9::7") == "2001:db9::7"
+
+
+@pytest.fixture
+def trusted(monkeypatch):
+    monkeypatch.setattr(client_ip, "get_settings", lambda: Settings(trusted_proxies=["10.0.0.0/16"]))
+
+
+def test_from_scope_joins_repeated_headers(trusted):
+    scope = {
+        "client": ("10.0.1.5", 43210),
+        "headers": [(b"x-forwarded-for", b"6.6.6.6"), (b"x-forwarded-for", b"198.51.100.7, 10.0.2.2")],
+    }
+    assert client_ip.from_scope(scope) == "198.51.100.7"
+    assert client_ip.from_scope({"headers": []}) == UNKNOWN
+
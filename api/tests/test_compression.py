@@ -0,0 +1,138 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+import compression
+from compression import CompressionMiddleware, is_compressible, negotiate_encoding
+
+BIG = {"items": [{"id": i, "status": "SUCCEEDED"} for i in range(200)]}
+
+
+@pytest.mark.parametrize(
+    "header, available, expected",
+    [
+        ("", ["br", "gzip"], None),
+        ("gzip", ["br", "gzip"], "gzip"),
+        ("gzip, br", ["br", "gzip"], "br"),  # ties go to the server's preference
+        ("br;q=0.5, gzip;q=0.8", ["br", "gzip"], "gzip"),
+        ("gzip;q=0", ["br", "gzip"], None),
+        ("*", ["br", "gzip"], "br"),
+        ("*;q=0.1, br;q=0", ["br", "gzip"], "gzip"),
+        ("identity", ["br", "gzip"], None),
+        ("br", ["gzip"], None),
+        ("GZIP ; q=1", ["gzip"], "gzip"),
+        ("gzip;q=bogus", ["gzip"], None),
+    ],
+)
+def test_negotiate_encoding(header, available, expected):
+    assert negotiate_encoding(header, available) == expected
+
+
+@pytest.mark.parametrize(
+    "content_type, expected",
+    [
+        ("application/json", True),
+        ("text/html; charset=utf-8", True),
+        ("image/svg+xml", True),
+        ("image/png", False),
+        ("font/woff2", False),
+        ("", False),
+    ],
+)
+def test_is_compressible(content_type, expected):
+    assert is_compressible(content_type) is expected
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/big")
+    async def big():
+        return BIG
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/png")
+    async def png():
+        return Response(b"\x89PNG" + b"\0" * 4096, media_type="image/png")
+
+    @app.get("/encoded")
+    async def encoded():
+        body = gzip.compress(b"x" * 4096)
+        return Response(body, media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(50):
+                yield f"line {i} ".encode() * 20
+
+        return StreamingResponse(chunks(), media_type="text/plain", headers={"Content-Length": "1"})
+
+    @app.get("/vary")
+    async def vary():
+        return PlainTextResponse("v" * 4096, headers={"Vary": "Origin"})
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def test_large_json_is_gzipped(client):
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(str(BIG))
+    assert response.json() == BIG
+
+
+def test_brotli_preferred_when_installed(client):
+    pytest.importorskip("brotli")
+    response = client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == BIG
+
+
+def test_gzip_only_without_brotli(client, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response = client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_small_bodies_are_sent_as_is_but_vary(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"ok": True}
+
+
+def test_no_accept_encoding_is_untouched(client):
+    response = client.get("/big", headers={"Accept-Encoding": ""})
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+
+@pytest.mark.parametrize("path", ["/png", "/encoded"])
+def test_incompressible_or_encoded_responses_pass_through(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert response.headers.get("content-encoding") == ("gzip" if path == "/encoded" else None)
+    assert "vary" not in response.headers
+    if path == "/encoded":
+        assert response.content == b"x" * 4096  # decoded once, not twice
+
+
+def test_streaming_bodies_are_compressed_incrementally(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "".join(f"line {i} " * 20 for i in range(50))
+
+
+def test_existing_vary_is_extended(client):
+    response = client.get("/vary", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["vary"] == "Origin, Accept-Encoding"
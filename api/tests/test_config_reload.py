@@ -0,0 +1,183 @@
+import gc
+import os
+import threading
+
+import pytest
+
+import config
+import env_loader
+from config import Settings
+
+KEYS = ("LANDING_API_TEST_FILE_ONLY", "LANDING_API_TEST_SYSTEM", "LANDING_API_TEST_ADDED")
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    path = tmp_path / "test.env"
+    monkeypatch.setattr(env_loader, "env_file_path", lambda environment=None: path)
+    monkeypatch.setattr(env_loader, "_file_values", {})
+    saved = {key: os.environ.pop(key, None) for key in KEYS}
+    yield path
+    for key, value in saved.items():
+        os.environ.pop(key, None)
+        if value is not None:
+            os.environ[key] = value
+
+
+def test_reload_keeps_system_env_and_drops_removed_keys(env_file, monkeypatch):
+    env_file.write_text("LANDING_API_TEST_FILE_ONLY=1\nLANDING_API_TEST_SYSTEM=file\n", encoding="utf-8")
+    monkeypatch.setenv("LANDING_API_TEST_SYSTEM", "system")
+    env_loader.load_environment_config()
+    assert os.environ["LANDING_API_TEST_FILE_ONLY"] == "1"
+    assert os.environ["LANDING_API_TEST_SYSTEM"] == "system"
+
+    env_file.write_text(
+        "LANDING_API_TEST_FILE_ONLY=2\nLANDING_API_TEST_SYSTEM=changed\nLANDING_API_TEST_ADDED=3\n", encoding="utf-8"
+    )
+    env_loader.load_environment_config(reload=True)
+    assert os.environ["LANDING_API_TEST_FILE_ONLY"] == "2"
+    assert os.environ["LANDING_API_TEST_SYSTEM"] == "system"
+    assert os.environ["LANDING_API_TEST_ADDED"] == "3"
+
+    env_file.write_text("LANDING_API_TEST_SYSTEM=changed\n", encoding="utf-8")
+    env_loader.load_environment_config(reload=True)
+    assert "LANDING_API_TEST_FILE_ONLY" not in os.environ
+    assert "LANDING_API_TEST_ADDED" not in os.environ
+    assert os.environ["LANDING_API_TEST_SYSTEM"] == "system"
+
+
+def test_reload_leaves_file_keys_the_system_env_took_over(env_file):
+    env_file.write_text("LANDING_API_TEST_FILE_ONLY=1\n", encoding="utf-8")
+    env_loader.load_environment_config()
+    os.environ["LANDING_API_TEST_FILE_ONLY"] = "set by hand"
+    env_file.write_text("LANDING_API_TEST_FILE_ONLY=2\n", encoding="utf-8")
+    env_loader.load_environment_config(reload=True)
+    assert os.environ["LANDING_API_TEST_FILE_ONLY"] == "set by hand"
+
+
+@pytest.fixture
+def settings_state(monkeypatch):
+    current = Settings(rate_limit=10)
+    monkeypatch.setattr(config, "_settings", current)
+    monkeypatch.setattr(config, "_loaded_at", 0.0)
+    monkeypatch.setattr(config, "_subscribers", [])
+    monkeypatch.setattr(config, "_refreshing", False)
+    return current
+
+
+def test_reload_swaps_settings_and_notifies_subscribers(settings_state, monkeypatch):
+    replacement = Settings(rate_limit=20)
+    monkeypatch.setattr(config, "_load_settings", lambda: replacement)
+    calls = []
+    config.subscribe(lambda old, new: calls.append((old, new)))
+
+    assert config.reload_settings() is replacement
+    assert config.get_settings() is replacement
+    assert calls == [(settings_state, replacement)]
+
+
+def test_failed_reload_keeps_the_current_settings(settings_state, monkeypatch):
+    def invalid():
+        return Settings(log_level="LOUD")
+
+    monkeypatch.setattr(config, "_load_settings", invalid)
+    calls = []
+    config.subscribe(lambda old, new: calls.append(new))
+    assert config.reload_settings() is settings_state
+    assert config.get_settings() is settings_state
+    assert calls == []
+
+
+def test_subscriber_errors_do_not_stop_the_others(settings_state, monkeypatch):
+    monkeypatch.setattr(config, "_load_settings", lambda: Settings(rate_limit=20))
+    calls = []
+
+    def broken(old, new):
+        raise RuntimeError("boom")
+
+    config.subscribe(broken)
+    config.subscribe(lambda old, new: calls.append(new.rate_limit))
+    config.reload_settings()
+    assert calls == [20]
+
+
+def test_bound_method_subscribers_are_held_weakly(settings_state, monkeypatch):
+    monkeypatch.setattr(config, "_load_settings", lambda: Settings(rate_limit=20))
+
+    class Component:
+        seen = []
+
+        def on_reload(self, old, new):
+            self.seen.append(new.rate_limit)
+
+    component = Component()
+    config.subscribe(component.on_reload)
+    config.reload_settings()
+    del component
+    gc.collect()
+    config.reload_settings()
+    assert Component.seen == [20]
+    assert config._subscribers == []
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(config.time, "monotonic", clock)
+    current = Settings(settings_ttl_seconds=300)
+    monkeypatch.setattr(config, "_settings", current)
+    monkeypatch.setattr(config, "_loaded_at", clock.now)
+    monkeypatch.setattr(config, "_subscribers", [])
+    monkeypatch.setattr(config, "_refreshing", False)
+    return clock
+
+
+def test_stale_settings_refresh_in_the_background(ttl, monkeypatch):
+    current = config.get_settings()
+    replacement = Settings(settings_ttl_seconds=300, rate_limit=20)
+    release = threading.Event()
+    loads = []
+
+    def slow_load():
+        loads.append(1)
+        release.wait(5)
+        return replacement
+
+    monkeypatch.setattr(config, "_load_settings", slow_load)
+    assert config.get_settings() is current  # fresh: no reload
+    ttl.now += 301
+    assert config.settings_stale()
+    # Stale: callers keep the current settings while one thread reloads
+    assert config.get_settings() is current
+    assert config.get_settings() is current
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "settings-refresh":
+            thread.join(5)
+    assert loads == [1]
+    assert config.get_settings() is replacement
+    assert config._refreshing is False
+    assert not config.settings_stale()
+
+
+def test_refresh_if_stale_blocks_only_when_expired(ttl, monkeypatch):
+    replacement = Settings(settings_ttl_seconds=300, rate_limit=20)
+    monkeypatch.setattr(config, "_load_settings", lambda: replacement)
+    assert config.refresh_if_stale() is False
+    ttl.now += 300
+    assert config.refresh_if_stale() is True
+    assert config.get_settings() is replacement
+
+
+def test_no_ttl_never_goes_stale(settings_state, monkeypatch):
+    monkeypatch.setattr(config.time, "monotonic", lambda: 10.0 ** 9)
+    assert not config.settings_stale()
+    assert config.refresh_if_stale() is False
@@ -0,0 +1,81 @@
+import json
+import sqlite3
+
+import pytest
+
+import form_handler
+import lead_store
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = []
+
+    def record(name, phone, source, origin=None, strict=False):
+        calls.append((name, phone, source, origin))
+
+    monkeypatch.setattr(lead_store, "record", record)
+    return calls
+
+
+def sqs_event(*bodies):
+    return {
+        "Records": [
+            {"messageId": f"m{i}", "eventSource": "aws:sqs", "body": body, "messageAttributes": {}}
+            for i, body in enumerate(bodies)
+        ]
+    }
+
+
+def test_valid_batch_is_recorded(recorded):
+    event = sqs_event(json.dumps({"name": " Ada ", "phone": "+15550100"}), "name=Bob&phone=%2B15550101")
+    assert form_handler.handler(event, None) == {"batchItemFailures": []}
+    assert sorted(call[:3] for call in recorded) == [("Ada", "+15550100", "sqs"), ("Bob", "+15550101", "sqs")]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        json.dumps({"name": "Ada", "phone": 5550100}),
+        json.dumps({"name": ["Ada"], "phone": "+15550100"}),
+        json.dumps({"name": "Ada"}),
+        json.dumps(["Ada", "+15550100"]),
+        "{not json",
+    ],
+)
+def test_malformed_records_are_dropped_not_retried(recorded, body):
+    event = sqs_event(body, json.dumps({"name": "Ada", "phone": "+15550100"}))
+    assert form_handler.handler(event, None) == {"batchItemFailures": []}
+    assert len(recorded) == 1
+
+
+def test_store_failures_are_reported_for_retry(monkeypatch):
+    def record(name, phone, source, origin=None, strict=False):
+        assert strict
+        if name == "Bob":
+            raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(lead_store, "record", record)
+    event = sqs_event(json.dumps({"name": "Ada", "phone": "+1"}), json.dumps({"name": "Bob", "phone": "+2"}))
+    assert form_handler.handler(event, None) == {"batchItemFailures": [{"itemIdentifier": "m1"}]}
+
+
+def test_http_submission_with_non_string_field_is_a_400(recorded):
+    event = {
+        "httpMethod": "POST",
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps({"name": 42, "phone": "+15550100"}),
+    }
+    response = form_handler.handler(event, None)
+    assert response["statusCode"] == 400
+    assert recorded == []
+
+
+def test_http_submission_is_recorded(recorded):
+    event = {
+        "httpMethod": "POST",
+        "headers": {"content-type": "application/json", "origin": "https://example.com"},
+        "body": json.dumps({"name": "Ada", "phone": "+15550100"}),
+    }
+    assert form_handler.handler(event, None)["statusCode"] == 200
+    assert recorded == [("Ada", "+15550100", "form_handler", "https://example.com")]
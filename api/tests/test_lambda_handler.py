@@ -0,0 +1,99 @@
+import asyncio
+import importlib
+import json
+import os
+import signal
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+EVENTS_DIR = os.path.join(API_DIR, "benchmarks", "events")
+CONTEXT = SimpleNamespace(aws_request_id="test-request")
+
+
+@pytest.fixture(scope="module")
+def handler_module():
+    with pytest.MonkeyPatch.context() as patch:
+        patch.syspath_prepend(API_DIR)
+        # No config/<env>.env for this environment, so nothing leaks into os.environ
+        patch.setenv("ENVIRONMENT", "unit-test")
+        patch.setenv("LANDING_API_APP_PROFILE", "lambda-minimal")
+        patch.setenv("LANDING_API_SMTP_HOST", "localhost")
+        sigterm = signal.getsignal(signal.SIGTERM)
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        try:
+            module = importlib.import_module("src.lambda_handler")
+        finally:
+            signal.signal(signal.SIGTERM, sigterm)
+        yield module
+    sys.modules.pop("src.lambda_handler", None)
+    sys.modules.pop("src.app", None)
+
+
+def load_event(name):
+    with open(os.path.join(EVENTS_DIR, name), encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def test_init_phase_runs_every_step_once(handler_module):
+    timings = handler_module.INIT_TIMINGS
+    for step in ("settings", "lead_store", "smtp_dns", "middleware_stack", "startup"):
+        assert f"{step}_ms" in timings
+    assert timings["total_ms"] >= timings["import_ms"]
+    assert handler_module._lifespan is not None
+    assert handler_module.app.middleware_stack is not None
+
+
+def test_run_startup_enters_the_lifespan_once(handler_module, monkeypatch):
+    calls = []
+    app = handler_module.app
+    monkeypatch.setattr(app.router, "on_startup", app.router.on_startup + [lambda: calls.append("startup")])
+    monkeypatch.setattr(handler_module, "_lifespan", None)
+    handler_module._run_startup()
+    assert calls == ["startup"]
+
+    # Requests go through Mangum with lifespan="off": startup does not run again
+    response = handler_module.handler(load_event("v1-get-health.json"), CONTEXT)
+    assert response["statusCode"] == 200
+    assert calls == ["startup"]
+
+
+@pytest.mark.parametrize(
+    "event, expected",
+    [
+        ({"warmup": True}, True),
+        ({"source": "serverless-plugin-warmup"}, True),
+        ({"source": "aws.events", "detail-type": "Scheduled Event"}, True),
+        ({"source": "aws.events", "detail-type": "EC2 Instance State-change Notification"}, False),
+        ({"httpMethod": "GET", "path": "/health"}, False),
+        ("not-a-dict", False),
+    ],
+)
+def test_is_warmup_event(handler_module, event, expected):
+    assert handler_module.is_warmup_event(event) is expected
+
+
+def test_warmup_short_circuits_fastapi(handler_module, monkeypatch):
+    def fail(event, context):
+        raise AssertionError("warmup reached Mangum")
+
+    refreshes = []
+    monkeypatch.setattr(handler_module, "mangum_handler", fail)
+    monkeypatch.setattr(handler_module, "refresh_if_stale", lambda: refreshes.append(1) or False)
+    monkeypatch.setattr(handler_module, "_cold_start", True)
+
+    first = handler_module.handler({"warmup": True}, CONTEXT)
+    second = handler_module.handler({"source": "aws.events", "detail-type": "Scheduled Event"}, CONTEXT)
+    assert first == {"warmup": True, "cold_start": True, "init_ms": handler_module.INIT_TIMINGS["total_ms"]}
+    assert second["cold_start"] is False
+    assert refreshes == [1, 1]
+
+
+def test_requests_after_warmup_are_not_cold(handler_module, monkeypatch):
+    monkeypatch.setattr(handler_module, "_cold_start", True)
+    handler_module.handler({"warmup": True}, CONTEXT)
+    response = handler_module.handler(load_event("v2-get-health.json"), CONTEXT)
+    assert response["statusCode"] == 200
+    assert handler_module._cold_start is False
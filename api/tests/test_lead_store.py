@@ -0,0 +1,203 @@
+import json
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import auth
+import lead_store
+from config import Settings
+from lead_store import DAY, HOUR, Lead, SQLiteLeadStore
+from routers import contact
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteLeadStore(str(tmp_path / "leads.db"))
+    yield store
+    store.close()
+
+
+def add(store, created_at, name="Ada", phone="+15550100", origin=None):
+    return store.add(Lead(name=name, phone=phone, created_at=created_at, origin=origin))
+
+
+def test_add_assigns_increasing_ids(store):
+    first = add(store, 100.0)
+    second = add(store, 50.0)
+    assert second > first
+    assert [lead.id for lead in store.page()] == [first, second]
+
+
+def test_submissions_are_append_only(store):
+    add(store, 100.0)
+    conn = store._connect()
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("UPDATE submissions SET name = 'x'")
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("DELETE FROM submissions")
+
+
+def test_iter_pages_walks_every_row_in_pages(store, monkeypatch):
+    monkeypatch.setattr(lead_store, "PAGE_SIZE", 3)
+    ids = [add(store, float(i)) for i in range(8)]
+    pages = list(store.iter_pages())
+    assert [len(page) for page in pages] == [3, 3, 2]
+    assert [lead.id for page in pages for lead in page] == ids
+
+
+def test_iter_pages_honours_limit_and_after_id(store, monkeypatch):
+    monkeypatch.setattr(lead_store, "PAGE_SIZE", 3)
+    ids = [add(store, float(i)) for i in range(8)]
+    leads = list(store.iter_leads(after_id=ids[1], limit=4))
+    assert [lead.id for lead in leads] == ids[2:6]
+
+
+def test_page_filters(store):
+    add(store, 10.0, phone="+1")
+    wanted = add(store, 20.0, phone="+2")
+    add(store, 30.0, phone="+2")
+    assert [lead.id for lead in store.page(since=15.0, until=30.0)] == [wanted]
+    assert [lead.created_at for lead in store.page(phone="+2")] == [20.0, 30.0]
+
+
+@pytest.fixture
+def configured(tmp_path, monkeypatch):
+    settings = Settings(lead_store_url=f"sqlite:///{tmp_path / 'leads.db'}")
+    monkeypatch.setattr(lead_store, "get_settings", lambda: settings)
+    monkeypatch.setattr(lead_store, "_store", None)
+    monkeypatch.setattr(lead_store, "_store_url", None)
+    yield settings
+    if lead_store._store is not None:
+        lead_store._store.close()
+
+
+def test_record_is_a_no_op_without_a_store(monkeypatch):
+    monkeypatch.setattr(lead_store, "get_settings", lambda: Settings())
+    monkeypatch.setattr(lead_store, "_store", None)
+    monkeypatch.setattr(lead_store, "_store_url", None)
+    assert lead_store.record("Ada", "+15550100", "api") is None
+
+
+def test_record_persists_through_the_configured_store(configured):
+    lead = lead_store.record("Ada", "+15550100", "form_handler", "https://example.com")
+    stored = lead_store.get_store().page()
+    assert [(row.id, row.source, row.origin) for row in stored] == [(lead.id, "form_handler", "https://example.com")]
+
+
+def test_record_swallows_failures_unless_strict(configured, monkeypatch):
+    def fail(lead):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(lead_store.get_store(), "add", fail)
+    assert lead_store.record("Ada", "+15550100", "api") is None
+    with pytest.raises(sqlite3.OperationalError):
+        lead_store.record("Ada", "+15550100", "api", strict=True)
+
+
+def test_unknown_scheme_is_rejected(monkeypatch):
+    monkeypatch.setattr(lead_store, "get_settings", lambda: Settings(lead_store_url="mongodb://x"))
+    monkeypatch.setattr(lead_store, "_store_url", None)
+    with pytest.raises(ValueError):
+        lead_store.get_store()
+
+
+# Rollups (a fixed midnight so bucket boundaries are easy to read)
+MIDNIGHT = 20000 * DAY
+
+
+def test_counts_per_hour_and_origin(store):
+    add(store, MIDNIGHT + 60, origin="https://a.example")
+    add(store, MIDNIGHT + 120, origin="https://b.example")
+    add(store, MIDNIGHT + HOUR + 5)
+    assert store.counts(MIDNIGHT, MIDNIGHT + DAY) == [
+        {"start": MIDNIGHT, "resolution": "hour", "count": 2},
+        {"start": MIDNIGHT + HOUR, "resolution": "hour", "count": 1},
+    ]
+    by_origin = store.counts(MIDNIGHT, MIDNIGHT + HOUR, by_origin=True)
+    assert [(row["origin"], row["count"]) for row in by_origin] == [("https://a.example", 1), ("https://b.example", 1)]
+
+
+def test_counts_per_day_fold_hours(store):
+    add(store, MIDNIGHT + 60)
+    add(store, MIDNIGHT + 5 * HOUR)
+    add(store, MIDNIGHT + DAY + 60)
+    assert store.counts(MIDNIGHT + HOUR, MIDNIGHT + DAY + 1, granularity="day") == [
+        {"start": MIDNIGHT, "resolution": "day", "count": 2},
+        {"start": MIDNIGHT + DAY, "resolution": "day", "count": 1},
+    ]
+
+
+def test_compact_folds_old_hours_into_days(store):
+    add(store, MIDNIGHT + 60)
+    add(store, MIDNIGHT + 5 * HOUR)
+    add(store, MIDNIGHT + DAY + 60)
+    assert store.compact(MIDNIGHT + DAY + HOUR) == 2
+    assert store.compact(MIDNIGHT + DAY + HOUR) == 0
+    assert store.counts(MIDNIGHT, MIDNIGHT + 2 * DAY) == [
+        {"start": MIDNIGHT, "resolution": "day", "count": 2},
+        {"start": MIDNIGHT + DAY, "resolution": "hour", "count": 1},
+    ]
+
+
+def test_hourly_counts_include_partly_overlapping_day_buckets(store):
+    add(store, MIDNIGHT + 2 * HOUR)
+    add(store, MIDNIGHT + 20 * HOUR)
+    add(store, MIDNIGHT + DAY + 3 * HOUR)
+    store.compact(MIDNIGHT + 2 * DAY)
+    # Both ends fall inside compacted days; neither day may be dropped
+    assert store.counts(MIDNIGHT + 12 * HOUR, MIDNIGHT + DAY + HOUR) == [
+        {"start": MIDNIGHT, "resolution": "day", "count": 2},
+        {"start": MIDNIGHT + DAY, "resolution": "day", "count": 1},
+    ]
+    assert store.counts(MIDNIGHT + DAY, MIDNIGHT + DAY + HOUR) == [
+        {"start": MIDNIGHT + DAY, "resolution": "day", "count": 1},
+    ]
+    assert store.counts(MIDNIGHT + 2 * DAY, MIDNIGHT + 3 * DAY) == []
+
+
+def test_rollups_are_backfilled_for_existing_stores(tmp_path):
+    path = str(tmp_path / "old.db")
+    store = SQLiteLeadStore(path)
+    add(store, MIDNIGHT + 60)
+    add(store, MIDNIGHT + 90)
+    store._connect().execute("DELETE FROM rollups")
+    store.close()
+
+    reopened = SQLiteLeadStore(path)
+    assert reopened.counts(MIDNIGHT, MIDNIGHT + HOUR) == [{"start": MIDNIGHT, "resolution": "hour", "count": 2}]
+    reopened.close()
+
+
+@pytest.fixture
+def leads_api(tmp_path, monkeypatch):
+    settings = Settings(lead_store_url=f"sqlite:///{tmp_path / 'leads.db'}", leads_export_token="secret-token")
+    for module in (lead_store, auth):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    monkeypatch.setattr(lead_store, "_store", None)
+    monkeypatch.setattr(lead_store, "_store_url", None)
+    app = FastAPI()
+    app.include_router(contact.router)
+    yield TestClient(app, headers={"Authorization": "Bearer secret-token"})
+    lead_store._store.close()
+
+
+def test_export_and_stats_are_encoded_on_the_fast_path(leads_api):
+    store = lead_store.get_store()
+    add(store, 2 * DAY + 60, name="Zoë", origin="https://a.example")
+    add(store, 2 * DAY + 120, phone="+15550101", origin="https://a.example")
+
+    export = leads_api.get("/contact/submissions")
+    assert export.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in export.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Zoë", "Ada"]
+    assert list(rows[0]) == ["id", "created_at", "name", "phone", "source", "origin"]
+    assert rows[0]["created_at"] == "1970-01-03T00:01:00+00:00"
+
+    window = {"since": "1970-01-01T00:00:00Z", "until": "1970-01-05T00:00:00Z"}
+    stats = leads_api.get("/contact/stats", params=window)
+    assert stats.headers["content-type"] == "application/json"
+    body = stats.json()
+    assert body["total"] == 2
+    assert body["buckets"] == [{"start": "1970-01-03T00:00:00+00:00", "resolution": "day", "count": 2}]
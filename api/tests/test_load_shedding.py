@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config import Settings
+from load_shedding import LoadSheddingMiddleware, LoopLagMonitor
+
+
+def make_shedder(**overrides):
+    app = FastAPI()
+
+    @app.get("/{path:path}")
+    async def echo(path: str):
+        return {"in_flight": shedder.in_flight}
+
+    options = {"load_shed_max_lag_ms": 250, "load_shed_max_in_flight": 0, "load_shed_retry_after": 7}
+    shedder = LoadSheddingMiddleware(app, Settings(**{**options, **overrides}))
+    # The tests set the lag themselves
+    shedder.monitor.ensure_started = lambda: None
+    return shedder
+
+
+@pytest.fixture
+def shedder():
+    return make_shedder()
+
+
+def test_requests_are_admitted_below_the_lag_threshold(shedder):
+    shedder.monitor.lag = 0.2
+    response = TestClient(shedder).get("/runs")
+    assert response.status_code == 200
+    assert response.json() == {"in_flight": 1}
+    assert shedder.in_flight == 0
+    assert shedder.shedding is None
+
+
+def test_requests_are_shed_over_the_lag_threshold(shedder):
+    shedder.monitor.lag = 0.3
+    response = TestClient(shedder).get("/runs")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "7"
+    assert response.json()["error"] == {
+        "code": "SERVER_OVERLOADED",
+        "message": "Server is overloaded, retry later",
+        "details": {"reason": "event_loop_lag"},
+    }
+    assert shedder.shedding == "event_loop_lag"
+
+    shedder.monitor.lag = 0.0
+    assert TestClient(shedder).get("/runs").status_code == 200
+    assert shedder.shedding is None
+
+
+@pytest.mark.parametrize("path", ["/health", "/health/detailed", "/contact", "/metrics"])
+def test_protected_routes_are_always_admitted(shedder, path):
+    shedder.monitor.lag = 10.0
+    assert TestClient(shedder).get(path).status_code == 200
+
+
+def test_protected_routes_match_whole_segments_under_a_root_path(shedder):
+    shedder.monitor.lag = 10.0
+    client = TestClient(shedder, root_path="/prod")
+    assert client.get("/prod/health").status_code == 200
+    assert client.get("/prod/healthz").status_code == 503
+
+
+def test_in_flight_threshold():
+    shedder = make_shedder(load_shed_max_lag_ms=0, load_shed_max_in_flight=2)
+    shedder.monitor.lag = 10.0  # the lag check is disabled
+    client = TestClient(shedder)
+    shedder.in_flight = 1
+    assert client.get("/runs").status_code == 200
+    shedder.in_flight = 2
+    response = client.get("/runs")
+    assert response.status_code == 503
+    assert response.json()["error"]["details"] == {"reason": "in_flight"}
+    assert shedder.in_flight == 2
+
+
+def test_settings_reload_moves_the_thresholds(shedder):
+    shedder.monitor.lag = 0.3
+    shedder._on_settings_reload(None, Settings(load_shed_max_lag_ms=500, load_shed_lag_interval_ms=50))
+    assert TestClient(shedder).get("/runs").status_code == 200
+    assert shedder.monitor.interval == 0.05
+
+
+async def test_lag_monitor_rises_at_once_and_decays():
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.ensure_started()
+    try:
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # block the loop
+        await asyncio.sleep(0.02)
+        peak = monitor.lag
+        assert peak >= 0.05
+        await asyncio.sleep(0.05)
+        assert monitor.lag < peak
+    finally:
+        monitor.stop()
@@ -0,0 +1,114 @@
+import gc
+import sys
+
+import pytest
+from fastapi import FastAPI
+
+import memory
+import middleware
+from config import Settings
+from middleware import RateLimitMiddleware
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(memory, "_registry", {})
+    return memory._registry
+
+
+class Cache:
+    def __init__(self, items):
+        self.items = dict(items)
+
+    def stats(self):
+        return len(self.items), memory.approximate_size(self.items.values())
+
+    def evict(self):
+        dropped = len(self.items)
+        self.items.clear()
+        return dropped
+
+
+def test_component_stats_report_entries_and_size():
+    cache = Cache({"a": "x" * 100, "b": "y" * 200})
+    memory.register("cache", cache.stats, cache.evict)
+    memory.register("counter", lambda: (3, 24))
+    size = sys.getsizeof("x" * 100) + sys.getsizeof("y" * 200)
+    assert memory.component_stats() == {
+        "cache": {"entries": 2, "approx_bytes": size, "evictable": True},
+        "counter": {"entries": 3, "approx_bytes": 24, "evictable": False},
+    }
+
+
+def test_register_replaces_and_unregister_removes():
+    memory.register("cache", lambda: (1, 10))
+    memory.register("cache", lambda: (2, 20))
+    assert memory.component_stats()["cache"]["entries"] == 2
+    memory.unregister("cache")
+    memory.unregister("cache")
+    assert memory.component_stats() == {}
+
+
+def test_failing_stats_are_reported_not_raised():
+    def broken():
+        raise RuntimeError("boom")
+
+    memory.register("broken", broken)
+    memory.register("ok", lambda: (1, 1))
+    stats = memory.component_stats()
+    assert stats["broken"] == {"error": "boom"}
+    assert stats["ok"]["entries"] == 1
+
+
+def test_collected_components_leave_the_registry(registry):
+    cache = Cache({"a": 1})
+    memory.register("cache", cache.stats, cache.evict)
+    del cache
+    gc.collect()
+    assert memory.component_stats() == {}
+    assert registry == {}
+
+
+def test_evict_all_skips_components_without_evict():
+    full = Cache({"a": 1, "b": 2})
+    memory.register("full", full.stats, full.evict)
+    memory.register("stats_only", lambda: (5, 50))
+
+    def broken():
+        raise RuntimeError("boom")
+
+    memory.register("broken", lambda: (0, 0), broken)
+    assert memory.evict_all("test") == {"full": 2}
+    assert full.items == {}
+
+
+@pytest.mark.parametrize("limit_mb, rss_mb, evicted", [(0, 1000, None), (100, 99, None), (100, 101, {"cache": 1})])
+def test_check_soft_limit(monkeypatch, limit_mb, rss_mb, evicted):
+    monkeypatch.setattr(memory, "get_settings", lambda: Settings(memory_soft_limit_mb=limit_mb))
+    monkeypatch.setattr(memory, "rss_bytes", lambda: rss_mb * 1024 * 1024)
+    cache = Cache({"a": 1})
+    memory.register("cache", cache.stats, cache.evict)
+    assert memory.check_soft_limit() == evicted
+
+
+def test_rate_limiter_accounts_for_its_clients(monkeypatch):
+    limiter = RateLimitMiddleware(FastAPI(), rate_limit=10, policies=[])
+    assert memory.component_stats()["rate_limiter"]["entries"] == 0
+
+    now = 1000.0
+    monkeypatch.setattr(middleware.time, "time", lambda: now)
+    limiter.requests[("*", "10.0.0.1")] = [now - 120]
+    limiter.requests[("*", "10.0.0.2")] = [now - 1, now]
+    entries, size = limiter.memory_stats()
+    assert entries == 2
+    assert size > sys.getsizeof(limiter.requests)
+    assert memory.evict_all("test") == {"rate_limiter": 1}
+    assert list(limiter.requests) == [("*", "10.0.0.2")]
+
+
+def test_report_includes_rss_and_components():
+    memory.register("counter", lambda: (3, 24))
+    data = memory.report()
+    assert data["rss_bytes"] > 0
+    assert data["peak_rss_bytes"] > 0
+    assert data["components"]["counter"]["entries"] == 3
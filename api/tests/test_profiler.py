@@ -0,0 +1,77 @@
+import sys
+import threading
+import time
+
+import pytest
+
+import profiler
+from profiler import ProfilerBusy, SamplingProfiler
+
+
+def busy_worker(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_collapse_is_outermost_first():
+    def inner():
+        return profiler.collapse(sys._getframe(), root="MainThread")
+
+    def outer():
+        return inner()
+
+    labels = outer().split(";")
+    assert labels[0] == "MainThread"
+    assert labels[-2].startswith("outer (test_profiler.py:")
+    assert labels[-1].startswith("inner (test_profiler.py:")
+
+
+def test_collapse_caps_the_depth(monkeypatch):
+    monkeypatch.setattr(profiler, "MAX_STACK_DEPTH", 3)
+    assert len(profiler.collapse(sys._getframe()).split(";")) == 3
+
+
+def test_thread_stack_of_another_thread():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_worker, args=(stop,))
+    worker.start()
+    try:
+        stack = profiler.thread_stack(worker.ident)
+    finally:
+        stop.set()
+        worker.join()
+    assert any(label.startswith("busy_worker (test_profiler.py:") for label in stack)
+    assert profiler.thread_stack(-1) == []
+
+
+def test_profile_counts_the_stacks_of_other_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_worker, args=(stop,), name="busy")
+    worker.start()
+    sampler = SamplingProfiler(interval=0.001).start()
+    try:
+        time.sleep(0.1)
+    finally:
+        sampler.stop()
+        stop.set()
+        worker.join()
+
+    assert sampler.samples > 0
+    assert sampler.elapsed >= 0.1
+    lines = sampler.collapsed().splitlines()
+    counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+    assert counts == sorted(counts, reverse=True)
+    assert any(line.startswith("busy;") and "busy_worker" in line for line in lines)
+    assert not any(line.startswith("sampling-profiler;") for line in lines)
+
+
+def test_one_profile_per_process():
+    first = SamplingProfiler(interval=0.01).start()
+    try:
+        with pytest.raises(ProfilerBusy):
+            SamplingProfiler().start()
+    finally:
+        first.stop()
+    # Stopping releases the slot (and a second stop is harmless)
+    first.stop()
+    SamplingProfiler(interval=0.01).start().stop()
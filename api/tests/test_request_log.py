@@ -0,0 +1,132 @@
+import json
+import logging
+
+import pytest
+
+import factory
+import request_log
+from config import Settings
+from request_log import RequestSummary, SampleRule, SamplingPolicy, parse_rules
+
+
+def test_parse_rules():
+    assert parse_rules(["/health=0", "/contact:4XX=1", "/runs:404=0.5"]) == [
+        SampleRule("/health", None, 0.0),
+        SampleRule("/contact", "4xx", 1.0),
+        SampleRule("/runs", "404", 0.5),
+    ]
+    for bad in ("/health", "=0.5", "/a=2", "/a=x"):
+        with pytest.raises(ValueError):
+            parse_rules([bad])
+
+
+@pytest.fixture
+def policy():
+    return SamplingPolicy(0.5, parse_rules(["/health=0", "/contact:4xx=1"]), slow_ms=1000)
+
+
+def test_errors_and_slow_requests_are_always_logged(policy):
+    assert policy.decide("/health", 503, 1.0) == (logging.ERROR, 1.0)
+    assert policy.decide("/health", 200, 1500.0) == (logging.WARNING, 1.0)
+
+
+def test_first_matching_rule_sets_the_rate(policy, monkeypatch):
+    monkeypatch.setattr(request_log.random, "random", lambda: 0.0)
+    assert policy.decide("/health", 200, 1.0) == (None, 0.0)
+    assert policy.decide("/contact", 422, 1.0) == (logging.INFO, 1.0)
+    assert policy.decide("/contact", 200, 1.0) == (logging.INFO, 0.5)
+
+
+def test_default_rate_samples(policy, monkeypatch):
+    monkeypatch.setattr(request_log.random, "random", lambda: 0.7)
+    assert policy.decide("/contact", 200, 1.0) == (None, 0.5)
+    monkeypatch.setattr(request_log.random, "random", lambda: 0.3)
+    assert policy.decide("/contact", 200, 1.0) == (logging.INFO, 0.5)
+
+
+class SummaryLog(list):
+    def info(self, event, **fields):
+        self.append(fields)
+
+
+@pytest.fixture
+def summaries(monkeypatch):
+    written = SummaryLog()
+    monkeypatch.setattr(request_log, "summary_logger", written)
+    return written
+
+
+def test_summary_aggregates_per_route_and_status_class(summaries):
+    summary = RequestSummary(interval=3600)
+    for duration in (10.0, 20.0, 30.0, 40.0):
+        summary.record("GET", "/runs", 200, duration)
+    summary.record("GET", "/runs", 204, 5.0)
+    summary.record("GET", "/runs", 503, 100.0)
+    summary.record("POST", "/contact", 201, 50.0)
+    assert summaries == []
+
+    summary.flush()
+    lines = {(line["method"], line["route"], line["status"]): line for line in summaries}
+    assert set(lines) == {("GET", "/runs", "2xx"), ("GET", "/runs", "5xx"), ("POST", "/contact", "2xx")}
+    ok = lines[("GET", "/runs", "2xx")]
+    assert (ok["count"], ok["errors"], ok["mean_ms"], ok["max_ms"]) == (5, 0, 21.0, 40.0)
+    assert ok["p50_ms"] == 20.0
+    assert ok["p95_ms"] == 40.0
+    assert lines[("GET", "/runs", "5xx")]["errors"] == 1
+
+    # The interval starts over
+    summaries.clear()
+    summary.flush()
+    assert summaries == []
+
+
+def test_summary_folds_excess_routes_into_other(summaries, monkeypatch):
+    monkeypatch.setattr(request_log, "MAX_KEYS", 2)
+    summary = RequestSummary(interval=3600)
+    for path in ("/a", "/b", "/c", "/d"):
+        summary.record("GET", path, 404, 1.0)
+    summary.flush()
+    assert sorted((line["route"], line["count"]) for line in summaries) == [("/a", 1), ("/b", 1), ("other", 2)]
+
+
+def test_summary_flushes_when_the_interval_is_due(summaries, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(request_log.time, "monotonic", lambda: now[0])
+    summary = RequestSummary(interval=60)
+    summary.record("GET", "/", 200, 1.0)
+    assert summaries == []
+    now[0] += 61
+    summary.record("GET", "/", 200, 3.0)
+    assert [(line["count"], line["interval_s"]) for line in summaries] == [(2, 61.0)]
+
+
+def test_disabled_summary_records_nothing(summaries):
+    summary = RequestSummary(interval=0)
+    summary.record("GET", "/", 200, 1.0)
+    summary.flush()
+    assert summaries == []
+
+
+@pytest.fixture
+def root_level():
+    root = logging.getLogger()
+    level = root.level
+    yield
+    root.setLevel(level)
+    request_log.set_summary_level("INFO")
+
+
+def test_summaries_stay_at_info_under_a_warning_root(root_level, caplog):
+    factory.configure_logging(Settings(log_level="WARNING"))
+    summary = RequestSummary(interval=3600)
+    summary.record("GET", "/", 200, 1.0)
+    summary.flush()
+    records = [r for r in caplog.records if r.name == request_log.SUMMARY_LOGGER]
+    assert [r.levelno for r in records] == [logging.INFO]
+    assert json.loads(records[0].getMessage())["event"] == "Request summary"
+
+    caplog.clear()
+    factory.configure_logging(Settings(log_level="WARNING", log_summary_level="WARNING"))
+    summary.record("GET", "/", 200, 1.0)
+    summary.flush()
+    assert [r for r in caplog.records if r.name == request_log.SUMMARY_LOGGER] == []
@@ -0,0 +1,92 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from middleware import RateLimitMiddleware
+from route_policies import PolicyMatcher, RoutePolicy, parse_policies
+
+DEFAULT = RoutePolicy("*", None, "/", 100)
+PROD = ["/health=exempt", "POST /contact=10", "GET=300"]
+
+
+def matcher(specs):
+    return PolicyMatcher(parse_policies(specs), default=DEFAULT)
+
+
+def test_parse_policies():
+    assert parse_policies(["/health=exempt", "post /contact=10", "* /runs/=5", "GET=300"]) == [
+        RoutePolicy("/health", None, "/health", None),
+        RoutePolicy("post /contact", "POST", "/contact", 10),
+        RoutePolicy("* /runs/", None, "/runs/", 5),
+        RoutePolicy("GET", "GET", "/", 300),
+    ]
+
+
+@pytest.mark.parametrize("spec", ["/health", "=10", "/x=-1", "/x=lots", "GET /x="])
+def test_invalid_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_policies([spec])
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        # /health=exempt comes first, so GET=300 never sees it
+        ("GET", "/health", None),
+        ("HEAD", "/health", None),
+        ("GET", "/health/ready", None),
+        # Prefixes match whole segments
+        ("GET", "/healthz", 300),
+        ("POST", "/contact", 10),
+        ("POST", "/contact/stats", 10),
+        ("POST", "/contacts", 100),
+        # Method-only policy applies to every path for that method
+        ("GET", "/contact", 300),
+        ("GET", "/", 300),
+        # Nothing matches: the default limit
+        ("DELETE", "/runs/1", 100),
+        ("PUT", "/", 100),
+    ],
+)
+def test_first_matching_policy_wins(method, path, expected):
+    assert matcher(PROD).match(method, path).limit == expected
+
+
+def test_order_decides_precedence():
+    assert matcher(["GET=300", "/health=exempt"]).match("GET", "/health").limit == 300
+    assert matcher(["GET=300", "/health=exempt"]).match("POST", "/health").limit is None
+
+
+def test_prefix_is_matched_literally():
+    m = matcher(["/a.b=1", "/runs/=5"])
+    assert m.match("GET", "/a.b/c").limit == 1
+    assert m.match("GET", "/axb").limit == 100
+    assert m.match("GET", "/runs").limit == 5
+    assert m.match("GET", "/runs/42").limit == 5
+
+
+def test_no_policies_uses_the_default():
+    assert matcher([]).match("GET", "/anything") is DEFAULT
+
+
+def client(policies, rate_limit=100):
+    app = FastAPI()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def echo(path: str):
+        return {"path": path}
+
+    app.add_middleware(RateLimitMiddleware, rate_limit=rate_limit, policies=policies)
+    return TestClient(app)
+
+
+def test_middleware_limits_per_policy_and_sends_retry_after():
+    http = client(["/health=exempt", "POST /contact=2", "GET=3"])
+    assert [http.post("/contact").status_code for _ in range(3)] == [200, 200, 429]
+    limited = http.post("/contact")
+    assert limited.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+    assert 1 <= int(limited.headers["Retry-After"]) <= 60
+    # The same client is counted separately under another policy
+    assert [http.get("/contact").status_code for _ in range(4)] == [200, 200, 200, 429]
+    # Exempt routes are never counted or limited
+    assert all(http.get("/health").status_code == 200 for _ in range(10))
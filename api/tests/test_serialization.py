@@ -0,0 +1,89 @@
+import datetime as dt
+import json
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import serialization
+from serialization import JSONBytesResponse, encode_page, project
+
+
+class Status(str, Enum):
+    SUCCEEDED = "SUCCEEDED"
+
+
+class Priority(Enum):
+    HIGH = 1
+
+
+ITEM = {
+    "id": "run-1",
+    "count": Decimal("3"),
+    "ratio": Decimal("0.25"),
+    "status": Status.SUCCEEDED,
+    "priority": Priority.HIGH,
+    "tags": {"b", "a"},
+    "created_at": dt.datetime(2025, 1, 6, 12, 30, 5, 123456, tzinfo=dt.timezone.utc),
+    "day": dt.date(2025, 1, 6),
+    "name": "Zoë",
+}
+
+EXPECTED = {
+    "id": "run-1",
+    "count": 3,
+    "ratio": 0.25,
+    "status": "SUCCEEDED",
+    "priority": 1,
+    "tags": ["a", "b"],
+    "created_at": "2025-01-06T12:30:05.123456+00:00",
+    "day": "2025-01-06",
+    "name": "Zoë",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+def test_default_converts_stored_types(encoder):
+    assert json.loads(serialization.dumps(ITEM)) == EXPECTED
+
+
+def test_unknown_types_are_rejected(encoder):
+    with pytest.raises(TypeError):
+        serialization.dumps({"value": object()})
+
+
+def test_encoders_produce_identical_bytes(monkeypatch):
+    pytest.importorskip("orjson")
+    page = [ITEM, {**ITEM, "id": "run-2", "created_at": dt.datetime(2025, 1, 7)}]
+    fast = encode_page(page)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert encode_page(page) == fast
+    assert json.loads(fast)["count"] == 2
+
+
+def test_project_keeps_only_the_listed_fields():
+    items = [{"id": 1, "status": "ok", "result": {"big": True}}, {"id": 2}]
+    assert project(items, ("id", "status")) == [{"id": 1, "status": "ok"}, {"id": 2, "status": None}]
+    assert project([], ("id",)) == []
+
+
+def test_json_bytes_response_sends_the_body_as_is():
+    app = FastAPI()
+
+    @app.get("/page", response_class=JSONBytesResponse)
+    async def page():
+        return JSONBytesResponse(encode_page(project([ITEM], ("id", "tags"))))
+
+    response = TestClient(app).get("/page")
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == b'{"items":[{"id":"run-1","tags":["a","b"]}],"count":1}'
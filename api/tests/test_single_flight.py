@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+import single_flight
+from single_flight import SingleFlight
+
+
+class Backend:
+    def __init__(self, result="value", error=None, delay=0.02):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.delay = delay
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def test_concurrent_calls_share_one_backend_call():
+    group, backend = SingleFlight("test"), Backend(result={"id": "run-1"})
+    results = await asyncio.gather(*(group.do("run-1", backend.fetch) for _ in range(5)))
+    assert backend.calls == 1
+    assert all(result is results[0] for result in results)
+    assert group.in_flight() == 0
+
+
+async def test_different_keys_are_not_coalesced():
+    group, backend = SingleFlight("test"), Backend()
+    await asyncio.gather(group.do("a", backend.fetch), group.do("b", backend.fetch))
+    assert backend.calls == 2
+
+
+async def test_nothing_is_cached_after_completion():
+    group, backend = SingleFlight("test"), Backend()
+    await group.do("a", backend.fetch)
+    await group.do("a", backend.fetch)
+    assert backend.calls == 2
+
+
+async def test_exceptions_are_shared_and_not_cached():
+    group, backend = SingleFlight("test"), Backend(error=LookupError("missing"))
+    results = await asyncio.gather(*(group.do("a", backend.fetch) for _ in range(3)), return_exceptions=True)
+    assert backend.calls == 1
+    assert all(isinstance(result, LookupError) for result in results)
+    backend.error = None
+    assert await group.do("a", backend.fetch) == "value"
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    group, backend = SingleFlight("test"), Backend(delay=0.05)
+    leader = asyncio.ensure_future(group.do("a", backend.fetch))
+    follower = asyncio.ensure_future(group.do("a", backend.fetch))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    assert await follower == "value"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert backend.calls == 1
+
+
+async def test_failure_nobody_awaits_is_still_retrieved(caplog):
+    group, backend = SingleFlight("test"), Backend(error=RuntimeError("boom"), delay=0.01)
+    caller = asyncio.ensure_future(group.do("a", backend.fetch))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.sleep(0.05)
+    assert group.in_flight() == 0
+    assert "exception was never retrieved" not in caplog.text
+
+
+async def test_counts_leaders_and_shared_calls(monkeypatch):
+    counted = []
+    monkeypatch.setattr(single_flight._calls, "inc", lambda **labels: counted.append(labels["result"]))
+    group, backend = SingleFlight("test"), Backend()
+    await asyncio.gather(*(group.do("a", backend.fetch) for _ in range(3)))
+    assert counted == ["leader", "shared", "shared"]
+
+
+def test_groups_are_named_singletons():
+    assert single_flight.get("runs-test") is single_flight.get("runs-test")
+    assert single_flight.get("runs-test").name == "runs-test"
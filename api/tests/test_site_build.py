@@ -0,0 +1,36 @@
+import json
+import os
+import sys
+
+HTML_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "html")
+if HTML_DIR not in sys.path:
+    sys.path.insert(0, HTML_DIR)
+
+import build  # noqa: E402
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10"><path d="M0 0L10 10"/></svg>'
+
+
+def test_duplicate_assets_share_the_written_file(tmp_path):
+    source = tmp_path / "src"
+    dist = tmp_path / "dist"
+    source.mkdir()
+    (source / "a.svg").write_text(SVG, encoding="utf-8")
+    (source / "b.svg").write_text(SVG, encoding="utf-8")
+    (source / "index.html").write_text(
+        '<html><head></head><body><img src="a.svg"><img src="b.svg"></body></html>', encoding="utf-8"
+    )
+
+    report = build.build(source, dist, svg_precision=2, subset_fonts=False)
+    manifest = json.loads((dist / "manifest.json").read_text(encoding="utf-8"))
+
+    written = report["a.svg"]["output"]
+    assert written.startswith("a.")
+    assert manifest["a.svg"] == manifest["b.svg"] == written
+    assert report["b.svg"]["output"] == written
+    assert report["b.svg"]["duplicate_of"] == "a.svg"
+    assert not any(p.name.startswith("b.") for p in dist.iterdir())
+
+    index = (dist / "index.html").read_text(encoding="utf-8")
+    assert index.count(f'src="{written}"') == 2
+    assert (dist / written).exists()
@@ -0,0 +1,123 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from compression import CompressionMiddleware
+from static_files import IMMUTABLE, REVALIDATE, StaticSite
+
+brotli = pytest.importorskip("brotli")
+
+INDEX = b"<!doctype html><title>Landing</title>" + b"<p>hello</p>" * 200
+LOGO = b'<svg xmlns="http://www.w3.org/2000/svg"><path d="M0 0L1 1"/></svg>' * 40
+NOTES = b"plain text without a pre-compressed sibling\n" * 100
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "index.html").write_bytes(INDEX)
+    (tmp_path / "index.html.gz").write_bytes(gzip.compress(INDEX))
+    (tmp_path / "index.html.br").write_bytes(brotli.compress(INDEX))
+    (tmp_path / "logo.55f43f92.svg").write_bytes(LOGO)
+    (tmp_path / "logo.55f43f92.svg.gz").write_bytes(gzip.compress(LOGO))
+    (tmp_path / "notes.txt").write_bytes(NOTES)
+    return tmp_path
+
+
+@pytest.fixture
+def client(site):
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.mount("", StaticSite(str(site)), name="static")
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding, sibling",
+    [
+        ("br, gzip", "br", "index.html.br"),
+        ("gzip", "gzip", "index.html.gz"),
+        ("br;q=0, gzip;q=0", None, "index.html"),
+    ],
+)
+def test_precompressed_variant_is_negotiated(site, client, accept_encoding, encoding, sibling):
+    response = client.get("/", headers={"Accept-Encoding": accept_encoding})
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == encoding
+    assert response.headers["content-length"] == str((site / sibling).stat().st_size)
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["content-type"] == "text/html; charset=utf-8"
+    assert response.content == INDEX  # decoded by the client
+
+
+def test_each_variant_has_its_own_etag(client):
+    etags = {
+        client.get("/index.html", headers={"Accept-Encoding": value}).headers["etag"]
+        for value in ("br", "gzip", "identity")
+    }
+    assert len(etags) == 3
+    assert all(not etag.startswith("W/") for etag in etags)
+
+
+def test_cache_headers(client):
+    assert client.get("/index.html").headers["cache-control"] == REVALIDATE
+    logo = client.get("/logo.55f43f92.svg", headers={"Accept-Encoding": "gzip"})
+    assert logo.headers["cache-control"] == IMMUTABLE
+    assert logo.headers["content-type"] == "image/svg+xml"
+
+
+def test_if_none_match_returns_304(client):
+    headers = {"Accept-Encoding": "gzip"}
+    etag = client.get("/logo.55f43f92.svg", headers=headers).headers["etag"]
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get("/logo.55f43f92.svg", headers={**headers, "If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == IMMUTABLE
+        assert response.headers["vary"] == "Accept-Encoding"
+    # The identity ETag does not validate the gzip variant
+    identity = client.get("/logo.55f43f92.svg", headers={"Accept-Encoding": "identity"}).headers["etag"]
+    assert client.get("/logo.55f43f92.svg", headers={**headers, "If-None-Match": identity}).status_code == 200
+
+
+def test_compressed_on_the_fly_gets_a_weak_etag(client):
+    plain = client.get("/notes.txt", headers={"Accept-Encoding": "identity"})
+    assert "vary" not in plain.headers
+    compressed = client.get("/notes.txt", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == "W/" + plain.headers["etag"]
+    # Weak comparison: the weak tag still revalidates
+    revalidated = client.get(
+        "/notes.txt", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_api_routes_win_and_misses_use_the_app_error_shape(client):
+    assert client.get("/api/ping").json() == {"ok": True}
+    missing = client.get("/api/nope")
+    assert missing.status_code == 404
+    assert missing.headers["content-type"] == "application/json"
+    assert missing.json() == {"detail": "Not Found"}
+    assert client.get("/../etc/passwd").status_code == 404
+    rejected = client.post("/index.html")
+    assert rejected.status_code == 405
+    assert rejected.headers["allow"] == "GET, HEAD"
+    assert rejected.json() == {"detail": "Method Not Allowed"}
+
+
+def test_range_requests_are_not_compressed(site):
+    app = FastAPI()
+    app.mount("", StaticSite(str(site), max_file_bytes=0), name="static")
+    app.add_middleware(CompressionMiddleware, minimum_size=1)
+    response = TestClient(app).get("/notes.txt", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-9"})
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.content == NOTES[:10]
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+import tracing
+from tracing import TracedMiddleware, TracedRoute, TracingMiddleware
+
+
+class Exported(list):
+    def export(self, trace):
+        self.append(trace)
+
+
+@pytest.fixture
+def exported(monkeypatch):
+    traces = Exported()
+    monkeypatch.setattr(tracing, "_exporter", traces)
+    return traces
+
+
+class Passthrough:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+
+def make_client(sample_rate):
+    router = APIRouter(route_class=TracedRoute)
+
+    @router.get("/runs/{run_id}")
+    async def get_run(run_id: int):
+        with tracing.span("db.query", table="runs"):
+            await asyncio.to_thread(lambda: tracing.set_attribute("thread", True))
+        return {"run_id": run_id, "trace_id": tracing.current_trace_id()}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(TracedMiddleware, wrapped=Passthrough, span_name="middleware.passthrough")
+    app.add_middleware(TracingMiddleware, sample_rate=sample_rate)
+    return TestClient(app)
+
+
+def test_unsampled_requests_carry_no_trace(exported, monkeypatch):
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.5)
+    response = make_client(0.5).get("/runs/1")
+    assert response.json() == {"run_id": 1, "trace_id": None}
+    assert "x-trace-id" not in response.headers
+    assert exported == []
+
+
+def test_zero_rate_never_samples(exported, monkeypatch):
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.0)
+    assert make_client(0.0).get("/runs/1").json()["trace_id"] is None
+    assert exported == []
+
+
+def test_sampled_request_spans_every_layer(exported, monkeypatch):
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.49)
+    response = make_client(0.5).get("/runs/1")
+    trace_id = response.headers["x-trace-id"]
+    assert response.json() == {"run_id": 1, "trace_id": trace_id}
+
+    (trace,) = exported
+    assert trace.trace_id == trace_id
+    spans = {s.name: s for s in trace.spans}
+    root = spans["GET /runs/1"]
+    assert root.parent_id is None
+    assert root.attributes["http.status_code"] == 200
+    middleware = spans["middleware.passthrough"]
+    route = spans["route GET /runs/{run_id}"]
+    endpoint = spans["endpoint get_run"]
+    query = spans["db.query"]
+    assert middleware.parent_id == root.span_id
+    assert route.parent_id == middleware.span_id
+    assert spans["validate"].parent_id == route.span_id
+    assert endpoint.parent_id == route.span_id
+    assert query.parent_id == endpoint.span_id
+    assert query.attributes == {"table": "runs", "thread": True}
+    assert all(s.end_ns >= s.start_ns for s in trace.spans)
+
+
+def test_trace_id_reuses_the_upstream_request_id(exported, monkeypatch):
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.0)
+    amzn = "Root=1-5759e988-bd862e3fe1be46a994272793;Sampled=1"
+    response = make_client(1.0).get("/runs/1", headers={"X-Amzn-Trace-Id": amzn})
+    assert response.headers["x-trace-id"] == "5759e988bd862e3fe1be46a994272793"
+    assert exported[0].spans[0].attributes["upstream.request_id"] == "5759e988bd862e3fe1be46a994272793"
+
+
+@pytest.mark.parametrize(
+    "scope, expected",
+    [
+        ({"aws.event": {"requestContext": {"requestId": "c6af9ac6-7b61"}}, "headers": []}, "c6af9ac6-7b61"),
+        (
+            {"headers": [(b"traceparent", b"00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01")]},
+            "4bf92f3577b34da6a3ce929d0e0e4736",
+        ),
+        ({"headers": [(b"traceparent", b"garbage")]}, None),
+        ({"headers": []}, None),
+    ],
+)
+def test_upstream_request_id(scope, expected):
+    assert tracing.upstream_request_id(scope) == expected
+
+
+def test_trace_id_from():
+    uuid = "C6AF9AC6-7B61-11E6-9A41-93E8DEADBEEF"
+    assert tracing.trace_id_from(uuid) == "c6af9ac67b6111e69a4193e8deadbeef"
+    hashed = tracing.trace_id_from("not-hex")
+    assert len(hashed) == 32 and hashed == tracing.trace_id_from("not-hex")
+    assert tracing.trace_id_from(None) != tracing.trace_id_from(None)
+
+
+def test_helpers_are_no_ops_without_a_trace():
+    with tracing.span("work") as current:
+        assert current is None
+    tracing.record_span("queue", 0)
+    tracing.set_attribute("key", "value")
+    assert not tracing.active()
+    assert tracing.current_trace_id() is None
+
+
+def test_errors_are_recorded_on_the_span(exported):
+    with pytest.raises(ValueError):
+        with tracing.start_trace("job", "0" * 32):
+            with tracing.span("step"):
+                raise ValueError("boom")
+    assert [(s.name, s.error) for s in exported[0].spans] == [("job", "ValueError"), ("step", "ValueError")]
+
+
+def test_traces_to_otlp():
+    trace = tracing.Trace("a" * 32)
+    trace.spans.append(tracing.Span("root", "1" * 16, None, 10, 20, {"ok": True, "n": 2}))
+    trace.spans.append(tracing.Span("child", "2" * 16, "1" * 16, 12, 18, {}, error="ValueError"))
+    (root, child) = tracing.traces_to_otlp([trace])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert "parentSpanId" not in root and root["kind"] == 2
+    assert root["attributes"] == [
+        {"key": "ok", "value": {"boolValue": True}},
+        {"key": "n", "value": {"intValue": "2"}},
+    ]
+    assert child["parentSpanId"] == "1" * 16 and child["kind"] == 1
+    assert child["status"] == {"code": 2, "message": "ValueError"}
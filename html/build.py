@@ -0,0 +1,537 @@
+"""Build an optimized, pre-compressed bundle of the landing site.
+
+Reads the sources under ``html/html`` and writes a deployable bundle to
+``html/dist``:
+
+- ``index.html`` with minified inline CSS/JS, collapsed whitespace and
+  precision-limited inline SVG path data.
+- Optimized SVGs (metadata/comments/editor attributes stripped, numeric
+  precision limited, repeated paths replaced with ``<use>`` references),
+  renamed with a content hash (``logo.3f9a1c2b.svg``) for immutable caching.
+  Byte-identical outputs share a single hashed file.
+- ``.gz`` and ``.br`` siblings next to every text asset (``.br`` only when the
+  ``brotli`` package is installed).
+- Subset WOFF2 fonts under ``fonts/`` for any source font family the page
+  references (see ``fonts.py``), with ``@font-face`` rules and preload hints
+  injected into ``index.html``.
+- ``manifest.json`` mapping source names to hashed names and
+  ``size-report.json`` with raw/optimized/gzip/brotli sizes per asset.
+
+The build fails (exit code 1) when an asset grows beyond the budget recorded
+in ``html/size-budget.json`` by more than ``--tolerance``. Refresh the budget
+after an intentional change with ``--update-budget``.
+
+Usage (from the repository root)::
+
+    pip install -r html/requirements.txt
+    python html/build.py
+    python html/build.py --update-budget
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:  # brotli is optional; .br siblings are skipped without it
+    import brotli
+except ImportError:  # pragma: no cover - depends on the build machine
+    brotli = None
+
+import fonts
+
+
+HTML_DIR = Path(__file__).resolve().parent
+SOURCE_DIR = HTML_DIR / "html"
+DIST_DIR = HTML_DIR / "dist"
+BUDGET_FILE = HTML_DIR / "size-budget.json"
+
+# Entry points keep their names; everything else is content-hashed
+ENTRY_POINTS = {"index.html"}
+PRECOMPRESS_SUFFIXES = {".html", ".css", ".js", ".svg", ".json", ".txt", ".xml"}
+
+
+# ---------------------------------------------------------------------------
+# Numeric precision
+# ---------------------------------------------------------------------------
+
+_NUMBER_RE = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+def _format_number(value: float, precision: int) -> str:
+    text = f"{round(value, precision):.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        text = "0"
+    if text.startswith("0.") and len(text) > 2:
+        text = text[1:]
+    elif text.startswith("-0.") and len(text) > 3:
+        text = "-" + text[2:]
+    return text
+
+
+def limit_precision(data: str, precision: int) -> str:
+    """Round every number in SVG path/point data to ``precision`` decimals.
+
+    Separators from the original data are preserved; a space is inserted only
+    where dropping a decimal point would merge two numbers (``1.0.5``).
+    """
+    out: List[str] = []
+    last_end = 0
+    prev_number: Optional[str] = None
+    for match in _NUMBER_RE.finditer(data):
+        between = data[last_end:match.start()]
+        number = _format_number(float(match.group()), precision)
+        if (
+            not between
+            and prev_number is not None
+            and number.startswith(".")
+            and not any(c in prev_number for c in ".eE")
+        ):
+            between = " "
+        out.append(between)
+        out.append(number)
+        prev_number = number
+        last_end = match.end()
+    out.append(data[last_end:])
+    return "".join(out)
+
+
+# ---------------------------------------------------------------------------
+# SVG
+# ---------------------------------------------------------------------------
+
+_SVG_DROP_PATTERNS = [
+    re.compile(r"<\?xml[^>]*\?>", re.S),
+    re.compile(r"<!DOCTYPE[^>]*>", re.S | re.I),
+    re.compile(r"<!--.*?-->", re.S),
+    re.compile(r"<metadata\b.*?</metadata>", re.S),
+    re.compile(r"<title\b.*?</title>", re.S),
+    re.compile(r"<desc\b.*?</desc>", re.S),
+    re.compile(r"<(?:sodipodi|inkscape):[^>]*/>", re.S),
+    re.compile(r"<(?:sodipodi|inkscape):(\w+)\b.*?</(?:sodipodi|inkscape):\1>", re.S),
+]
+_SVG_EDITOR_ATTR_RE = re.compile(r'\s(?:xmlns:)?(?:sodipodi|inkscape|sketch|serif)(?::[\w-]+)?="[^"]*"')
+_SVG_NUMERIC_ATTR_RE = re.compile(r'\s(d|points|x|y|x1|y1|x2|y2|cx|cy|r|rx|ry|width|height|transform)="([^"]*)"')
+_SVG_PATH_RE = re.compile(r"<path\b([^>]*?)\s*/>", re.S)
+_ATTR_RE = re.compile(r'([\w:-]+)="([^"]*)"')
+
+
+def _dedupe_paths(svg: str) -> str:
+    """Replace repeated path geometry with ``<use>`` references.
+
+    The first occurrence of a ``d`` string is given an id; later paths with
+    the same geometry become ``<use href>`` elements carrying only their own
+    presentation attributes.
+    """
+    paths = list(_SVG_PATH_RE.finditer(svg))
+    counts: Dict[str, int] = {}
+    for match in paths:
+        d = dict(_ATTR_RE.findall(match.group(1))).get("d")
+        if d:
+            counts[d] = counts.get(d, 0) + 1
+    repeated = {d for d, n in counts.items() if n > 1}
+    if not repeated:
+        return svg
+
+    ids: Dict[str, str] = {}
+    out: List[str] = []
+    last = 0
+    for match in paths:
+        attrs = _ATTR_RE.findall(match.group(1))
+        d = dict(attrs).get("d")
+        if d not in repeated:
+            continue
+        out.append(svg[last:match.start()])
+        others = "".join(f' {k}="{v}"' for k, v in attrs if k not in ("d", "id"))
+        if d not in ids:
+            existing = dict(attrs).get("id")
+            ids[d] = existing or f"p{len(ids)}"
+            out.append(f'<path id="{ids[d]}" d="{d}"{others}/>')
+        else:
+            out.append(f'<use href="#{ids[d]}"{others}/>')
+        last = match.end()
+    out.append(svg[last:])
+    return "".join(out)
+
+
+def optimize_svg(svg: str, precision: int = 2) -> str:
+    """Strip metadata, limit precision, dedupe paths and collapse whitespace."""
+    for pattern in _SVG_DROP_PATTERNS:
+        svg = pattern.sub("", svg)
+    svg = _SVG_EDITOR_ATTR_RE.sub("", svg)
+    svg = _SVG_NUMERIC_ATTR_RE.sub(
+        lambda m: f' {m.group(1)}="{limit_precision(m.group(2), precision)}"', svg
+    )
+    svg = _dedupe_paths(svg)
+    svg = re.sub(r">\s+<", "><", svg)
+    svg = re.sub(r"\s{2,}", " ", svg)
+    return svg.strip()
+
+
+# ---------------------------------------------------------------------------
+# CSS / JS / HTML
+# ---------------------------------------------------------------------------
+
+def _split_strings(source: str, quotes: str):
+    """Yield ``(is_literal, text)`` chunks, keeping quoted strings intact."""
+    i = 0
+    start = 0
+    n = len(source)
+    while i < n:
+        c = source[i]
+        if c in quotes:
+            if start < i:
+                yield False, source[start:i]
+            j = i + 1
+            while j < n and source[j] != c:
+                j += 2 if source[j] == "\\" else 1
+            yield True, source[i:j + 1]
+            i = start = j + 1
+            continue
+        i += 1
+    if start < n:
+        yield False, source[start:]
+
+
+def _strip_css_comments(css: str) -> str:
+    """Remove ``/* */`` comments without touching quoted strings."""
+    out = []
+    i = 0
+    n = len(css)
+    while i < n:
+        c = css[i]
+        if c in "\"'":
+            j = i + 1
+            while j < n and css[j] != c:
+                j += 2 if css[j] == "\\" else 1
+            out.append(css[i:j + 1])
+            i = j + 1
+        elif css.startswith("/*", i):
+            end = css.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+def minify_css(css: str) -> str:
+    """Conservative CSS minifier (comments, whitespace, redundant semicolons)."""
+    out = []
+    for is_literal, chunk in _split_strings(_strip_css_comments(css), "\"'"):
+        if is_literal:
+            out.append(chunk)
+            continue
+        chunk = re.sub(r"\s+", " ", chunk)
+        chunk = re.sub(r"\s*([{};,>])\s*", r"\1", chunk)
+        # Only the space *after* a colon is safe to drop: "a :hover" differs
+        # from "a:hover" in selectors.
+        chunk = re.sub(r":\s+", ":", chunk)
+        chunk = chunk.replace(";}", "}")
+        out.append(chunk)
+    return "".join(out).strip()
+
+
+_JS_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_JS_PUNCT = set("{}()[];,:=<>!&|?*%^~")
+
+
+def minify_js(js: str) -> str:
+    """Conservative JS minifier.
+
+    Removes comments and redundant whitespace while keeping string, template
+    and regex literals untouched. Newlines are kept (collapsed) wherever
+    removing them could change automatic semicolon insertion.
+    """
+    out: List[str] = []
+    i = 0
+    n = len(js)
+
+    def last_significant() -> str:
+        for piece in reversed(out):
+            stripped = piece.rstrip()
+            if stripped:
+                return stripped[-1]
+        return ""
+
+    while i < n:
+        c = js[i]
+        if c in "\"'`":
+            j = i + 1
+            while j < n and js[j] != c:
+                j += 2 if js[j] == "\\" else 1
+            out.append(js[i:j + 1])
+            i = j + 1
+            continue
+        if c == "/" and i + 1 < n and js[i + 1] == "/":
+            while i < n and js[i] != "\n":
+                i += 1
+            continue
+        if c == "/" and i + 1 < n and js[i + 1] == "*":
+            end = js.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if c == "/" and (last_significant() in _JS_REGEX_PRECEDERS or not last_significant()):
+            j = i + 1
+            in_class = False
+            while j < n:
+                if js[j] == "\\":
+                    j += 2
+                    continue
+                if js[j] == "[":
+                    in_class = True
+                elif js[j] == "]":
+                    in_class = False
+                elif js[j] == "/" and not in_class:
+                    break
+                j += 1
+            j += 1
+            while j < n and js[j].isalpha():
+                j += 1
+            out.append(js[i:j])
+            i = j
+            continue
+        if c.isspace():
+            j = i
+            has_newline = False
+            while j < n and js[j].isspace():
+                has_newline = has_newline or js[j] == "\n"
+                j += 1
+            prev = last_significant()
+            nxt = js[j] if j < n else ""
+            if not prev or not nxt or (out and out[-1] == "\n"):
+                pass
+            elif prev in _JS_PUNCT or nxt in _JS_PUNCT or nxt == ".":
+                if has_newline and prev not in "{;,(" and nxt not in "})].":
+                    out.append("\n")
+            else:
+                out.append("\n" if has_newline else " ")
+            i = j
+            continue
+        out.append(c)
+        i += 1
+    return "".join(out).strip()
+
+
+_BLOCK_TAGS = (
+    "html|head|body|meta|link|title|style|script|noscript|section|header|footer|main|nav|"
+    "article|aside|div|form|ul|ol|li|h[1-6]|p|table|thead|tbody|tr|td|th|svg|g|path|defs|"
+    "clipPath|rect|circle|use|br|hr|!DOCTYPE"
+)
+_BLOCK_GAP_RE = re.compile(rf"\s+(</?(?:{_BLOCK_TAGS})\b)|(</?(?:{_BLOCK_TAGS})\b[^>]*>)\s+", re.I)
+_RAW_BLOCK_RE = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)", re.S | re.I)
+
+
+def minify_html(html: str, svg_precision: int = 2) -> str:
+    """Minify an HTML document including inline CSS, JS and SVG."""
+    preserved: List[str] = []
+
+    def stash(match: re.Match) -> str:
+        open_tag, tag, body, close_tag = match.groups()
+        tag = tag.lower()
+        if tag == "style":
+            body = minify_css(body)
+        elif tag == "script" and "src=" not in open_tag:
+            body = minify_js(body)
+        preserved.append(open_tag + body + close_tag)
+        return f"\x00{len(preserved) - 1}\x00"
+
+    html = _RAW_BLOCK_RE.sub(stash, html)
+    html = re.sub(r"<!--(?!\[if).*?-->", "", html, flags=re.S)
+    html = re.sub(
+        r'(<path\b[^>]*?\sd=")([^"]*)(")',
+        lambda m: m.group(1) + limit_precision(m.group(2), svg_precision) + m.group(3),
+        html,
+    )
+    html = re.sub(r"\s+", " ", html)
+    html = _BLOCK_GAP_RE.sub(lambda m: m.group(1) or m.group(2), html)
+    html = re.sub(r"\s+(/?>)", r"\1", html)
+    # Whitespace around script/style blocks is never rendered
+    html = re.sub(
+        r"\s*\x00(\d+)\x00\s*",
+        lambda m: (
+            m.group(0).strip()
+            if re.match(r"<(?:script|style)\b", preserved[int(m.group(1))], re.I)
+            else m.group(0)
+        ),
+        html,
+    )
+    html = re.sub(r"\x00(\d+)\x00", lambda m: preserved[int(m.group(1))], html)
+    return html.strip()
+
+
+# ---------------------------------------------------------------------------
+# Bundle
+# ---------------------------------------------------------------------------
+
+def content_hash(data: bytes, length: int = 8) -> str:
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def hashed_name(name: str, data: bytes) -> str:
+    path = Path(name)
+    return f"{path.stem}.{content_hash(data)}{path.suffix}"
+
+
+def _precompress(path: Path, data: bytes) -> Dict[str, int]:
+    sizes = {}
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    path.with_name(path.name + ".gz").write_bytes(gz)
+    sizes["gzip"] = len(gz)
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        path.with_name(path.name + ".br").write_bytes(br)
+        sizes["brotli"] = len(br)
+    return sizes
+
+
+def build(source_dir: Path, dist_dir: Path, svg_precision: int, subset_fonts: bool = True) -> Dict[str, dict]:
+    """Build the bundle and return the per-asset size report."""
+    if dist_dir.exists():
+        shutil.rmtree(dist_dir)
+    dist_dir.mkdir(parents=True)
+
+    report: Dict[str, dict] = {}
+    manifest: Dict[str, str] = {}
+    written: Dict[str, str] = {}
+
+    head_snippet = ""
+    if subset_fonts and (source_dir / "index.html").exists():
+        font_report = fonts.build_fonts(source_dir / "index.html", fonts.FONTS_DIR, dist_dir / "fonts")
+        fonts.print_report(font_report)
+        print()
+        if font_report["faces"]:
+            head_snippet = f"{font_report['preload']}<style>{font_report['css']}</style>"
+        for face in font_report["faces"]:
+            report[f"fonts/{face['source']}"] = {
+                "output": f"fonts/{face['output']}",
+                "source_bytes": face["source_bytes"],
+                "bytes": face["bytes"],
+            }
+
+    # Non-entry assets first so entry points can reference hashed names
+    sources = sorted(p for p in source_dir.iterdir() if p.is_file())
+    for path in sorted(sources, key=lambda p: p.name in ENTRY_POINTS):
+        raw = path.read_bytes()
+        if path.suffix == ".svg":
+            data = optimize_svg(raw.decode("utf-8"), svg_precision).encode("utf-8")
+        elif path.suffix == ".html":
+            text = raw.decode("utf-8")
+            if head_snippet:
+                text = text.replace("</head>", head_snippet + "</head>", 1)
+            text = minify_html(text, svg_precision)
+            for original, hashed in manifest.items():
+                text = re.sub(rf'(["\'/]){re.escape(original)}(["\'?#])', rf"\g<1>{hashed}\g<2>", text)
+            data = text.encode("utf-8")
+        elif path.suffix == ".css":
+            data = minify_css(raw.decode("utf-8")).encode("utf-8")
+        elif path.suffix == ".js":
+            data = minify_js(raw.decode("utf-8")).encode("utf-8")
+        else:
+            data = raw
+
+        out_name = path.name if path.name in ENTRY_POINTS else hashed_name(path.name, data)
+        entry = {"output": out_name, "source_bytes": len(raw), "bytes": len(data)}
+
+        digest = content_hash(data, 64)
+        if digest in written and path.name not in ENTRY_POINTS:
+            # Identical optimized content is emitted once; point at that file
+            entry["output"] = manifest[path.name] = report[written[digest]]["output"]
+            entry["duplicate_of"] = written[digest]
+            report[path.name] = entry
+            continue
+        manifest[path.name] = out_name
+        written[digest] = path.name
+
+        out_path = dist_dir / out_name
+        out_path.write_bytes(data)
+        if path.suffix in PRECOMPRESS_SUFFIXES:
+            entry.update(_precompress(out_path, data))
+        report[path.name] = entry
+
+    (dist_dir / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    (dist_dir / "size-report.json").write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return report
+
+
+def check_budget(report: Dict[str, dict], budget: Dict[str, dict], tolerance: float) -> List[str]:
+    """Return a list of budget violations (empty when within budget)."""
+    failures = []
+    for name, limits in budget.items():
+        entry = report.get(name)
+        if entry is None or "duplicate_of" in entry:
+            continue
+        for metric, limit in limits.items():
+            actual = entry.get(metric)
+            if actual is not None and actual > limit * (1 + tolerance):
+                failures.append(f"{name}: {metric} {actual} B exceeds budget {limit} B")
+    return failures
+
+
+def _budget_from_report(report: Dict[str, dict]) -> Dict[str, dict]:
+    metrics = ("bytes", "gzip", "brotli")
+    return {
+        name: {m: entry[m] for m in metrics if m in entry}
+        for name, entry in report.items()
+        if "duplicate_of" not in entry
+    }
+
+
+def _print_report(report: Dict[str, dict]) -> None:
+    header = f"{'asset':<36} {'output':<40} {'source':>8} {'min':>8} {'gzip':>8} {'brotli':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, e in report.items():
+        if "duplicate_of" in e:
+            print(f"{name:<36} {e['output']:<40} {e['source_bytes']:>8} (identical to {e['duplicate_of']})")
+            continue
+        print(
+            f"{name:<36} {e['output']:<40} {e['source_bytes']:>8} {e['bytes']:>8} "
+            f"{e.get('gzip', '-'):>8} {e.get('brotli', '-'):>8}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the optimized landing page bundle.")
+    parser.add_argument("--source", type=Path, default=SOURCE_DIR)
+    parser.add_argument("--out", type=Path, default=DIST_DIR)
+    parser.add_argument("--svg-precision", type=int, default=2)
+    parser.add_argument("--budget", type=Path, default=BUDGET_FILE)
+    parser.add_argument("--tolerance", type=float, default=0.02, help="allowed growth before failing (fraction)")
+    parser.add_argument("--update-budget", action="store_true", help="record current sizes as the new budget")
+    parser.add_argument("--no-fonts", action="store_true", help="skip font subsetting")
+    args = parser.parse_args()
+
+    subset_fonts = not args.no_fonts and fonts.ft_subset is not None
+    if not args.no_fonts and not subset_fonts:
+        print("fonttools not installed; skipping font subsetting.\n")
+    report = build(args.source, args.out, args.svg_precision, subset_fonts)
+    _print_report(report)
+    if brotli is None:
+        print("\nbrotli not installed; .br siblings were not written.")
+
+    if args.update_budget:
+        args.budget.write_text(json.dumps(_budget_from_report(report), indent=2) + "\n", encoding="utf-8")
+        print(f"\nBudget updated: {args.budget}")
+        return 0
+
+    if args.budget.exists():
+        failures = check_budget(report, json.loads(args.budget.read_text(encoding="utf-8")), args.tolerance)
+        if failures:
+            print("\nSize budget exceeded:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print("\nAll assets within size budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
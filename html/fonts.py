@@ -0,0 +1,372 @@
+"""Subset the landing page web fonts and generate WOFF2 files.
+
+Scans ``index.html`` for the font families, weights and styles its CSS
+actually uses and for the characters the page can render (text nodes, form
+placeholders, ``content:`` strings, upper-cased variants where
+``text-transform`` applies, printable ASCII when the page has form fields).
+Every matching face from ``html/source/CredoMax_Logo/Fonts`` is subset to
+those characters and written as WOFF2 (WOFF when ``brotli`` is unavailable)
+with a content-hashed name.
+
+Alongside the fonts it writes ``fonts.css`` with ``@font-face`` declarations
+(``font-display: swap`` plus ``unicode-range``) and ``preload.html`` with the
+matching ``<link rel="preload">`` hints, and reports how many bytes the
+subsets save compared with the source TTFs.
+
+Requires ``fonttools`` and ``brotli`` (``pip install -r html/requirements.txt``).
+
+Usage (from the repository root)::
+
+    python html/fonts.py
+    python html/fonts.py --family "Open Sans" --weights 400 700
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from html import unescape
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+except ImportError:  # pragma: no cover - depends on the build machine
+    ft_subset = None
+    TTFont = None
+
+try:
+    import brotli  # noqa: F401  (required by fontTools for WOFF2)
+except ImportError:  # pragma: no cover - depends on the build machine
+    brotli = None
+
+
+HTML_DIR = Path(__file__).resolve().parent
+SOURCE_HTML = HTML_DIR / "html" / "index.html"
+FONTS_DIR = HTML_DIR / "source" / "CredoMax_Logo" / "Fonts"
+OUT_DIR = HTML_DIR / "dist" / "fonts"
+
+# Faces preloaded by default; preloading every weight would compete with the
+# page itself for bandwidth.
+MAX_PRELOADS = 2
+
+_WEIGHT_KEYWORDS = {"normal": 400, "bold": 700, "lighter": 300, "bolder": 700}
+_GENERIC_FAMILIES = {
+    "serif", "sans-serif", "monospace", "cursive", "fantasy", "system-ui",
+    "-apple-system", "blinkmacsystemfont", "inherit", "initial", "unset",
+}
+# Elements the user agent stylesheet renders bold
+_BOLD_ELEMENTS = re.compile(r"<(?:h[1-6]|b|strong|th)\b", re.I)
+_ITALIC_ELEMENTS = re.compile(r"<(?:i|em|cite|var)\b", re.I)
+
+
+@dataclass
+class FontFace:
+    """A source font file and the CSS descriptors it satisfies."""
+
+    path: Path
+    family: str
+    weight: int
+    italic: bool
+
+    @property
+    def style(self) -> str:
+        return "italic" if self.italic else "normal"
+
+
+@dataclass
+class PageUsage:
+    """Fonts and characters used by a page."""
+
+    families: List[str] = field(default_factory=list)
+    weights: Set[int] = field(default_factory=set)
+    italic: bool = False
+    text: Set[str] = field(default_factory=set)
+
+
+# ---------------------------------------------------------------------------
+# Page scanning
+# ---------------------------------------------------------------------------
+
+def _css_blocks(html: str) -> str:
+    css = "\n".join(re.findall(r"<style\b[^>]*>(.*?)</style>", html, re.S | re.I))
+    css += "\n" + "\n".join(re.findall(r'\sstyle="([^"]*)"', html))
+    return re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+
+
+def _visible_text(html: str) -> str:
+    body = re.sub(r"<(script|style)\b.*?</\1>", " ", html, flags=re.S | re.I)
+    body = re.sub(r"<svg\b.*?</svg>", " ", body, flags=re.S | re.I)
+    attrs = re.findall(r'\s(?:placeholder|value|alt|title|aria-label)="([^"]*)"', body)
+    text = re.sub(r"<[^>]+>", " ", body)
+    return unescape(text + " " + " ".join(attrs))
+
+
+def scan_page(html: str) -> PageUsage:
+    """Collect font families, weights, styles and characters from a page."""
+    usage = PageUsage()
+    css = _css_blocks(html)
+
+    for stack in re.findall(r"font-family\s*:\s*([^;}]+)", css, re.I):
+        for name in stack.split(","):
+            name = name.strip().strip("'\"")
+            if name and name.lower() not in _GENERIC_FAMILIES and name not in usage.families:
+                usage.families.append(name)
+    for shorthand in re.findall(r"font\s*:\s*([^;}]+)", css, re.I):
+        for part in re.findall(r"(?:'([^']+)'|\"([^\"]+)\")", shorthand):
+            name = part[0] or part[1]
+            if name not in usage.families:
+                usage.families.append(name)
+
+    usage.weights.add(400)
+    for value in re.findall(r"font-weight\s*:\s*([\w-]+)", css, re.I):
+        value = value.lower()
+        if value.isdigit():
+            usage.weights.add(int(value))
+        elif value in _WEIGHT_KEYWORDS:
+            usage.weights.add(_WEIGHT_KEYWORDS[value])
+    if _BOLD_ELEMENTS.search(html):
+        usage.weights.add(700)
+
+    usage.italic = bool(
+        re.search(r"font-style\s*:\s*(?:italic|oblique)", css, re.I) or _ITALIC_ELEMENTS.search(html)
+    )
+
+    text = _visible_text(html)
+    text += "".join(re.findall(r"content\s*:\s*[\"']([^\"']*)[\"']", css))
+    if re.search(r"text-transform\s*:\s*(?:uppercase|capitalize)", css, re.I):
+        text += text.upper()
+    if re.search(r"text-transform\s*:\s*lowercase", css, re.I):
+        text += text.lower()
+    usage.text = {c for c in text if not c.isspace()} | {" "}
+    if re.search(r"<(?:input|textarea)\b", html, re.I):
+        # Visitors type into form fields; keep printable ASCII for them
+        usage.text |= {chr(cp) for cp in range(0x20, 0x7F)}
+    return usage
+
+
+# ---------------------------------------------------------------------------
+# Font selection and subsetting
+# ---------------------------------------------------------------------------
+
+def load_faces(fonts_dir: Path) -> List[FontFace]:
+    """Read family/weight/style metadata from every TTF/OTF under a folder."""
+    faces = []
+    for path in sorted(fonts_dir.rglob("*")):
+        if path.suffix.lower() not in (".ttf", ".otf"):
+            continue
+        font = TTFont(path, lazy=True)
+        name = font["name"]
+        family = name.getDebugName(16) or name.getDebugName(1)
+        os2 = font["OS/2"]
+        faces.append(FontFace(path, family, os2.usWeightClass, bool(os2.fsSelection & 0x01)))
+        font.close()
+    return faces
+
+
+def _closest_weight(target: int, available: Iterable[int]) -> int:
+    """CSS font matching: prefer exact, then lighter/heavier per the spec."""
+    available = sorted(set(available))
+    if target in available:
+        return target
+    if 400 <= target <= 500:
+        candidates = [w for w in available if target < w <= 500] or [w for w in available if w < target]
+        if candidates:
+            return candidates[0] if candidates[0] > target else candidates[-1]
+        return available[-1]
+    if target < 400:
+        lighter = [w for w in available if w < target]
+        return lighter[-1] if lighter else available[0]
+    heavier = [w for w in available if w > target]
+    return heavier[0] if heavier else available[-1]
+
+
+def select_faces(faces: List[FontFace], usage: PageUsage) -> List[FontFace]:
+    """Pick the faces a browser would download for this page."""
+    by_family: Dict[str, List[FontFace]] = {}
+    for face in faces:
+        by_family.setdefault(face.family.lower(), []).append(face)
+
+    selected: Dict[Tuple[str, int, bool], FontFace] = {}
+    styles = [False, True] if usage.italic else [False]
+    for family in usage.families:
+        candidates = by_family.get(family.lower())
+        if not candidates:
+            continue
+        for italic in styles:
+            pool = [f for f in candidates if f.italic == italic] or candidates
+            for weight in sorted(usage.weights):
+                best = _closest_weight(weight, [f.weight for f in pool])
+                face = next(f for f in pool if f.weight == best)
+                selected[(face.family, face.weight, face.italic)] = face
+    return list(selected.values())
+
+
+def subset_face(face: FontFace, text: Set[str], flavor: str) -> bytes:
+    """Subset one face to ``text`` and return the encoded web font."""
+    options = ft_subset.Options()
+    options.flavor = flavor
+    options.layout_features = ["kern", "liga", "calt"]
+    options.name_IDs = [1, 2, 16, 17]
+    options.notdef_outline = True
+    options.hinting = False
+    options.desubroutinize = True
+
+    font = TTFont(face.path)
+    subsetter = ft_subset.Subsetter(options)
+    subsetter.populate(text="".join(sorted(text)))
+    subsetter.subset(font)
+
+    buffer = io.BytesIO()
+    font.flavor = flavor
+    font.save(buffer)
+    return buffer.getvalue()
+
+
+def _unicode_range(text: Set[str]) -> str:
+    codepoints = sorted({ord(c) for c in text})
+    ranges: List[str] = []
+    start = prev = codepoints[0]
+    for cp in codepoints[1:] + [None]:
+        if cp is not None and cp == prev + 1:
+            prev = cp
+            continue
+        ranges.append(f"U+{start:X}" if start == prev else f"U+{start:X}-{prev:X}")
+        if cp is not None:
+            start = prev = cp
+    return ", ".join(ranges)
+
+
+def build_fonts(
+    html_path: Path,
+    fonts_dir: Path,
+    out_dir: Path,
+    url_prefix: str = "/fonts/",
+    families: Optional[List[str]] = None,
+    weights: Optional[List[int]] = None,
+    font_display: str = "swap",
+    max_preloads: int = MAX_PRELOADS,
+) -> dict:
+    """Subset the fonts used by ``html_path`` and write them to ``out_dir``.
+
+    Returns a report with one entry per emitted face plus the generated
+    ``@font-face`` CSS and preload markup, so callers (``build.py``) can
+    inline them into the page.
+    """
+    if ft_subset is None:
+        raise RuntimeError("fonttools is required for font subsetting: pip install fonttools brotli")
+
+    usage = scan_page(html_path.read_text(encoding="utf-8"))
+    if families:
+        usage.families = families
+    if weights:
+        usage.weights = set(weights)
+
+    flavor, mime, ext = ("woff2", "font/woff2", "woff2") if brotli is not None else ("woff", "font/woff", "woff")
+    faces = select_faces(load_faces(fonts_dir), usage)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    unicode_range = _unicode_range(usage.text)
+    entries = []
+    css_rules = []
+    preloads = []
+    for face in sorted(faces, key=lambda f: (f.family, f.italic, f.weight != 400, f.weight)):
+        data = subset_face(face, usage.text, flavor)
+        digest = hashlib.sha256(data).hexdigest()[:8]
+        name = f"{face.path.stem}.{digest}.{ext}"
+        (out_dir / name).write_bytes(data)
+
+        url = f"{url_prefix}{name}"
+        css_rules.append(
+            "@font-face{"
+            f"font-family:'{face.family}';font-style:{face.style};font-weight:{face.weight};"
+            f"font-display:{font_display};src:url({url}) format('{flavor}');"
+            f"unicode-range:{unicode_range}}}"
+        )
+        if len(preloads) < max_preloads:
+            preloads.append(f'<link rel="preload" href="{url}" as="font" type="{mime}" crossorigin>')
+        entries.append(
+            {
+                "source": str(face.path.relative_to(fonts_dir)),
+                "output": name,
+                "family": face.family,
+                "weight": face.weight,
+                "style": face.style,
+                "source_bytes": face.path.stat().st_size,
+                "bytes": len(data),
+            }
+        )
+
+    css = "\n".join(css_rules)
+    preload_html = "\n".join(preloads)
+    if entries:
+        (out_dir / "fonts.css").write_text(css + "\n", encoding="utf-8")
+        (out_dir / "preload.html").write_text(preload_html + "\n", encoding="utf-8")
+
+    report = {
+        "families_referenced": usage.families,
+        "weights": sorted(usage.weights),
+        "italic": usage.italic,
+        "glyphs": len(usage.text),
+        "faces": entries,
+        "source_bytes": sum(e["source_bytes"] for e in entries),
+        "bytes": sum(e["bytes"] for e in entries),
+        "css": css,
+        "preload": preload_html,
+    }
+    report["bytes_saved"] = report["source_bytes"] - report["bytes"]
+    (out_dir / "font-report.json").write_text(
+        json.dumps({k: v for k, v in report.items() if k not in ("css", "preload")}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    return report
+
+
+def print_report(report: dict) -> None:
+    if not report["faces"]:
+        print(
+            "No faces from the source font folder are referenced by the page "
+            f"(families found: {', '.join(report['families_referenced']) or 'none'})."
+        )
+        return
+    header = f"{'face':<36} {'output':<40} {'source':>9} {'subset':>8}"
+    print(header)
+    print("-" * len(header))
+    for e in report["faces"]:
+        print(f"{e['source']:<36} {e['output']:<40} {e['source_bytes']:>9} {e['bytes']:>8}")
+    saved_pct = 100 * report["bytes_saved"] / report["source_bytes"]
+    print(
+        f"\n{len(report['faces'])} faces, {report['glyphs']} glyphs: "
+        f"{report['source_bytes']} B -> {report['bytes']} B ({report['bytes_saved']} B saved, {saved_pct:.1f}%)"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Subset landing page fonts to WOFF2.")
+    parser.add_argument("--html", type=Path, default=SOURCE_HTML)
+    parser.add_argument("--fonts", type=Path, default=FONTS_DIR)
+    parser.add_argument("--out", type=Path, default=OUT_DIR)
+    parser.add_argument("--url-prefix", default="/fonts/")
+    parser.add_argument("--family", action="append", help="override detected families (repeatable)")
+    parser.add_argument("--weights", type=int, nargs="+", help="override detected weights")
+    parser.add_argument("--font-display", default="swap")
+    args = parser.parse_args()
+
+    try:
+        report = build_fonts(
+            args.html, args.fonts, args.out, args.url_prefix,
+            families=args.family, weights=args.weights, font_display=args.font_display,
+        )
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())